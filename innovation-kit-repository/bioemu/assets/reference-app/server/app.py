@@ -9,11 +9,13 @@ Structure:
     config.py           - Environment variables and constants
     logging_utils.py    - BioEmu logging utilities
     superposition_utils.py - Sequence alignment superposition
+    url_converters.py   - Route converters for PDB/UniProt IDs
     routes/             - Blueprint modules for each endpoint group
 """
 
 from flask import Flask
 import os
+from flask_compress import Compress
 from flask_cors import CORS
 from dotenv import load_dotenv
 import logging
@@ -25,6 +27,8 @@ from config import (
     BIOEMU_MODE,
     BUILD_DIR,
 )
+from json_utils import BioEmuJSONProvider
+from url_converters import URL_CONVERTERS
 from logging_utils import (
     log_bioemu_info,
     log_bioemu_error,
@@ -96,6 +100,7 @@ def create_app():
         static_folder=os.path.join(BUILD_DIR, "static"),
         static_url_path="/static",
     )
+    app.json = BioEmuJSONProvider(app)
 
     CORS(
         app,
@@ -107,6 +112,23 @@ def create_app():
         ],
     )
 
+    # React build assets under /static have content-hashed filenames, so
+    # browsers may cache them for a year
+    app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 31536000
+
+    # Compress JSON/HTML/PDB responses (PDB text and base64 payloads shrink 5-10x)
+    app.config["COMPRESS_MIMETYPES"] = [
+        "application/json",
+        "text/html",
+        "chemical/x-pdb",
+    ]
+    app.config["COMPRESS_LEVEL"] = 6
+    app.config["COMPRESS_MIN_SIZE"] = 1024
+    Compress(app)
+
+    # Must be in place before blueprints add routes that use them
+    app.url_map.converters.update(URL_CONVERTERS)
+
     # Register all route blueprints
     from routes import register_blueprints
 
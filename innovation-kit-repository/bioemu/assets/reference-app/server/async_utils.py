@@ -0,0 +1,42 @@
+"""
+Background asyncio event loop shared by the BioEmu server.
+
+Flask route handlers are synchronous, so coroutines (copilot calls,
+concurrent external database lookups) are submitted to this one loop.
+Concurrent request threads then overlap their network waits and share
+pooled connections.
+"""
+
+import asyncio
+import threading
+
+import httpx
+
+_event_loop = asyncio.new_event_loop()
+threading.Thread(
+    target=_event_loop.run_forever, name="bioemu-event-loop", daemon=True
+).start()
+
+# Pooled async client for external database APIs (RCSB, ...)
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=8), timeout=30
+)
+
+
+def run_async(coro):
+    """Run a coroutine on the shared loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop).result()
+
+
+def spawn_async(coro):
+    """Schedule a coroutine on the shared loop without waiting for it"""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop)
+
+
+def gather_async(*coros, return_exceptions=False):
+    """Run coroutines concurrently on the shared loop and return their results"""
+
+    async def _gather():
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+
+    return run_async(_gather())
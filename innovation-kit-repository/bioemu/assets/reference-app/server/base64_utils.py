@@ -0,0 +1,64 @@
+"""
+Base64 codec for BioEmu trajectory payloads.
+
+PDB/XTC data travels between the client and the server as multi-MB base64
+strings. pybase64's SIMD codec is used when it is installed; otherwise the
+stdlib binascii codec is the fallback. Both raise binascii.Error on bad input.
+Large inputs can be decoded straight to disk with b64decode_to_file.
+"""
+
+import binascii
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# ASCII whitespace dropped by b64decode_to_file (wrapped base64 input)
+_WHITESPACE_BYTES = b" \t\n\r\v\f"
+_WHITESPACE_TABLE = str.maketrans("", "", _WHITESPACE_BYTES.decode("ascii"))
+
+
+def b64decode(data) -> bytes:
+    """Decode a base64 str or bytes-like object to bytes"""
+    if pybase64 is not None:
+        return pybase64.b64decode(data)
+    return binascii.a2b_base64(data)
+
+
+def b64encode(data) -> str:
+    """Base64-encode a bytes-like buffer straight to an ASCII str"""
+    if pybase64 is not None:
+        return pybase64.b64encode(data).decode("ascii")
+    return binascii.b2a_base64(memoryview(data), newline=False).decode("ascii")
+
+
+def b64decode_to_file(data, path, chunk_size=1 << 20) -> int:
+    """
+    Decode a base64 string into the file at path, one chunk at a time.
+
+    Only a window of about chunk_size decoded bytes is held in memory, so a
+    multi-MB trajectory is never materialized next to its base64 string.
+    Line breaks and other ASCII whitespace (e.g. 76-column wrapped output of
+    base64.encodebytes) are skipped, and characters that do not fill a whole
+    base64 quantum carry over into the next window. Returns the bytes written.
+    """
+    window = chunk_size // 3 * 4  # whole base64 quanta
+    is_text = isinstance(data, str)
+    pending = "" if is_text else b""
+    written = 0
+    with open(path, "wb", buffering=chunk_size) as f:
+        for start in range(0, len(data), window):
+            chunk = data[start : start + window]
+            if is_text:
+                chunk = pending + chunk.translate(_WHITESPACE_TABLE)
+            else:
+                chunk = pending + bytes(chunk).translate(None, _WHITESPACE_BYTES)
+            usable = len(chunk) - len(chunk) % 4
+            written += f.write(b64decode(chunk[:usable]))
+            pending = chunk[usable:]
+        if pending:
+            # An incomplete final quantum raises binascii.Error, as the
+            # one-shot decoders do
+            written += f.write(b64decode(pending))
+    return written
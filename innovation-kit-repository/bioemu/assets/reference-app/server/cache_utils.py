@@ -0,0 +1,57 @@
+"""
+Response caches shared by the BioEmu server services.
+"""
+
+import os
+
+import diskcache
+
+from config import (
+    CACHE_DIR,
+    PREDICTION_CACHE_SECONDS,
+    PREDICTION_CACHE_SIZE_LIMIT,
+    RCSB_CACHE_SECONDS,
+    RCSB_CACHE_SIZE_LIMIT,
+    UNIPROT_CACHE_SECONDS,
+    UNIPROT_CACHE_SIZE_LIMIT,
+)
+
+# RCSB PDB files, FASTA records and parsed header metadata, persisted across
+# restarts. Keys are prefixed by kind, e.g. "pdb:1UBQ", "fasta:1UBQ".
+rcsb_cache = diskcache.Cache(
+    os.path.join(CACHE_DIR, "rcsb"),
+    size_limit=RCSB_CACHE_SIZE_LIMIT,
+    eviction_policy="least-recently-used",
+)
+
+
+def cache_rcsb(key, value):
+    """Store an RCSB-derived value with the standard expiry"""
+    rcsb_cache.set(key, value, expire=RCSB_CACHE_SECONDS)
+
+# UniProt sequences/entries and AlphaFold DB structures, keyed e.g.
+# "sequence:P04637", "info:P04637", "afdb:P04637". Bounded by total bytes,
+# so large AlphaFold models evict more entries than small records.
+uniprot_cache = diskcache.Cache(
+    os.path.join(CACHE_DIR, "uniprot"),
+    size_limit=UNIPROT_CACHE_SIZE_LIMIT,
+    eviction_policy="least-recently-used",
+)
+
+
+def cache_uniprot(key, value):
+    """Store a UniProt/AlphaFold DB value with the standard expiry"""
+    uniprot_cache.set(key, value, expire=UNIPROT_CACHE_SECONDS)
+
+# Azure BioEmu prediction response bodies keyed by a SHA-256 of the endpoint,
+# sequence and sample count (see routes/prediction.py)
+prediction_cache = diskcache.Cache(
+    os.path.join(CACHE_DIR, "predictions"),
+    size_limit=PREDICTION_CACHE_SIZE_LIMIT,
+    eviction_policy="least-recently-used",
+)
+
+
+def cache_prediction(key, value):
+    """Store a prediction response body with the standard expiry"""
+    prediction_cache.set(key, value, expire=PREDICTION_CACHE_SECONDS)
@@ -15,6 +15,10 @@ logger = logging.getLogger(__name__)
 # Azure BioEmu API credentials
 API_ENDPOINT = os.getenv("AZURE_BIOEMU_ENDPOINT")
 API_KEY = os.getenv("AZURE_BIOEMU_KEY")
+AZURE_PREDICT_TIMEOUT = 600  # seconds; large ensembles take several minutes
+AZURE_PREDICT_RETRIES = 3  # extra attempts after a 502/503/504 from Azure
+# Concurrent Azure prediction calls per process; extra requests queue
+AZURE_MAX_CONCURRENCY = int(os.getenv("AZURE_MAX_CONCURRENCY", "16"))
 
 # BioEmu mode: 'azure' (default) or 'local'
 BIOEMU_MODE = os.getenv("BIOEMU_MODE", "azure").lower()
@@ -22,10 +26,51 @@ if BIOEMU_MODE not in ("azure", "local"):
     logger.warning(f"Invalid BIOEMU_MODE '{BIOEMU_MODE}', defaulting to 'azure'")
     BIOEMU_MODE = "azure"
 
+# Print request/response payload previews (log_bioemu_data); set
+# BIOEMU_LOG_DATA=0 in production to skip them
+LOG_DATA = os.getenv("BIOEMU_LOG_DATA", "1") != "0"
+
 # API status caching
 api_status_cache = {"status": None, "message": None, "last_checked": 0}
 api_status_lock = Lock()
 API_STATUS_CACHE_SECONDS = 300  # 5 minutes
+LOCAL_STATUS_CACHE_SECONDS = 5  # Local BioEmu GPU/package check
+
+# In-process cache of AlphaFold DB structures served by the AlphaFold routes
+AFDB_CACHE_SIZE = 1024
+AFDB_CACHE_SECONDS = 3600  # 1 hour
+AFDB_MISS_CACHE_SECONDS = 60  # Unavailable structures (404s, EBI outages)
+AFDB_STATUS_CACHE_SECONDS = 30  # AlphaFold API health probe
+AFDB_PROBE_TIMEOUT = (2, 5)  # (connect, read) seconds for the health probe
+
+# On-disk cache root for external database responses
+CACHE_DIR = os.path.expanduser(os.getenv("BIOEMU_CACHE_DIR", "~/.cache/bioemu"))
+RCSB_CACHE_SECONDS = 7 * 24 * 3600  # 7 days
+RCSB_CACHE_SIZE_LIMIT = 2 << 30  # 2 GiB
+UNIPROT_CACHE_SECONDS = 24 * 3600  # 1 day; UniProt entries are revised
+UNIPROT_CACHE_SIZE_LIMIT = 1 << 30  # 1 GiB
+PREDICTION_CACHE_SECONDS = 7 * 24 * 3600  # 7 days
+PREDICTION_CACHE_SIZE_LIMIT = 2 << 30  # 2 GiB
+
+# In-process memo of PDB sequence/info/chain lookups (in front of the disk cache)
+PDB_LOOKUP_CACHE_SIZE = 4096
+PDB_LOOKUP_CACHE_SECONDS = 24 * 3600  # 1 day
+
+# Most PDB IDs one /api/analyze-reference-structure request may batch
+PDB_BATCH_MAX_IDS = 16
+
+# In-process memo of /api/uniprot-info summaries (in front of the disk cache);
+# entries without an AlphaFold model expire after AFDB_MISS_CACHE_SECONDS
+UNIPROT_SUMMARY_CACHE_SIZE = 2048
+UNIPROT_SUMMARY_CACHE_SECONDS = 3600  # 1 hour
+
+# RAM-backed scratch directory for MDTraj input files (Linux only; falls
+# back to the default temp dir where /dev/shm is missing or read-only)
+SCRATCH_DIR = (
+    "/dev/shm"
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK)
+    else None
+)
 
 # Flask build directory for React static files
 BUILD_DIR = os.path.abspath(
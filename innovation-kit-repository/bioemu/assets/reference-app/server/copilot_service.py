@@ -3,11 +3,27 @@ BioEmu copilot experience Service - AI-powered scientific explanations
 """
 
 import os
+import hashlib
+import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from openai import AzureOpenAI, OpenAI
+import httpx
+from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+from async_utils import spawn_async
+
+# Optional: exact token counts for history truncation
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,6 +31,14 @@ logger = logging.getLogger(__name__)
 # Directory containing prompt files
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
+# Model context window shared by system prompt, history and response,
+# with a safety margin for per-message formatting overhead
+CONTEXT_TOKEN_BUDGET = 8192
+TOKEN_BUDGET_MARGIN = 128
+
+# Keep-alive pool shared by all copilot requests
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
 
 def _load_prompt(filename: str) -> str:
     """Load a prompt file from the prompts directory."""
@@ -26,6 +50,120 @@ def _load_prompt(filename: str) -> str:
         return ""
 
 
+# Question categorization keywords. Single words are matched against the
+# tokenized message; multi-word phrases still use substring checks.
+_WORD_RE = re.compile(r"[a-z']+")
+
+# Interface/navigation questions
+_INTERFACE_PHRASES = ("how to", "where is", "how do i")
+_INTERFACE_TOKENS = frozenset(
+    {"click", "button", "tab", "menu", "navigate", "find", "use"}
+)
+
+# Advanced science questions (expert-level indicators)
+_EXPERT_SCIENCE_PHRASES = (
+    "radius of gyration",
+    "conformational entropy",
+    "ensemble statistics",
+    "force field",
+    "molecular dynamics",
+    "free energy",
+)
+_EXPERT_SCIENCE_TOKENS = frozenset(
+    {
+        "rmsd",
+        "boltzmann",
+        "sampling",
+        "convergence",
+        "statistical",
+        "methodology",
+        "algorithm",
+        "thermodynamics",
+        "kinetics",
+    }
+)
+
+# Science/concept questions
+_SCIENCE_PHRASES = ("what is", "why does", "amino acid", "secondary structure")
+_SCIENCE_TOKENS = frozenset(
+    {
+        "explain",
+        "protein",
+        "fold",
+        "structure",
+        "molecular",
+        "tertiary",
+        "quaternary",
+        "alphafold",
+        "prediction",
+        "bioemu",
+    }
+)
+
+# Analysis/data interpretation questions
+_ANALYSIS_PHRASES = ("what does",)
+_ANALYSIS_TOKENS = frozenset(
+    {
+        "result",
+        "chart",
+        "graph",
+        "pca",
+        "rmsd",
+        "energy",
+        "analysis",
+        "data",
+        "interpret",
+        "meaning",
+        "significance",
+        "visualization",
+        "compare",
+        "difference",
+        "correlation",
+    }
+)
+
+
+def _get_token_encoding():
+    """Return the tiktoken encoding for the copilot models, or None"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+        return None
+
+
+_token_encoding = _get_token_encoding()
+
+
+@lru_cache(maxsize=1024)
+def _count_tokens(text: str) -> int:
+    """Count prompt tokens in text (cached per distinct string)"""
+    if _token_encoding is None:
+        return len(text) // 4 + 1  # ~4 characters per token
+    return len(_token_encoding.encode(text))
+
+
+def _recent_history_messages(history: List, budget: int) -> List[Dict[str, str]]:
+    """Convert the newest history entries that fit within budget tokens to messages"""
+    selected = []
+    used = 0
+    for entry in reversed(history):
+        entry_messages = [
+            {"role": role, "content": entry[role]}
+            for role in ("user", "assistant")
+            if role in entry
+        ]
+        cost = sum(_count_tokens(m["content"]) for m in entry_messages)
+        if used + cost > budget:
+            break
+        used += cost
+        selected.append(entry_messages)
+
+    return [m for entry_messages in reversed(selected) for m in entry_messages]
+
+
 class BioEmuCopilot:
     """AI copilot for scientific explanations using Azure OpenAI or GitHub Models"""
 
@@ -42,9 +180,10 @@ class BioEmuCopilot:
         github_token = os.getenv("GITHUB_TOKEN")
         if github_token:
             try:
-                self.client = OpenAI(
+                self.client = AsyncOpenAI(
                     base_url="https://models.inference.ai.azure.com",
                     api_key=github_token,
+                    http_client=httpx.AsyncClient(limits=HTTP_POOL_LIMITS),
                 )
                 self.client_type = "github"
                 # Use GitHub Models model name
@@ -61,8 +200,11 @@ class BioEmuCopilot:
 
         if api_key and endpoint:
             try:
-                self.client = AzureOpenAI(
-                    api_key=api_key, azure_endpoint=endpoint, api_version=api_version
+                self.client = AsyncAzureOpenAI(
+                    api_key=api_key,
+                    azure_endpoint=endpoint,
+                    api_version=api_version,
+                    http_client=httpx.AsyncClient(limits=HTTP_POOL_LIMITS),
                 )
                 self.client_type = "azure"
                 logger.info("Azure OpenAI client initialized successfully")
@@ -155,84 +297,29 @@ class BioEmuCopilot:
         """Categorize user question to apply appropriate prompting"""
         message_lower = message.lower()
 
-        # Interface/navigation questions
-        interface_keywords = [
-            "how to",
-            "where is",
-            "how do i",
-            "click",
-            "button",
-            "tab",
-            "menu",
-            "navigate",
-            "find",
-            "use",
-        ]
-        if any(keyword in message_lower for keyword in interface_keywords):
-            return "interface"
+        # Tokenize once; single-word keywords become set lookups, so plain
+        # plurals ("proteins", "structures") are folded onto their stem
+        tokens = set(_WORD_RE.findall(message_lower))
+        tokens |= {token[:-1] for token in tokens if token.endswith("s")}
 
-        # Advanced science questions (expert-level indicators)
-        expert_science_keywords = [
-            "rmsd",
-            "radius of gyration",
-            "conformational entropy",
-            "ensemble statistics",
-            "boltzmann",
-            "sampling",
-            "convergence",
-            "statistical",
-            "methodology",
-            "algorithm",
-            "force field",
-            "molecular dynamics",
-            "free energy",
-            "thermodynamics",
-            "kinetics",
-        ]
+        def matches(keyword_tokens, keyword_phrases):
+            return not tokens.isdisjoint(keyword_tokens) or any(
+                phrase in message_lower for phrase in keyword_phrases
+            )
 
-        # Science/concept questions
-        science_keywords = [
-            "what is",
-            "explain",
-            "why does",
-            "protein",
-            "fold",
-            "structure",
-            "amino acid",
-            "molecular",
-            "secondary structure",
-            "tertiary",
-            "quaternary",
-            "alphafold",
-            "prediction",
-            "bioemu",
-        ]
+        # Interface/navigation questions
+        if matches(_INTERFACE_TOKENS, _INTERFACE_PHRASES):
+            return "interface"
 
-        if any(keyword in message_lower for keyword in expert_science_keywords):
+        # Advanced science questions (expert-level indicators) and
+        # science/concept questions
+        if matches(_EXPERT_SCIENCE_TOKENS, _EXPERT_SCIENCE_PHRASES):
             return "science"  # Will get expert-level treatment based on user level
-        elif any(keyword in message_lower for keyword in science_keywords):
+        elif matches(_SCIENCE_TOKENS, _SCIENCE_PHRASES):
             return "science"
 
         # Analysis/data interpretation questions
-        analysis_keywords = [
-            "result",
-            "chart",
-            "graph",
-            "pca",
-            "rmsd",
-            "energy",
-            "analysis",
-            "data",
-            "interpret",
-            "what does",
-            "meaning",
-            "significance",
-            "visualization",
-            "compare",
-            "difference",
-            "correlation",
-        ]
-        if any(keyword in message_lower for keyword in analysis_keywords):
+        if matches(_ANALYSIS_TOKENS, _ANALYSIS_PHRASES):
             return "analysis"
 
         return "general"
@@ -384,6 +471,15 @@ class BioEmuCopilot:
             # Extract user level from context
             user_level = context.get("userLevel", "beginner")
 
+            # Increased token and timeout limits to reduce response truncation
+            # Dynamic response length based on user level and question type
+            if user_level == "expert":
+                max_tokens = 1024 if question_type == "science" else 700
+            elif question_type == "interface":
+                max_tokens = 500  # Interface help usually fits within this
+            else:
+                max_tokens = 700 if user_level == "intermediate" else 500
+
             # Use categorized system prompt with user level
             system_prompt = self.get_system_prompt(question_type, user_level)
             messages = [{"role": "system", "content": system_prompt}]
@@ -394,27 +490,19 @@ class BioEmuCopilot:
                     {"role": "system", "content": f"Context: {context_info}"}
                 )
 
-            # Add recent history (reduced to 2 exchanges)
-            for entry in history[-2:]:
-                if "user" in entry:
-                    messages.append({"role": "user", "content": entry["user"]})
-                if "assistant" in entry:
-                    messages.append(
-                        {"role": "assistant", "content": entry["assistant"]}
-                    )
+            # Add the most recent history that fits the remaining token budget
+            history_budget = (
+                CONTEXT_TOKEN_BUDGET
+                - TOKEN_BUDGET_MARGIN
+                - max_tokens
+                - sum(_count_tokens(m["content"]) for m in messages)
+                - _count_tokens(message)
+            )
+            messages.extend(_recent_history_messages(history, history_budget))
 
             messages.append({"role": "user", "content": message})
 
-            # Increased token and timeout limits to reduce response truncation
-            # Dynamic response length based on user level and question type
-            if user_level == "expert":
-                max_tokens = 1024 if question_type == "science" else 700
-            elif question_type == "interface":
-                max_tokens = 500  # Interface help usually fits within this
-            else:
-                max_tokens = 700 if user_level == "intermediate" else 500
-
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 max_tokens=max_tokens,
@@ -443,40 +531,97 @@ class BioEmuCopilot:
 # Global instance
 copilot = BioEmuCopilot()
 
-# Simple cache for repeated identical questions (max 32 entries)
-_response_cache: Dict[str, Dict[str, Any]] = {}
-_CACHE_MAX_SIZE = 32
+# Responses to repeated questions, keyed by a hash of (message, context,
+# history); entries expire after an hour and the oldest are evicted first
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_SECONDS = 3600
+_response_cache = OrderedDict()  # key -> (expires_at, response)
+_response_cache_lock = threading.Lock()
+# Upstream calls in flight, so identical concurrent questions share one call
+_pending_responses = {}
 
 
 def get_copilot_response(
-    message: str, context: Optional[Dict] = None, history: Optional[List] = None
+    message: str,
+    context: Optional[Dict] = None,
+    history: Optional[List] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
-    """Get copilot response (sync wrapper) with simple caching for repeated questions"""
-    import asyncio
+    """Get copilot response (sync wrapper) with caching for repeated questions"""
+    if not use_cache:
+        return _wait_for_response(
+            _spawn_response(message, context, history), message, context
+        )
 
-    # Create cache key from message only (context/history changes invalidate)
-    cache_key = message.strip().lower()
-    if not context and not history and cache_key in _response_cache:
-        cached = _response_cache[cache_key].copy()
-        cached["source"] = cached.get("source", "ai") + "_cached"
-        return cached
+    cache_key = _response_cache_key(message, context, history)
+    with _response_cache_lock:
+        entry = _response_cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            _response_cache.move_to_end(cache_key)
+            cached = entry[1].copy()
+            cached["source"] = cached.get("source", "ai") + "_cached"
+            return cached
+
+        future = _pending_responses.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            future = _spawn_response(message, context, history)
+            _pending_responses[cache_key] = future
 
     try:
-        response = asyncio.run(copilot.get_response(message, context, history))
+        response = _wait_for_response(future, message, context)
+    finally:
+        if is_owner:
+            with _response_cache_lock:
+                _pending_responses.pop(cache_key, None)
+
+    # Fallback answers are cheap and errors should be retried, so only
+    # model responses are cached
+    if is_owner and response.get("source") == "openai":
+        with _response_cache_lock:
+            _response_cache[cache_key] = (
+                time.monotonic() + RESPONSE_CACHE_SECONDS,
+                response,
+            )
+            _response_cache.move_to_end(cache_key)
+            while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
+    return response.copy()
 
-        # Cache simple questions without context/history
-        if not context and not history and response.get("source") != "fallback":
-            # Evict oldest if at capacity
-            if len(_response_cache) >= _CACHE_MAX_SIZE:
-                oldest_key = next(iter(_response_cache))
-                del _response_cache[oldest_key]
-            _response_cache[cache_key] = response
 
-        return response
+def _spawn_response(message: str, context: Optional[Dict], history: Optional[List]):
+    """Schedule a copilot call; returns a concurrent.futures.Future or None"""
+    try:
+        # Runs on the shared event loop so concurrent requests overlap
+        return spawn_async(copilot.get_response(message, context, history))
     except RuntimeError:
-        # Fallback if asyncio issues
-        return {
-            "response": copilot.get_fallback_response(message, context or {}),
-            "context": context or {},
-            "source": "fallback_sync",
-        }
+        return None
+
+
+def _wait_for_response(future, message: str, context: Optional[Dict]) -> Dict[str, Any]:
+    """Block on a scheduled copilot call"""
+    try:
+        if future is not None:
+            return future.result()
+    except RuntimeError:
+        pass
+    # Fallback if the event loop is unavailable
+    return {
+        "response": copilot.get_fallback_response(message, context or {}),
+        "context": context or {},
+        "source": "fallback_sync",
+    }
+
+
+def _response_cache_key(
+    message: str, context: Optional[Dict], history: Optional[List]
+) -> bytes:
+    """BLAKE2b digest of the normalized question and its canonical context"""
+    payload = json.dumps(
+        [message.strip().lower(), context or {}, history or []],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
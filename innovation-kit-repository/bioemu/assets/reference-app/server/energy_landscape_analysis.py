@@ -8,11 +8,32 @@ import numpy as np
 import tempfile
 import os
 import logging
-from sklearn.decomposition import PCA
+from sklearn.decomposition import IncrementalPCA
 from sklearn.preprocessing import StandardScaler
 
+from config import SCRATCH_DIR
+
 logger = logging.getLogger(__name__)
 
+# Frames per chunk when streaming the trajectory through the PCA
+PCA_CHUNK_FRAMES = 256
+
+# Contact features from the first pass are kept for the later PCA passes
+# when they fit in this budget; larger trajectories are re-streamed per pass
+FEATURE_CACHE_BYTES = 512 << 20  # 512 MiB
+
+
+def _write_temp_file(data, suffix):
+    """Write bytes to a scratch file via unbuffered os.write, return its path"""
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=SCRATCH_DIR)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    return path
+
 
 def compute_energy_landscape(pdb_data, xtc_data):
     """
@@ -33,66 +54,85 @@ def compute_energy_landscape(pdb_data, xtc_data):
         logger.info(f"PDB data size: {len(pdb_data)} bytes")
         logger.info(f"XTC data size: {len(xtc_data)} bytes")
         
-        # Create temporary files for MDTraj processing
-        with tempfile.NamedTemporaryFile(suffix='.pdb', delete=False) as pdb_file:
-            pdb_file.write(pdb_data)
-            pdb_path = pdb_file.name
-        
-        with tempfile.NamedTemporaryFile(suffix='.xtc', delete=False) as xtc_file:
-            xtc_file.write(xtc_data)
-            xtc_path = xtc_file.name
+        # Create temporary files for MDTraj processing (unbuffered, tmpfs if available)
+        pdb_path = _write_temp_file(pdb_data, '.pdb')
+        xtc_path = _write_temp_file(xtc_data, '.xtc')
         
-        logger.info(f"Loading trajectory: PDB={pdb_path}, XTC={xtc_path}")
+        logger.info(f"Streaming trajectory: PDB={pdb_path}, XTC={xtc_path}")
         
-        # Load trajectory from BioEmu data
-        trajectory = md.load(xtc_path, top=pdb_path)
-        logger.info(f"Trajectory loaded: {trajectory.n_frames} frames, {trajectory.n_atoms} atoms")
+        # Only the topology is loaded up front; frames are streamed in chunks
+        topology = md.load_topology(pdb_path)
         
         # Select CA atoms
-        ca_indices = trajectory.top.select('name CA')
+        ca_indices = topology.select('name CA')
         logger.info(f"Selected {len(ca_indices)} CA atoms")
         
         if len(ca_indices) < 4:
             raise ValueError("Not enough CA atoms for contact analysis")
         
-        # Compute contact features for each frame
-        contact_features = []
-        n_residues = len(ca_indices)
+        # Contact fingerprint pairs: x_ij = exp(-d_ij) for j > i+3
+        # (j > i+3 excludes local contacts)
+        pair_i, pair_j = np.triu_indices(len(ca_indices), k=4)
+        contact_pairs = np.column_stack([ca_indices[pair_i], ca_indices[pair_j]])
+        n_contacts = len(contact_pairs)
         
-        logger.info("Computing CA-CA contact features...")
+        def iter_contact_features():
+            """Yield (n_chunk_frames, n_contacts) contact features per chunk"""
+            for chunk in md.iterload(xtc_path, top=topology, chunk=PCA_CHUNK_FRAMES):
+                distances = md.compute_distances(chunk, contact_pairs, periodic=False)
+                yield np.exp(-distances, out=distances)  # Contact strength
         
-        for frame_idx in range(trajectory.n_frames):
-            frame = trajectory[frame_idx]
-            ca_coords = frame.atom_slice(ca_indices).xyz[0]  # Shape: (n_ca, 3)
-            
-            # Compute contact fingerprint: x_ij = exp(-d_ij) for j > i+3
-            contacts = []
-            for i in range(n_residues):
-                for j in range(i+4, n_residues):  # j > i+3 to exclude local contacts
-                    d_ij = np.linalg.norm(ca_coords[i] - ca_coords[j])
-                    x_ij = np.exp(-d_ij)  # Contact strength
-                    contacts.append(x_ij)
-            
-            contact_features.append(contacts)
-            
-            if (frame_idx + 1) % 50 == 0:
-                logger.info(f"Processed {frame_idx + 1}/{trajectory.n_frames} frames")
-        
-        # Convert to numpy array
-        contact_matrix = np.array(contact_features)
-        logger.info(f"Contact matrix shape: {contact_matrix.shape}")
-        
-        # Standardize features (optional but often helpful)
+        # Pass 1: standardization statistics (optional but often helpful)
+        logger.info("Computing CA-CA contact features...")
         scaler = StandardScaler()
-        contact_matrix_scaled = scaler.fit_transform(contact_matrix)
-        
-        # PCA analysis
+        n_frames = 0
+        cached_features = []  # None once the features outgrow FEATURE_CACHE_BYTES
+        cached_bytes = 0
+        for features in iter_contact_features():
+            scaler.partial_fit(features)
+            n_frames += len(features)
+            if cached_features is not None:
+                cached_bytes += features.nbytes
+                if cached_bytes <= FEATURE_CACHE_BYTES:
+                    cached_features.append(features)
+                else:
+                    cached_features = None
+            logger.debug("Processed %d frames", n_frames)
+        
+        logger.info(f"Contact features: {n_frames} frames x {n_contacts} contacts")
+        
+        def contact_features():
+            """Pass-1 features if they were cached, otherwise a fresh stream"""
+            if cached_features is not None:
+                return cached_features
+            return iter_contact_features()
+        
+        # Pass 2: incremental PCA, up to 10 components. Every partial_fit
+        # batch needs at least n_components rows, so a short trailing chunk
+        # is merged into the batch before it.
         logger.info("Performing PCA analysis...")
-        pca = PCA(n_components=min(10, contact_matrix.shape[1]))  # Up to 10 components
-        landscape_coords = pca.fit_transform(contact_matrix_scaled)
+        n_components = min(10, n_contacts, n_frames)
+        ipca = IncrementalPCA(n_components=n_components)
+        pending = None
+        for features in contact_features():
+            features = scaler.transform(features)
+            if pending is None:
+                pending = features
+            elif len(features) >= n_components:
+                ipca.partial_fit(pending)
+                pending = features
+            else:
+                pending = np.concatenate([pending, features])
+        ipca.partial_fit(pending)
+        
+        # Pass 3: project frames onto the principal components
+        landscape_coords = np.concatenate(
+            [ipca.transform(scaler.transform(features))
+             for features in contact_features()]
+        )
         
         # Calculate explained variance
-        explained_variance = pca.explained_variance_ratio_
+        explained_variance = ipca.explained_variance_ratio_
         cumulative_variance = np.cumsum(explained_variance)
         
         logger.info(f"PC1 explains {explained_variance[0]:.1%} of variance")
@@ -106,9 +146,9 @@ def compute_energy_landscape(pdb_data, xtc_data):
             'explained_variance_pc1': float(explained_variance[0]),
             'explained_variance_pc2': float(explained_variance[1]),
             'cumulative_variance_pc1_pc2': float(cumulative_variance[1]),
-            'n_frames': int(trajectory.n_frames),
-            'n_contacts': len(contacts),
-            'frame_indices': list(range(trajectory.n_frames))
+            'n_frames': int(n_frames),
+            'n_contacts': n_contacts,
+            'frame_indices': list(range(n_frames))
         }
         
         # Add additional PCA components if requested
@@ -149,23 +189,27 @@ def compute_free_energy_surface(pc1_coords, pc2_coords, bins=50, temperature=300
     """
     try:
         # Compute 2D histogram
-        hist, x_edges, y_edges = np.histogram2d(pc1_coords, pc2_coords, bins=bins)
+        hist, x_edges, y_edges = np.histogram2d(
+            np.asarray(pc1_coords), np.asarray(pc2_coords), bins=bins
+        )
         
-        # Convert to free energy (G = -kT ln(P))
-        # Add pseudocount to avoid log(0)
-        hist_smooth = hist + 1e-10
-        prob = hist_smooth / np.sum(hist_smooth)
+        # Convert to free energy (G = -kT ln(P)) in place on the histogram
+        # buffer. Add pseudocount to avoid log(0)
+        hist += 1e-10
+        hist /= hist.sum()
         
         # Boltzmann constant in kcal/mol/K
         kb = 0.001987  # kcal/mol/K
-        free_energy = -kb * temperature * np.log(prob)
+        np.log(hist, out=hist)
+        hist *= -kb * temperature
         
         # Set minimum to zero
-        free_energy = free_energy - np.min(free_energy)
+        hist -= hist.min()
+        free_energy = hist
         
         # Prepare grid coordinates
-        x_centers = (x_edges[:-1] + x_edges[1:]) / 2
-        y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+        x_centers = 0.5 * (x_edges[:-1] + x_edges[1:])
+        y_centers = 0.5 * (y_edges[:-1] + y_edges[1:])
         
         return {
             'free_energy': free_energy.tolist(),
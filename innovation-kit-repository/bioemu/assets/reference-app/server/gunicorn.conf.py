@@ -0,0 +1,44 @@
+"""
+Gunicorn settings for serving the BioEmu API in production:
+
+    gunicorn -c gunicorn.conf.py app:app
+
+Requests mostly wait on external services (Azure BioEmu, AlphaFold DB,
+RCSB, Azure OpenAI), so each worker runs many threads ("gthread") rather
+than one request at a time. Threads share the per-process caches and the
+asyncio loop in async_utils; gevent's monkey-patching is avoided because it
+would replace that loop's thread.
+"""
+
+import os
+from dotenv import load_dotenv
+
+from config import AZURE_PREDICT_RETRIES, AZURE_PREDICT_TIMEOUT
+
+load_dotenv()
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5000')}"
+
+worker_class = "gthread"
+# Local mode keeps the model on one GPU, so a single process serves it
+workers = int(
+    os.getenv(
+        "GUNICORN_WORKERS",
+        1 if os.getenv("BIOEMU_MODE", "azure").lower() == "local" else 2,
+    )
+)
+threads = int(os.getenv("GUNICORN_THREADS", 32))
+
+# Under gthread this is the worker heartbeat timeout: a worker whose main
+# loop stops checking in for this long is restarted. Request threads do not
+# hold up the heartbeat, so it does not cap how long a prediction may run.
+# It is still sized to the worst-case Azure call (every retry hitting
+# AZURE_PREDICT_TIMEOUT, plus backoff) so sync workers, where it does act
+# as the per-request limit, would not cut predictions short
+timeout = (AZURE_PREDICT_RETRIES + 1) * AZURE_PREDICT_TIMEOUT + 60
+graceful_timeout = 30
+keepalive = 5
+
+# Not preloaded: async_utils starts its event-loop thread at import, and
+# threads do not survive fork
+preload_app = False
@@ -0,0 +1,28 @@
+"""
+Shared HTTP session for synchronous calls to external databases (UniProt,
+AlphaFold DB).
+
+Reusing one pooled session keeps TCP/TLS connections alive across requests
+instead of paying a fresh handshake per call.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+http_session = requests.Session()
+http_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        # Retry transient gateway errors; hand the final response back
+        # to the caller instead of raising
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
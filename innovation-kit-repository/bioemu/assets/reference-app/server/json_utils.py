@@ -0,0 +1,77 @@
+"""
+JSON serialization for BioEmu API responses.
+
+Route handlers can return NumPy arrays and scalars directly; they are
+serialized natively by orjson when it is installed, or converted with
+.tolist()/.item() by the stdlib fallback. Request bodies are parsed with
+orjson too when available (see request_payload).
+"""
+
+import numpy as np
+from flask import current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class BioEmuJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that understands NumPy and prefers orjson"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        if isinstance(o, np.generic):
+            return o.item()
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_dumps(self, obj, indent=False, sort_keys=None):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(
+            obj, kwargs.get("indent"), kwargs.get("sort_keys")
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None:
+            return super().loads(s, **kwargs)
+        # Request bodies carrying base64 trajectories can be many MB
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        # Use orjson's bytes as the body as-is; the default implementation
+        # decodes to str, appends a newline and re-encodes, copying large
+        # payloads (PDB text, trajectories) several more times
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._orjson_dumps(obj, indent), mimetype=self.mimetype
+        )
+
+
+def request_payload():
+    """
+    Decode the JSON request body into a dict.
+
+    The raw body is read with cache=False so Werkzeug does not keep a copy
+    alongside the decoded object; non-object bodies decode to {}.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    data = current_app.json.loads(raw)
+    return data if isinstance(data, dict) else {}
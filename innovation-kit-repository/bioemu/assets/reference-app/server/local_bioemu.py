@@ -6,13 +6,146 @@ Requires: pip install bioemu (Linux only, Python 3.10-3.12)
 GPU (CUDA) optional but recommended for reasonable speed.
 """
 
-import base64
 import logging
+import mmap
+import os
+import queue
 import tempfile
+import threading
+from concurrent.futures import Future
 from pathlib import Path
 
+from base64_utils import b64encode
+
 logger = logging.getLogger(__name__)
 
+# Persistent compile caches so JIT work (ColabFold/JAX embeddings, torch
+# inductor kernels) is paid once rather than on every process start.
+# Must be set before jax/torch are first imported.
+BIOEMU_CACHE_DIR = Path(os.getenv("BIOEMU_CACHE_DIR", "~/.cache/bioemu")).expanduser()
+os.environ.setdefault("JAX_COMPILATION_CACHE_DIR", str(BIOEMU_CACHE_DIR / "jax"))
+os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", str(BIOEMU_CACHE_DIR / "inductor"))
+os.environ.setdefault("XLA_FLAGS", "--xla_gpu_force_compilation_parallelism=16")
+
+# Opt-in torch.compile (CUDA graphs) of the BioEmu score model
+BIOEMU_COMPILE = os.getenv("BIOEMU_COMPILE", "0") == "1"
+
+# bioemu.sample.main, imported once on first use and kept warm
+_bioemu_sample = None
+_bioemu_sample_lock = threading.Lock()
+
+# Set once TF32 tensor-core matmuls have been enabled for this process
+_tf32_configured = False
+
+
+def _enable_tf32(torch) -> None:
+    """Route FP32 matmuls/convolutions through TF32 tensor cores on Ampere+ GPUs."""
+    global _tf32_configured
+    if _tf32_configured:
+        return
+    _tf32_configured = True
+
+    if torch.cuda.get_device_capability(0) < (8, 0):
+        logger.info("GPU has no TF32 tensor cores - keeping full FP32 matmuls")
+        return
+
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    logger.info("Enabled TF32 tensor cores for FP32 matmuls")
+
+
+class _PredictionWorker:
+    """
+    Single background thread that owns the GPU for local BioEmu sampling.
+
+    Requests are queued and run one at a time, so concurrent HTTP requests
+    do not compete for VRAM, and identical in-flight requests are coalesced
+    into a single bioemu_sample call.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, key, fn) -> Future:
+        """Queue fn() unless a request with the same key is already pending."""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                logger.info("Joining identical in-flight BioEmu prediction")
+                return future
+            future = Future()
+            self._pending[key] = future
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="bioemu-worker", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((key, fn, future))
+        return future
+
+    def _run(self):
+        while True:
+            key, fn, future = self._queue.get()
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+
+_worker = _PredictionWorker()
+
+
+def _get_bioemu_sample():
+    """Return bioemu.sample.main, importing the sampling stack only once."""
+    global _bioemu_sample
+    with _bioemu_sample_lock:
+        if _bioemu_sample is None:
+            # Import here to avoid errors if bioemu not installed
+            import bioemu.sample
+
+            if BIOEMU_COMPILE:
+                _install_compiled_score_model(bioemu.sample)
+            _bioemu_sample = bioemu.sample.main
+            logger.info(f"BioEmu sampler loaded (compile cache: {BIOEMU_CACHE_DIR})")
+        return _bioemu_sample
+
+
+def _install_compiled_score_model(sample_module) -> None:
+    """
+    Patch bioemu.sample's model loader to return a torch.compile'd score model.
+
+    The diffusion loop calls the same score model forward once per denoising
+    step; "reduce-overhead" captures it as CUDA graphs, removing per-step
+    Python and kernel-launch overhead. The compiled model is kept per
+    checkpoint so compilation is paid once per process, not per request.
+    """
+    import torch
+
+    load_model = sample_module.load_model
+    compiled_models = {}
+
+    def load_compiled_model(ckpt_path, model_config_path):
+        key = (str(ckpt_path), str(model_config_path))
+        if key not in compiled_models:
+            # dynamic=True: one graph for all sequence lengths/batch sizes
+            # instead of a recompile per new shape
+            compiled_models[key] = torch.compile(
+                load_model(ckpt_path, model_config_path),
+                mode="reduce-overhead",
+                dynamic=True,
+            )
+            logger.info("Compiled BioEmu score model with torch.compile")
+        return compiled_models[key]
+
+    sample_module.load_model = load_compiled_model
+
 
 def check_local_bioemu_available():
     """Check if local BioEmu inference is available."""
@@ -33,6 +166,7 @@ def check_local_bioemu_available():
             gpu_name = torch.cuda.get_device_name(0)
             gpu_memory = torch.cuda.get_device_properties(0).total_memory / (1024**3)
             logger.info(f"GPU detected: {gpu_name} with {gpu_memory:.1f} GB VRAM")
+            _enable_tf32(torch)
         else:
             warnings.append(
                 "No CUDA GPU detected. BioEmu will run on CPU (much slower)."
@@ -44,16 +178,26 @@ def check_local_bioemu_available():
     return len(errors) == 0, errors, warnings
 
 
-def run_local_prediction(sequence: str, num_samples: int = 10) -> dict:
+def run_local_prediction(
+    sequence: str,
+    num_samples: int = 10,
+    matmul_precision: str = "high",
+    legacy_base64: bool = True,
+) -> dict:
     """
     Run BioEmu prediction locally.
 
     Args:
         sequence: Amino acid sequence
         num_samples: Number of conformational samples to generate
+        matmul_precision: PyTorch float32 matmul precision ("highest", "high"
+            for TF32, or "medium" for BF16 at a small accuracy cost)
+        legacy_base64: Encode 'pdb_data'/'xtc_data' as base64 strings for JSON
+            transport. When False they are returned as read-only mmap buffers
+            of the output files.
 
     Returns:
-        Dict with 'pdb_data' and 'xtc_data' as base64-encoded strings,
+        Dict with 'pdb_data' and 'xtc_data' (base64-encoded strings by default),
         matching the Azure endpoint response format.
     """
     # Check availability first
@@ -63,8 +207,34 @@ def run_local_prediction(sequence: str, num_samples: int = 10) -> dict:
     for warn in warnings:
         logger.warning(warn)
 
-    # Import here to avoid errors if bioemu not installed
-    from bioemu.sample import main as bioemu_sample
+    # Run on the shared GPU worker; identical in-flight requests share one run
+    key = (sequence, num_samples, matmul_precision)
+    result = _worker.submit(
+        key, lambda: _sample(sequence, num_samples, matmul_precision)
+    ).result()
+
+    if not legacy_base64:
+        return result
+
+    pdb_data = b64encode(result["pdb_data"])
+    xtc_data = b64encode(result["xtc_data"])
+    logger.info(f"Encoded for JSON. PDB: {len(pdb_data)} chars, XTC: {len(xtc_data)} chars")
+    return {**result, "pdb_data": pdb_data, "xtc_data": xtc_data}
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    """Map a file read-only; the mapping stays valid after the file is deleted."""
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _sample(sequence: str, num_samples: int, matmul_precision: str) -> dict:
+    """Run bioemu_sample and return raw outputs (called on the worker thread)."""
+    import torch
+
+    bioemu_sample = _get_bioemu_sample()
+
+    torch.set_float32_matmul_precision(matmul_precision)
 
     logger.info(
         f"Starting local BioEmu prediction for sequence of length {len(sequence)}"
@@ -94,18 +264,16 @@ def run_local_prediction(sequence: str, num_samples: int = 10) -> dict:
         if not xtc_path.exists():
             raise RuntimeError("BioEmu did not produce samples.xtc")
 
-        # Read and encode as base64
-        with open(pdb_path, "rb") as f:
-            pdb_data = base64.b64encode(f.read()).decode("utf-8")
-
-        with open(xtc_path, "rb") as f:
-            xtc_data = base64.b64encode(f.read()).decode("utf-8")
+        # Map rather than read: base64/streaming work straight from the page
+        # cache, and the mappings outlive the temporary directory
+        pdb_data = _map_file(pdb_path)
+        xtc_data = _map_file(xtc_path)
 
         logger.info(
-            f"Local BioEmu prediction complete. PDB: {len(pdb_data)} chars, XTC: {len(xtc_data)} chars"
+            f"Local BioEmu prediction complete. PDB: {len(pdb_data)} bytes, XTC: {len(xtc_data)} bytes"
         )
 
-        # Return in same format as Azure endpoint
+        # Same keys as the Azure endpoint response
         return {
             "pdb_data": pdb_data,
             "xtc_data": xtc_data,
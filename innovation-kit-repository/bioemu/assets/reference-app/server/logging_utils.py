@@ -3,8 +3,11 @@ BioEmu logging utilities with enhanced visibility for API tracking.
 """
 
 import logging
+import reprlib
 from datetime import datetime
 
+from config import LOG_DATA
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -33,6 +36,8 @@ def log_bioemu_success(message):
 
 def log_bioemu_data(title, data, max_length=100):
     """Log BioEmu data with smart truncation for visibility"""
+    if not LOG_DATA:
+        return
     timestamp = datetime.now().strftime("%H:%M:%S")
     if isinstance(data, dict):
         # For dictionaries, show structure
@@ -40,21 +45,32 @@ def log_bioemu_data(title, data, max_length=100):
         print(
             f"📊 [{timestamp}] {title}: Dict with keys: {keys[:5]}{'...' if len(keys) > 5 else ''}"
         )
+        # Payloads are already str/bytes - take their length without copying
         if "pdb_data" in data:
-            print(f"    🧪 PDB Data: {len(str(data['pdb_data']))} characters")
+            print(f"    🧪 PDB Data: {len(data['pdb_data'] or '')} characters")
         if "xtc_data" in data:
-            print(f"    🎬 XTC Data: {len(str(data['xtc_data']))} characters")
+            print(f"    🎬 XTC Data: {len(data['xtc_data'] or '')} characters")
     elif isinstance(data, (str, bytes)):
-        data_str = str(data)
+        # Slice before converting so large payloads are never copied whole
+        preview = data[:max_length]
+        if isinstance(preview, bytes):
+            preview = repr(preview)
         print(
-            f"📊 [{timestamp}] {title}: {data_str[:max_length]}{'...' if len(data_str) > max_length else ''} (length: {len(data_str)})"
+            f"📊 [{timestamp}] {title}: {preview}{'...' if len(data) > max_length else ''} (length: {len(data)})"
         )
     else:
+        # reprlib truncates while formatting, so big lists are never
+        # stringified in full
+        data_str = _data_repr.repr(data)
         print(
-            f"📊 [{timestamp}] {title}: {str(data)[:max_length]}{'...' if len(str(data)) > max_length else ''}"
+            f"📊 [{timestamp}] {title}: {data_str[:max_length]}{'...' if len(data_str) > max_length else ''}"
         )
 
 
+_data_repr = reprlib.Repr()
+_data_repr.maxstring = _data_repr.maxother = 200
+
+
 def log_bioemu_timing(operation, start_time, end_time):
     """Log timing information for BioEmu operations"""
     duration = end_time - start_time
@@ -3,25 +3,97 @@ PDB Service Module for BioEmu Research Platform
 Provides functionality to fetch sequences and information from PDB entries
 """
 
+import functools
+import inspect
 import logging
-import requests
 import re
+import threading
+import time
+from collections import OrderedDict
 from tempfile import NamedTemporaryFile
 from typing import Optional, Dict, Any, List, Callable
-from Bio import SeqIO
+from async_utils import gather_async, http_client, run_async
+from cache_utils import rcsb_cache, cache_rcsb
+from config import PDB_LOOKUP_CACHE_SECONDS, PDB_LOOKUP_CACHE_SIZE
 from reference_structure_analysis import (
     fetch_pdb_structure,
+    fetch_pdb_structure_async,
     analyze_reference_structure
 )
 
 logger = logging.getLogger(__name__)
 
+# Single-pass sweep over the PDB records _extract_pdb_metadata cares about.
+# Each alternative ends in a named group so match.lastgroup identifies it.
+_PDB_HEADER_RE = re.compile(
+    r"^(?:TITLE.{5}(?P<title>.*)"
+    r"|REMARK   2 RESOLUTION(?P<resolution>.*)"
+    r"|EXPDTA.{4}(?P<method>.*)"
+    r"|SOURCE.*?ORGANISM_SCIENTIFIC:(?P<organism>[^;\n]*)"
+    r"|ATOM.{17}(?P<chain>\S))",
+    re.MULTILINE,
+)
+
+# PDB ID format (see validate_pdb_id)
+_PDB_ID_RE = re.compile(r"[0-9][A-Za-z0-9]{3}")
+
+# (lookup, PDB ID, *other arguments) -> (expires_at, result), least recently used first
+_lookup_cache = OrderedDict()
+_lookup_cache_lock = threading.Lock()
+_lookup_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _memoize_lookup(func):
+    """Keep successful results of a PDB lookup in memory for a day.
+
+    The RCSB disk cache still saves the download, but a hit here also skips
+    re-reading and re-parsing the entry.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Bind with defaults so f(id), f(id, None) and f(id, chain_name=None)
+        # share one entry; the PDB ID is case-insensitive
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        pdb_id, *rest = bound.arguments.values()
+        key = (func.__name__, pdb_id.upper(), *rest)
+        with _lookup_cache_lock:
+            entry = _lookup_cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                _lookup_cache.move_to_end(key)
+                _lookup_cache_stats["hits"] += 1
+                return entry[1]
+            _lookup_cache_stats["misses"] += 1
+
+        result = func(*bound.args, **bound.kwargs)
+        # Failures (None / no chains) are retried on the next request
+        if result:
+            with _lookup_cache_lock:
+                _lookup_cache[key] = (time.monotonic() + PDB_LOOKUP_CACHE_SECONDS, result)
+                _lookup_cache.move_to_end(key)
+                while len(_lookup_cache) > PDB_LOOKUP_CACHE_SIZE:
+                    _lookup_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def lookup_cache_info() -> Dict[str, Any]:
+    """Size and hit/miss counters of the in-process PDB lookup cache"""
+    with _lookup_cache_lock:
+        return {
+            "size": len(_lookup_cache),
+            "max_size": PDB_LOOKUP_CACHE_SIZE,
+            "ttl_seconds": PDB_LOOKUP_CACHE_SECONDS,
+            **_lookup_cache_stats,
+        }
+
 
 def ignore_auth_chain_name(chain_name: str) -> str:
     """Remove suffix like '[auth A]' from the chain name."""
-    m = re.match(r"(\w+)(?:\[.*\])?", chain_name)
-    assert m is not None
-    return m.group(1)
+    return chain_name.partition("[")[0].strip()
 
 
 def sequence_from_fasta(
@@ -37,6 +109,9 @@ def sequence_from_fasta(
     Returns:
         The sequence as a string.
     """
+    # Imported lazily to keep Biopython out of server startup
+    from Bio import SeqIO
+
     with open(fasta_file) as f:
         seq_generator = SeqIO.parse(f, "fasta")
         descriptions = []
@@ -61,6 +136,7 @@ def sequence_from_fasta(
     return str(matches[0])
 
 
+@_memoize_lookup
 def sequence_from_pdb_id(pdb_id: str, chain_name: Optional[str] = None) -> Optional[str]:
     """
     Extract protein sequence from PDB ID and optional chain using RCSB FASTA API
@@ -82,14 +158,12 @@ def sequence_from_pdb_id(pdb_id: str, chain_name: Optional[str] = None) -> Optio
             chain_names = [ignore_auth_chain_name(name) for name in chainsdesc[7:].split(", ")]
             return chain_name in chain_names
 
-        url = f"https://www.rcsb.org/fasta/entry/{pdb_id}"
-        response = requests.get(url)
-        if response.status_code != 200:
-            logger.error(f"Failed to fetch FASTA for PDB ID {pdb_id}: HTTP {response.status_code}")
+        fasta_text = run_async(_fetch_fasta_async(pdb_id))
+        if fasta_text is None:
             return None
 
         with NamedTemporaryFile("w", suffix=".fasta", delete=False) as temp_file:
-            temp_file.write(response.text)
+            temp_file.write(fasta_text)
             temp_file.flush()
             
             sequence = sequence_from_fasta(
@@ -106,6 +180,35 @@ def sequence_from_pdb_id(pdb_id: str, chain_name: Optional[str] = None) -> Optio
         return None
 
 
+async def _fetch_fasta_async(pdb_id: str) -> Optional[str]:
+    """Fetch the RCSB FASTA record for a PDB entry (cached on disk)"""
+    cache_key = f"fasta:{pdb_id.upper()}"
+    cached = rcsb_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached FASTA for PDB ID {pdb_id}")
+        return cached
+
+    url = f"https://www.rcsb.org/fasta/entry/{pdb_id}"
+    response = await http_client.get(url)
+    if response.status_code != 200:
+        logger.error(f"Failed to fetch FASTA for PDB ID {pdb_id}: HTTP {response.status_code}")
+        return None
+
+    cache_rcsb(cache_key, response.text)
+    return response.text
+
+
+def _get_pdb_metadata(pdb_id: str, pdb_content: str) -> Dict[str, Any]:
+    """Return header metadata for a PDB entry, parsing it only once per entry"""
+    cache_key = f"meta:{pdb_id.upper()}"
+    metadata = rcsb_cache.get(cache_key)
+    if metadata is None:
+        metadata = _extract_pdb_metadata(pdb_content)
+        cache_rcsb(cache_key, metadata)
+    return metadata
+
+
+@_memoize_lookup
 def get_pdb_info(pdb_id: str) -> Optional[Dict[str, Any]]:
     """
     Get comprehensive information about a PDB entry
@@ -117,8 +220,13 @@ def get_pdb_info(pdb_id: str) -> Optional[Dict[str, Any]]:
         Dictionary containing PDB information, or None if not found
     """
     try:
-        # Fetch basic PDB structure
-        pdb_content = fetch_pdb_structure(pdb_id)
+        # Fetch basic PDB structure, overlapping the FASTA download so a
+        # following sequence lookup for this entry is served from cache
+        pdb_content, _ = gather_async(
+            fetch_pdb_structure_async(pdb_id),
+            _fetch_fasta_async(pdb_id),
+            return_exceptions=True,
+        )
         if not pdb_content:
             return None
         
@@ -128,7 +236,7 @@ def get_pdb_info(pdb_id: str) -> Optional[Dict[str, Any]]:
             return None
         
         # Extract metadata from PDB header
-        metadata = _extract_pdb_metadata(pdb_content)
+        metadata = _get_pdb_metadata(pdb_id, pdb_content)
         
         # Combine analysis and metadata
         pdb_info = {
@@ -172,41 +280,41 @@ def _extract_pdb_metadata(pdb_content: str) -> Dict[str, Any]:
     }
     
     try:
-        lines = pdb_content.split('\n')
+        chains_seen = set()
         
-        for line in lines:
+        for match in _PDB_HEADER_RE.finditer(pdb_content):
+            kind = match.lastgroup
+            
+            # Extract chain information
+            if kind == 'chain':
+                chain_id = match.group('chain')
+                if chain_id not in chains_seen:
+                    chains_seen.add(chain_id)
+                    metadata['chains'].append(chain_id)
+            
             # Extract title
-            if line.startswith('TITLE'):
+            elif kind == 'title':
+                title = match.group('title').strip()
                 if metadata['title'] == 'Unknown':
-                    metadata['title'] = line[10:].strip()
+                    metadata['title'] = title
                 else:
-                    metadata['title'] += ' ' + line[10:].strip()
+                    metadata['title'] += ' ' + title
             
             # Extract resolution
-            elif line.startswith('REMARK   2 RESOLUTION'):
+            elif kind == 'resolution':
                 try:
-                    res_text = line.split()[-2]  # Usually "X.XX ANGSTROMS"
+                    res_text = match.group(0).split()[-2]  # Usually "X.XX ANGSTROMS"
                     metadata['resolution'] = float(res_text)
                 except (ValueError, IndexError):
                     pass
             
             # Extract method
-            elif line.startswith('EXPDTA'):
-                metadata['method'] = line[10:].strip()
+            elif kind == 'method':
+                metadata['method'] = match.group('method').strip()
             
             # Extract organism
-            elif line.startswith('SOURCE') and 'ORGANISM_SCIENTIFIC' in line:
-                organism_start = line.find('ORGANISM_SCIENTIFIC:') + 20
-                organism_end = line.find(';', organism_start)
-                if organism_end == -1:
-                    organism_end = len(line)
-                metadata['organism'] = line[organism_start:organism_end].strip()
-            
-            # Extract chain information
-            elif line.startswith('ATOM') and line[21:22].strip():
-                chain_id = line[21:22]
-                if chain_id not in metadata['chains']:
-                    metadata['chains'].append(chain_id)
+            elif kind == 'organism':
+                metadata['organism'] = match.group('organism').strip()
     
     except Exception as e:
         logger.warning(f"Error extracting PDB metadata: {e}")
@@ -224,16 +332,14 @@ def validate_pdb_id(pdb_id: str) -> bool:
     Returns:
         True if valid format, False otherwise
     """
-    if not pdb_id or len(pdb_id) != 4:
+    if not pdb_id:
         return False
     
     # PDB IDs are 4 characters: 1 digit + 3 alphanumeric
-    if not (pdb_id[0].isdigit() and pdb_id[1:].isalnum()):
-        return False
-    
-    return True
+    return _PDB_ID_RE.fullmatch(pdb_id) is not None
 
 
+@_memoize_lookup
 def get_available_chains(pdb_id: str) -> List[str]:
     """
     Get list of available chains in a PDB structure
@@ -249,7 +355,7 @@ def get_available_chains(pdb_id: str) -> List[str]:
         if not pdb_content:
             return []
         
-        metadata = _extract_pdb_metadata(pdb_content)
+        metadata = _get_pdb_metadata(pdb_id, pdb_content)
         return metadata.get('chains', [])
         
     except Exception as e:
@@ -3,16 +3,45 @@ Reference Structure Analysis Module for BioEmu Research Platform
 Provides functionality to analyze reference structures (AlphaFold/X-ray) for comparison with MD ensembles
 """
 
-import mdtraj as md
 import numpy as np
+import hashlib
 import tempfile
-import os
 import logging
-import requests
-from typing import Optional, Dict, Any, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
+
+from async_utils import http_client, run_async
+from cache_utils import rcsb_cache, cache_rcsb
+from config import SCRATCH_DIR
+
+if TYPE_CHECKING:
+    import mdtraj as md
 
 logger = logging.getLogger(__name__)
 
+# Secondary structure labels used by _identify_structured_regions
+_REGION_TYPES = {1: 'helix', 2: 'sheet'}
+
+# Standard amino acids: sorted 3-letter codes and their 1-letter codes
+_AA3_TO_1 = {
+    'ALA': 'A', 'ARG': 'R', 'ASN': 'N', 'ASP': 'D', 'CYS': 'C',
+    'GLN': 'Q', 'GLU': 'E', 'GLY': 'G', 'HIS': 'H', 'ILE': 'I',
+    'LEU': 'L', 'LYS': 'K', 'MET': 'M', 'PHE': 'F', 'PRO': 'P',
+    'SER': 'S', 'THR': 'T', 'TRP': 'W', 'TYR': 'Y', 'VAL': 'V'
+}
+_AA3_CODES = np.array(sorted(_AA3_TO_1), dtype='S3')
+_AA1_CODES = np.array([_AA3_TO_1[code] for code in sorted(_AA3_TO_1)], dtype='S1')
+
+# LRU cache of structure-only analyses keyed by PDB content hash
+REFERENCE_CACHE_SIZE = 256
+_reference_cache = OrderedDict()
+_reference_cache_lock = threading.Lock()
+
+# Gap between structures stacked into a single DSSP call (nm), far beyond
+# the DSSP hydrogen-bond cutoff
+_DSSP_BATCH_GAP_NM = 5.0
+
 
 def fetch_pdb_structure(pdb_id: str) -> Optional[str]:
     """
@@ -24,12 +53,24 @@ def fetch_pdb_structure(pdb_id: str) -> Optional[str]:
     Returns:
         PDB content as string, or None if not found
     """
+    return run_async(fetch_pdb_structure_async(pdb_id))
+
+
+async def fetch_pdb_structure_async(pdb_id: str) -> Optional[str]:
+    """Coroutine version of fetch_pdb_structure (runs on the shared event loop)"""
+    cache_key = f"pdb:{pdb_id.upper()}"
+    cached = rcsb_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached PDB structure: {pdb_id}")
+        return cached
+    
     try:
         url = f"https://files.rcsb.org/view/{pdb_id.upper()}.pdb"
-        response = requests.get(url, timeout=30)
+        response = await http_client.get(url, timeout=30)
         
         if response.status_code == 200:
             logger.info(f"Successfully fetched PDB structure: {pdb_id}")
+            cache_rcsb(cache_key, response.text)
             return response.text
         else:
             logger.warning(f"PDB {pdb_id} not found: {response.status_code}")
@@ -51,17 +92,92 @@ def analyze_reference_structure(pdb_content: str, sequence: str = None) -> Optio
     Returns:
         Dictionary containing reference structure analysis
     """
-    pdb_path = None
+    return analyze_reference_structures_batch([pdb_content], [sequence])[0]
+
+
+def analyze_reference_structures_batch(pdb_contents: List[str],
+                                       sequences: Optional[List[Optional[str]]] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    Analyze several reference structures with a single DSSP pass
     
-    try:
-        # Create temporary PDB file
-        with tempfile.NamedTemporaryFile(suffix='.pdb', delete=False, mode='w') as pdb_file:
-            pdb_file.write(pdb_content)
-            pdb_path = pdb_file.name
+    Args:
+        pdb_contents: PDB file contents as strings
+        sequences: Optional target sequences (one per structure) for alignment checking
+    
+    Returns:
+        One analysis dictionary per structure (None where the analysis failed)
+    """
+    if sequences is None:
+        sequences = [None] * len(pdb_contents)
+    keys = [hashlib.blake2b(pdb_content.encode(), digest_size=16).digest()
+            for pdb_content in pdb_contents]
+    
+    # Structure-only analyses are cached by content hash; only misses are
+    # loaded and run through DSSP
+    analyses = {}
+    with _reference_cache_lock:
+        for key in keys:
+            if key in _reference_cache:
+                _reference_cache.move_to_end(key)
+                analyses[key] = _reference_cache[key]
+    if analyses:
+        logger.info(f"Using {len(analyses)} cached reference structure analysis(es)")
+    
+    loaded = {}
+    for key, pdb_content in zip(keys, pdb_contents):
+        if key not in analyses and key not in loaded:
+            reference = _load_reference_structure(pdb_content)
+            if reference is not None:
+                loaded[key] = reference
+    
+    if loaded:
+        try:
+            logger.info(f"Computing DSSP for {len(loaded)} reference structure(s)...")
+            dssp_rows = _compute_dssp_batch([traj for traj, _ in loaded.values()])
+        except Exception as e:
+            logger.error(f"Reference structure analysis failed: {e}")
+            dssp_rows = []
         
-        # Load structure with MDTraj
+        for (key, (traj, ref_sequence_1letter)), dssp_assignments in zip(loaded.items(), dssp_rows):
+            try:
+                analyses[key] = _summarize_reference_structure(
+                    traj, ref_sequence_1letter, dssp_assignments)
+            except Exception as e:
+                logger.error(f"Reference structure analysis failed: {e}")
+                continue
+            with _reference_cache_lock:
+                _reference_cache[key] = analyses[key]
+                if len(_reference_cache) > REFERENCE_CACHE_SIZE:
+                    _reference_cache.popitem(last=False)
+    
+    results = []
+    for key, sequence in zip(keys, sequences):
+        analysis = analyses.get(key)
+        if analysis is not None:
+            # Copy so callers can annotate results without touching the cache
+            analysis = dict(analysis)
+            # Perform sequence alignment if target sequence provided
+            if sequence:
+                analysis['sequence_alignment'] = _align_sequences(sequence, analysis['sequence'])
+        results.append(analysis)
+    
+    logger.info("Reference structure analysis complete")
+    return results
+
+
+def _load_reference_structure(pdb_content: str) -> Optional[Tuple['md.Trajectory', str]]:
+    """Load a reference structure and extract its 1-letter protein sequence"""
+    # Imported lazily: MDTraj is heavy and most endpoints never need it
+    import mdtraj as md
+    
+    try:
+        # MDTraj's PDB reader only takes a path, so stage the content in a
+        # RAM-backed scratch file that is removed as soon as it is parsed
         logger.info("Loading reference structure with MDTraj...")
-        traj = md.load(pdb_path)
+        with tempfile.NamedTemporaryFile(suffix='.pdb', mode='w', dir=SCRATCH_DIR) as pdb_file:
+            pdb_file.write(pdb_content)
+            pdb_file.flush()
+            traj = md.load_pdb(pdb_file.name)
         logger.info(f"Loaded reference structure: {traj.n_atoms} atoms, {traj.n_residues} residues")
         
         # Extract sequence from structure (protein chains only)
@@ -82,142 +198,139 @@ def analyze_reference_structure(pdb_content: str, sequence: str = None) -> Optio
         
         ref_residues = [residue.name for residue in protein_residues]
         
-        # Convert 3-letter to 1-letter amino acid codes
-        aa_map = {
-            'ALA': 'A', 'ARG': 'R', 'ASN': 'N', 'ASP': 'D', 'CYS': 'C',
-            'GLN': 'Q', 'GLU': 'E', 'GLY': 'G', 'HIS': 'H', 'ILE': 'I',
-            'LEU': 'L', 'LYS': 'K', 'MET': 'M', 'PHE': 'F', 'PRO': 'P',
-            'SER': 'S', 'THR': 'T', 'TRP': 'W', 'TYR': 'Y', 'VAL': 'V'
-        }
-        
-        # Filter out non-standard amino acids
-        standard_residues = [aa for aa in ref_residues if aa in aa_map]
-        non_standard_count = len(ref_residues) - len(standard_residues)
+        # Convert 3-letter to 1-letter amino acid codes with a vectorized
+        # lookup, filtering out non-standard amino acids
+        codes = np.array(ref_residues, dtype='S4')
+        idx = np.searchsorted(_AA3_CODES, codes).clip(max=len(_AA3_CODES) - 1)
+        is_standard = _AA3_CODES[idx] == codes
+        n_standard = int(np.count_nonzero(is_standard))
+        non_standard_count = len(ref_residues) - n_standard
         
         if non_standard_count > 0:
             logger.warning(f"Filtered out {non_standard_count} non-standard residues")
         
-        if len(standard_residues) < 5:
+        if n_standard < 5:
             logger.error("Too few standard amino acids found")
             return None
             
-        ref_sequence_1letter = ''.join([aa_map[aa] for aa in standard_residues])
-        
-        # Compute DSSP for reference structure
-        logger.info("Computing DSSP for reference structure...")
-        dssp = md.compute_dssp(traj, simplified=True)
+        ref_sequence_1letter = _AA1_CODES[idx[is_standard]].tobytes().decode('ascii')
+        return traj, ref_sequence_1letter
         
-        # Since this is a single structure, dssp shape is (1, n_residues)
-        dssp_assignments = dssp[0]  # Get the single frame
-        
-        # Convert to fractions (0 or 1 for single structure)
-        helix_fraction = (dssp_assignments == 'H').astype(float)
-        sheet_fraction = (dssp_assignments == 'E').astype(float)
-        coil_fraction = (dssp_assignments == 'C').astype(float)
+    except Exception as e:
+        logger.error(f"Reference structure analysis failed: {e}")
+        return None
+
+
+def _compute_dssp_batch(trajs: List['md.Trajectory']) -> List[np.ndarray]:
+    """
+    Run DSSP once over several single-frame structures
+    
+    The structures are translated apart so no hydrogen bonds can form between
+    them, stacked into one topology, and the per-residue assignments are split
+    back into one array per structure.
+    """
+    import mdtraj as md
+    
+    if len(trajs) == 1:
+        return [md.compute_dssp(trajs[0], simplified=True)[0]]
+    
+    stacked = None
+    for traj in trajs:
+        xyz = traj.xyz[:1].copy()  # First model only, as in the single-structure path
+        if stacked is not None:
+            xyz[..., 0] += stacked.xyz[..., 0].max() - xyz[..., 0].min() + _DSSP_BATCH_GAP_NM
+        shifted = md.Trajectory(xyz, traj.topology)
+        stacked = shifted if stacked is None else stacked.stack(shifted)
+    
+    dssp = md.compute_dssp(stacked, simplified=True)[0]
+    offsets = np.cumsum([traj.n_residues for traj in trajs])[:-1]
+    return np.split(dssp, offsets)
+
+
+def _summarize_reference_structure(traj: 'md.Trajectory', ref_sequence_1letter: str,
+                                   dssp_assignments: np.ndarray) -> Dict[str, Any]:
+    """Build the reference analysis dictionary from a structure's DSSP assignments"""
+    import mdtraj as md
+    
+    # Convert to fractions (0 or 1 for single structure)
+    helix_fraction = (dssp_assignments == 'H').astype(float)
+    sheet_fraction = (dssp_assignments == 'E').astype(float)
+    coil_fraction = (dssp_assignments == 'C').astype(float)
+    
+    # Compute basic structural metrics
+    rg = md.compute_rg(traj)[0]  # Single value for single structure
+    
+    # Count secondary structure elements
+    helix_count = np.sum(helix_fraction)
+    sheet_count = np.sum(sheet_fraction)
+    coil_count = np.sum(coil_fraction)
+    total_residues = len(dssp_assignments)
+    
+    analysis_result = {
+        'source_type': 'reference',  # Distinguish from MD ensemble
+        'n_residues': total_residues,
+        'sequence': ref_sequence_1letter,
+        'structure_type': 'static',  # Single conformation
         
-        # Compute basic structural metrics
-        rg = md.compute_rg(traj)[0]  # Single value for single structure
+        # Secondary structure fractions (0 or 1 for each residue)
+        'helix_fraction': helix_fraction.tolist(),
+        'sheet_fraction': sheet_fraction.tolist(), 
+        'coil_fraction': coil_fraction.tolist(),
         
-        # Count secondary structure elements
-        helix_count = np.sum(helix_fraction)
-        sheet_count = np.sum(sheet_fraction)
-        coil_count = np.sum(coil_fraction)
-        total_residues = len(dssp_assignments)
+        # DSSP assignments as string
+        'dssp_assignments': dssp_assignments.tolist(),
         
-        analysis_result = {
-            'source_type': 'reference',  # Distinguish from MD ensemble
-            'n_residues': total_residues,
-            'sequence': ref_sequence_1letter,
-            'structure_type': 'static',  # Single conformation
-            
-            # Secondary structure fractions (0 or 1 for each residue)
-            'helix_fraction': helix_fraction.tolist(),
-            'sheet_fraction': sheet_fraction.tolist(), 
-            'coil_fraction': coil_fraction.tolist(),
-            
-            # DSSP assignments as string
-            'dssp_assignments': dssp_assignments.tolist(),
-            
-            # Summary statistics
-            'mean_helix_content': float(helix_count / total_residues),
-            'mean_sheet_content': float(sheet_count / total_residues),
-            'mean_coil_content': float(coil_count / total_residues),
-            
-            # No variance for single structure
-            'helix_variance': [0.0] * total_residues,
-            'sheet_variance': [0.0] * total_residues,
-            'coil_variance': [0.0] * total_residues,
-            
-            # Structural metrics
-            'radius_of_gyration': float(rg),
-            
-            # Structured regions identification
-            'structured_regions': _identify_structured_regions(helix_fraction, sheet_fraction),
-            
-            # Sequence alignment info (if provided)
-            'sequence_alignment': None  # Will be added later if sequence provided
-        }
+        # Summary statistics
+        'mean_helix_content': float(helix_count / total_residues),
+        'mean_sheet_content': float(sheet_count / total_residues),
+        'mean_coil_content': float(coil_count / total_residues),
         
-        # Perform sequence alignment if target sequence provided
-        if sequence:
-            alignment_info = _align_sequences(sequence, ref_sequence_1letter)
-            analysis_result['sequence_alignment'] = alignment_info
+        # No variance for single structure
+        'helix_variance': [0.0] * total_residues,
+        'sheet_variance': [0.0] * total_residues,
+        'coil_variance': [0.0] * total_residues,
         
-        logger.info("Reference structure analysis complete")
-        return analysis_result
+        # Structural metrics
+        'radius_of_gyration': float(rg),
         
-    except Exception as e:
-        logger.error(f"Reference structure analysis failed: {e}")
-        return None
+        # Structured regions identification
+        'structured_regions': _identify_structured_regions(helix_fraction, sheet_fraction),
         
-    finally:
-        # Clean up temporary file
-        if pdb_path and os.path.exists(pdb_path):
-            try:
-                os.unlink(pdb_path)
-            except:
-                pass
+        # Sequence alignment info (if provided)
+        'sequence_alignment': None  # Will be added later if sequence provided
+    }
+    
+    return analysis_result
 
 
 def _identify_structured_regions(helix_fraction: np.ndarray, sheet_fraction: np.ndarray) -> List[Dict[str, Any]]:
     """
     Identify continuous structured regions in reference structure
     """
-    regions = []
-    current_region = None
+    # Label each residue: 0 = unstructured, 1 = helix, 2 = sheet (helix wins)
+    helix = np.asarray(helix_fraction) > 0.5
+    sheet = np.asarray(sheet_fraction) > 0.5
+    labels = np.where(helix, 1, np.where(sheet, 2, 0))
     
-    for idx, (helix, sheet) in enumerate(zip(helix_fraction, sheet_fraction)):
-        dominant_type = None
-        if helix > 0.5:
-            dominant_type = 'helix'
-        elif sheet > 0.5:
-            dominant_type = 'sheet'
-            
-        if dominant_type:
-            if current_region and current_region['type'] == dominant_type and idx == current_region['end'] + 1:
-                # Extend current region
-                current_region['end'] = idx
-            else:
-                # Start new region
-                if current_region:
-                    regions.append(current_region)
-                current_region = {
-                    'type': dominant_type,
-                    'start': idx,
-                    'end': idx,
-                    'id': f"{dominant_type}-{idx}"
-                }
-        else:
-            # Break current region
-            if current_region:
-                regions.append(current_region)
-                current_region = None
+    # Run-length encode: boundaries where the label changes
+    edges = np.flatnonzero(np.diff(np.r_[-1, labels, -1]))
+    starts, stops = edges[:-1], edges[1:]
     
-    if current_region:
-        regions.append(current_region)
+    regions = []
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        label = int(labels[start])
+        # Skip unstructured runs and filter short regions
+        if label == 0 or stop - 1 - start < 2:
+            continue
+        region_type = _REGION_TYPES[label]
+        regions.append({
+            'type': region_type,
+            'start': start,
+            'end': stop - 1,
+            'id': f"{region_type}-{start}"
+        })
     
-    # Filter short regions
-    return [r for r in regions if r['end'] - r['start'] >= 2]
+    return regions
 
 
 def _align_sequences(sequence1: str, sequence2: str) -> Dict[str, Any]:
@@ -237,7 +350,11 @@ def _align_sequences(sequence1: str, sequence2: str) -> Dict[str, Any]:
     else:
         # Basic similarity calculation
         min_len = min(len(sequence1), len(sequence2))
-        matches = sum(1 for i in range(min_len) if sequence1[i] == sequence2[i])
+        # Position-wise comparison in one vectorized pass (UTF-32 keeps one
+        # code point per element, so any user-supplied text is safe)
+        codes1 = np.frombuffer(sequence1[:min_len].encode('utf-32-le'), dtype='<u4')
+        codes2 = np.frombuffer(sequence2[:min_len].encode('utf-32-le'), dtype='<u4')
+        matches = int(np.count_nonzero(codes1 == codes2))
         identity = matches / max(len(sequence1), len(sequence2))
         
         return {
@@ -261,11 +378,11 @@ def compare_md_with_reference(md_analysis: Dict[str, Any], ref_analysis: Dict[st
         Comparison analysis
     """
     try:
-        # Extract secondary structure data
-        md_helix = np.array(md_analysis['secondary_structure_stats']['helix_fraction'])
-        md_sheet = np.array(md_analysis['secondary_structure_stats']['sheet_fraction'])
-        ref_helix = np.array(ref_analysis['helix_fraction'])
-        ref_sheet = np.array(ref_analysis['sheet_fraction'])
+        # Extract secondary structure data as contiguous float32 buffers
+        md_helix = np.asarray(md_analysis['secondary_structure_stats']['helix_fraction'], dtype=np.float32)
+        md_sheet = np.asarray(md_analysis['secondary_structure_stats']['sheet_fraction'], dtype=np.float32)
+        ref_helix = np.asarray(ref_analysis['helix_fraction'], dtype=np.float32)
+        ref_sheet = np.asarray(ref_analysis['sheet_fraction'], dtype=np.float32)
         
         # Ensure sequences are aligned (basic check)
         min_len = min(len(md_helix), len(ref_helix))
@@ -274,13 +391,15 @@ def compare_md_with_reference(md_analysis: Dict[str, Any], ref_analysis: Dict[st
         ref_helix = ref_helix[:min_len]
         ref_sheet = ref_sheet[:min_len]
         
-        # Calculate differences
-        helix_diff = md_helix - ref_helix
-        sheet_diff = md_sheet - ref_sheet
+        # Calculate differences into preallocated buffers
+        helix_diff = np.empty(min_len, dtype=np.float32)
+        sheet_diff = np.empty(min_len, dtype=np.float32)
+        np.subtract(md_helix, ref_helix, out=helix_diff)
+        np.subtract(md_sheet, ref_sheet, out=sheet_diff)
         
-        # Calculate metrics
-        helix_rmsd = np.sqrt(np.mean(helix_diff**2))
-        sheet_rmsd = np.sqrt(np.mean(sheet_diff**2))
+        # Calculate metrics (dot products avoid materializing squared arrays)
+        helix_rmsd = np.sqrt(np.einsum('i,i->', helix_diff, helix_diff) / min_len)
+        sheet_rmsd = np.sqrt(np.einsum('i,i->', sheet_diff, sheet_diff) / min_len)
         
         # Identify regions of agreement/disagreement
         helix_agreement = np.abs(helix_diff) < 0.2  # Within 20%
@@ -295,10 +414,10 @@ def compare_md_with_reference(md_analysis: Dict[str, Any], ref_analysis: Dict[st
             'secondary_structure_comparison': {
                 'helix_rmsd': float(helix_rmsd),
                 'sheet_rmsd': float(sheet_rmsd),
-                'helix_differences': helix_diff.tolist(),
-                'sheet_differences': sheet_diff.tolist(),
-                'helix_agreement': helix_agreement.tolist(),
-                'sheet_agreement': sheet_agreement.tolist(),
+                'helix_differences': helix_diff,
+                'sheet_differences': sheet_diff,
+                'helix_agreement': helix_agreement,
+                'sheet_agreement': sheet_agreement,
                 'overall_agreement': float(np.mean(helix_agreement & sheet_agreement))
             },
             'summary_statistics': {
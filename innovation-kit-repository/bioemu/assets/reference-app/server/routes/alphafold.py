@@ -5,11 +5,24 @@ Blueprint: alphafold_bp
 Routes:
     GET /api/alphafold-structure/<uniprot_id> - Get AlphaFold structure by UniProt ID
     POST /api/alphafold-structure - Get AlphaFold structure via POST
+        (both accept ?format=pdb to receive the raw PDB text instead of JSON)
     GET /api/get-related-proteins/<uniprot_id> - Get related protein suggestions
 """
 
-from flask import Blueprint, jsonify, request
-
+import hashlib
+import threading
+import time
+import requests
+from flask import Blueprint, Response, jsonify, request
+
+from config import (
+    AFDB_CACHE_SECONDS,
+    AFDB_CACHE_SIZE,
+    AFDB_MISS_CACHE_SECONDS,
+    AFDB_PROBE_TIMEOUT,
+    AFDB_STATUS_CACHE_SECONDS,
+)
+from http_utils import http_session
 from logging_utils import (
     log_bioemu_info,
     log_bioemu_error,
@@ -21,83 +34,66 @@ from uniprot_service import validate_uniprot_id, download_afdb_structure
 
 alphafold_bp = Blueprint("alphafold", __name__)
 
+# uniprot_id -> (expires_at, structure_data or None, etag), oldest entries first
+_structure_cache = {}
+_structure_cache_lock = threading.Lock()
+
+# Last AlphaFold API probe result, shared by failing structure requests
+_api_status_cache = {"message": None, "expires_at": 0.0}
+_api_status_lock = threading.Lock()
+
 
-@alphafold_bp.route("/api/alphafold-structure/<uniprot_id>", methods=["GET"])
+@alphafold_bp.route("/api/alphafold-structure/<uniprot_id:uniprot_id>", methods=["GET"])
 def get_alphafold_structure_endpoint(uniprot_id):
     """Get AlphaFold structure for a UniProt ID"""
     log_bioemu_info(f"=== ALPHAFOLD STRUCTURE REQUEST: {uniprot_id} ===")
+    return _serve_structure(uniprot_id, "structure_data", include_api_status=True)
 
-    try:
-        # Validate UniProt ID
-        if not validate_uniprot_id(uniprot_id):
-            log_bioemu_error(f"Invalid UniProt ID format: {uniprot_id}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid UniProt ID format: {uniprot_id}",
-                }
-            ), 400
 
-        # Download AlphaFold structure
-        structure_data = download_afdb_structure(uniprot_id)
-        if not structure_data:
-            error_msg = f"AlphaFold structure unavailable for: {uniprot_id}"
-            log_bioemu_error(error_msg)
+@alphafold_bp.route("/api/alphafold-structure", methods=["POST"])
+def get_alphafold_structure_post_endpoint():
+    """Get AlphaFold structure for a UniProt ID via POST request"""
+    log_bioemu_info("=== ALPHAFOLD STRUCTURE REQUEST (POST) ===")
 
-            # Check if this is likely an API outage vs missing protein
-            api_status_msg = _check_alphafold_api_status()
+    data = request.get_json(silent=True)
+    if not data or "uniprot_id" not in data:
+        return jsonify(
+            {"status": "failed", "message": "Missing uniprot_id in request body"}
+        ), 400
 
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"AlphaFold structure unavailable for UniProt ID: {uniprot_id}.{api_status_msg}",
-                    "error_code": "ALPHAFOLD_UNAVAILABLE",
-                    "uniprot_id": uniprot_id,
-                    "api_status": "unknown",
-                    "suggested_alternatives": ["P04637", "P02768", "P01308"]
-                    if "server issues" not in api_status_msg
-                    else [],
-                }
-            ), 503 if "server issues" in api_status_msg else 404
+    uniprot_id = (data.get("uniprot_id") or "").strip().upper()
+    log_bioemu_info(f"Fetching AlphaFold structure for: {uniprot_id}")
+    return _serve_structure(uniprot_id, "pdb_content", include_api_status=False)
 
-        response_data = {
-            "status": "success",
-            "uniprot_id": uniprot_id,
-            "structure_data": structure_data,
-            "structure_format": "pdb",
-            "source": "alphafold",
-        }
 
-        log_bioemu_success(f"Retrieved AlphaFold structure for: {uniprot_id}")
-        log_bioemu_data("Structure data", structure_data, max_length=100)
+@alphafold_bp.route("/api/get-related-proteins/<uniprot_id:uniprot_id>", methods=["GET"])
+def get_related_proteins_endpoint(uniprot_id):
+    """Get related proteins suggestions based on the current protein"""
+    log_bioemu_info(f"=== RELATED PROTEINS REQUEST FOR: {uniprot_id} ===")
 
-        return jsonify(response_data)
+    try:
+        # Get suggestions based on protein
+        suggestions = _get_protein_suggestions(uniprot_id)
+
+        return jsonify(
+            {"status": "success", "uniprot_id": uniprot_id, "suggestions": suggestions}
+        )
 
     except Exception as e:
-        log_bioemu_error(f"Error fetching AlphaFold structure: {str(e)}")
+        log_bioemu_error(f"Error getting related proteins: {str(e)}")
         return jsonify(
-            {
-                "status": "failed",
-                "message": f"Error fetching AlphaFold structure: {str(e)}",
-            }
+            {"status": "failed", "message": f"Error getting related proteins: {str(e)}"}
         ), 500
 
 
-@alphafold_bp.route("/api/alphafold-structure", methods=["POST"])
-def get_alphafold_structure_post_endpoint():
-    """Get AlphaFold structure for a UniProt ID via POST request"""
-    log_bioemu_info("=== ALPHAFOLD STRUCTURE REQUEST (POST) ===")
+def _serve_structure(uniprot_id, body_key, include_api_status):
+    """Validate, download and return an AlphaFold structure
 
+    Shared by the GET and POST endpoints; body_key names the JSON field
+    holding the PDB text, and include_api_status probes the AlphaFold API
+    on a miss to tell an outage apart from a missing entry.
+    """
     try:
-        data = request.get_json()
-        if not data or "uniprot_id" not in data:
-            return jsonify(
-                {"status": "failed", "message": "Missing uniprot_id in request body"}
-            ), 400
-
-        uniprot_id = data["uniprot_id"].strip().upper()
-        log_bioemu_info(f"Fetching AlphaFold structure for: {uniprot_id}")
-
         # Validate UniProt ID
         if not validate_uniprot_id(uniprot_id):
             log_bioemu_error(f"Invalid UniProt ID format: {uniprot_id}")
@@ -109,32 +105,41 @@ def get_alphafold_structure_post_endpoint():
             ), 400
 
         # Download AlphaFold structure
-        structure_data = download_afdb_structure(uniprot_id)
+        structure_data, etag = _cached_download_afdb_structure(uniprot_id)
         if not structure_data:
-            error_msg = f"AlphaFold structure unavailable for: {uniprot_id}"
-            log_bioemu_error(error_msg)
-
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"AlphaFold structure unavailable for UniProt ID: {uniprot_id}. This protein may not be available in the AlphaFold database.",
-                    "error_code": "ALPHAFOLD_UNAVAILABLE",
-                    "uniprot_id": uniprot_id,
-                }
-            ), 404
-
-        response_data = {
-            "status": "success",
-            "uniprot_id": uniprot_id,
-            "pdb_content": structure_data,
-            "structure_format": "pdb",
-            "source": "alphafold",
-        }
+            log_bioemu_error(f"AlphaFold structure unavailable for: {uniprot_id}")
+            return _structure_unavailable(uniprot_id, include_api_status)
+
+        raw_pdb = request.args.get("format") == "pdb"
+        if request.method == "GET":
+            # Clients that already hold this structure get a 304 without
+            # the body being serialized again
+            etag = f"{etag}-pdb" if raw_pdb else etag
+            if request.if_none_match.contains_weak(etag):
+                log_bioemu_info(f"AlphaFold structure not modified: {uniprot_id}")
+                response = Response(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+
+        if raw_pdb:
+            response = _pdb_response(uniprot_id, structure_data)
+        else:
+            response_data = {
+                "status": "success",
+                "uniprot_id": uniprot_id,
+                body_key: structure_data,
+                "structure_format": "pdb",
+                "source": "alphafold",
+            }
 
-        log_bioemu_success(f"Retrieved AlphaFold structure for: {uniprot_id}")
-        log_bioemu_data("Structure data", structure_data, max_length=100)
+            log_bioemu_success(f"Retrieved AlphaFold structure for: {uniprot_id}")
+            log_bioemu_data("Structure data", structure_data, max_length=100)
+            response = jsonify(response_data)
 
-        return jsonify(response_data)
+        if request.method == "GET":
+            response.set_etag(etag, weak=True)
+            response.headers["Cache-Control"] = "private, max-age=86400"
+        return response
 
     except Exception as e:
         log_bioemu_error(f"Error fetching AlphaFold structure: {str(e)}")
@@ -146,192 +151,263 @@ def get_alphafold_structure_post_endpoint():
         ), 500
 
 
-@alphafold_bp.route("/api/get-related-proteins/<uniprot_id>", methods=["GET"])
-def get_related_proteins_endpoint(uniprot_id):
-    """Get related proteins suggestions based on the current protein"""
-    log_bioemu_info(f"=== RELATED PROTEINS REQUEST FOR: {uniprot_id} ===")
+def _structure_unavailable(uniprot_id, include_api_status):
+    """Error response for a UniProt ID without a downloadable structure"""
+    if not include_api_status:
+        return jsonify(
+            {
+                "status": "failed",
+                "message": f"AlphaFold structure unavailable for UniProt ID: {uniprot_id}. This protein may not be available in the AlphaFold database.",
+                "error_code": "ALPHAFOLD_UNAVAILABLE",
+                "uniprot_id": uniprot_id,
+            }
+        ), 404
 
-    try:
-        # Validate UniProt ID
-        if not validate_uniprot_id(uniprot_id):
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid UniProt ID format: {uniprot_id}",
-                }
-            ), 400
+    # Check if this is likely an API outage vs missing protein
+    api_status_msg = _check_alphafold_api_status()
+    outage = "server issues" in api_status_msg
 
-        # Get suggestions based on protein
-        suggestions = _get_protein_suggestions(uniprot_id)
+    return jsonify(
+        {
+            "status": "failed",
+            "message": f"AlphaFold structure unavailable for UniProt ID: {uniprot_id}.{api_status_msg}",
+            "error_code": "ALPHAFOLD_UNAVAILABLE",
+            "uniprot_id": uniprot_id,
+            "api_status": "unknown",
+            "suggested_alternatives": [] if outage else ["P04637", "P02768", "P01308"],
+        }
+    ), 503 if outage else 404
+
+
+def _pdb_response(uniprot_id, structure_data):
+    """Return the structure as raw PDB text, skipping the JSON envelope"""
+    log_bioemu_success(f"Retrieved AlphaFold structure for: {uniprot_id} (raw PDB)")
+    return Response(
+        structure_data,
+        mimetype="chemical/x-pdb",
+        headers={"X-UniProt-ID": uniprot_id},
+    )
+
+
+def _cached_download_afdb_structure(uniprot_id):
+    """download_afdb_structure with an in-process TTL cache (misses cached briefly)
+
+    Returns (structure_data, etag); the ETag is a content hash computed once
+    per download.
+    """
+    now = time.monotonic()
+    with _structure_cache_lock:
+        entry = _structure_cache.get(uniprot_id)
+        if entry is not None and entry[0] > now:
+            return entry[1], entry[2]
+
+    # Download outside the lock so slow EBI responses don't serialize requests
+    structure_data = download_afdb_structure(uniprot_id)
+    etag = (
+        hashlib.blake2b(structure_data.encode(), digest_size=12).hexdigest()
+        if structure_data
+        else None
+    )
+
+    ttl = AFDB_CACHE_SECONDS if structure_data else AFDB_MISS_CACHE_SECONDS
+    with _structure_cache_lock:
+        _structure_cache.pop(uniprot_id, None)
+        _structure_cache[uniprot_id] = (time.monotonic() + ttl, structure_data, etag)
+        while len(_structure_cache) > AFDB_CACHE_SIZE:
+            del _structure_cache[next(iter(_structure_cache))]
+    return structure_data, etag
 
-        return jsonify(
-            {"status": "success", "uniprot_id": uniprot_id, "suggestions": suggestions}
-        )
 
-    except Exception as e:
-        log_bioemu_error(f"Error getting related proteins: {str(e)}")
-        return jsonify(
-            {"status": "failed", "message": f"Error getting related proteins: {str(e)}"}
-        ), 500
+def _check_alphafold_api_status():
+    """Check AlphaFold API status to provide helpful error messages
 
+    The probe result is cached briefly and only one request probes at a time;
+    concurrent callers get the last known status instead of waiting.
+    """
+    if time.monotonic() < _api_status_cache["expires_at"]:
+        return _api_status_cache["message"]
 
-def _check_alphafold_api_status():
-    """Check AlphaFold API status to provide helpful error messages"""
+    if not _api_status_lock.acquire(blocking=False):
+        return _api_status_cache["message"] or (
+            " There may be a connectivity issue or this protein is not in AlphaFold database."
+        )
     try:
-        import requests
+        _api_status_cache["message"] = _probe_alphafold_api()
+        _api_status_cache["expires_at"] = time.monotonic() + AFDB_STATUS_CACHE_SECONDS
+        return _api_status_cache["message"]
+    finally:
+        _api_status_lock.release()
 
-        test_response = requests.get(
-            "https://www.alphafold.ebi.ac.uk/api/prediction/P04637", timeout=10
-        )
-        if test_response.status_code >= 500:
+
+def _probe_alphafold_api():
+    """Probe the AlphaFold EBI API with a known entry (status line only)"""
+    url = "https://www.alphafold.ebi.ac.uk/api/prediction/P04637"
+    try:
+        status_code = http_session.head(
+            url, timeout=AFDB_PROBE_TIMEOUT, allow_redirects=True
+        ).status_code
+        if status_code in (405, 501):
+            # HEAD not supported - GET without downloading the body
+            with http_session.get(url, timeout=AFDB_PROBE_TIMEOUT, stream=True) as r:
+                status_code = r.status_code
+
+        if status_code >= 500:
             log_bioemu_error(
                 "AlphaFold EBI API is returning 500 Internal Server Error - API outage detected"
             )
             return " ⚠️ AlphaFold EBI API appears to be experiencing server issues (returning 500 errors). This is a temporary infrastructure problem, not an issue with your protein or our code. Please try again later."
-        elif test_response.status_code == 404:
+        elif status_code == 404:
             return " This protein may not be available in the AlphaFold database."
         else:
             return " There may be a connectivity issue or this protein is not in AlphaFold database."
-    except:
+    except requests.exceptions.RequestException:
         return " Unable to verify AlphaFold API status due to network issues."
 
 
+# The suggestion tables below are shared across requests; their lists are
+# tuples so a caller cannot mutate them in place
+
+# Designed proteins / common test cases, matched by name substring
+_SPECIAL_CASE_SUGGESTIONS = {
+    "trp-cage": {
+        "alphafold": (
+            {"id": "P01308", "name": "insulin", "category": "small protein"},
+            {"id": "P02768", "name": "albumin", "category": "comparison"},
+            {"id": "P69905", "name": "hemoglobin", "category": "comparison"},
+            {"id": "P04637", "name": "p53", "category": "comparison"},
+        ),
+        "pdb": (
+            {"id": "1L2Y", "name": "Trp-cage miniprotein"},
+            {"id": "2JOF", "name": "Trp-cage variant"},
+            {"id": "1UBQ", "name": "ubiquitin (small protein)"},
+            {"id": "1EJG", "name": "crambin (small protein)"},
+        ),
+    },
+    "ubiquitin": {
+        "alphafold": (
+            {"id": "P0CG48", "name": "ubiquitin", "category": "same protein"},
+            {"id": "P01308", "name": "insulin", "category": "small protein"},
+            {"id": "P69905", "name": "hemoglobin", "category": "comparison"},
+        ),
+        "pdb": (
+            {"id": "1UBQ", "name": "ubiquitin"},
+            {"id": "1F9J", "name": "ubiquitin variant"},
+            {"id": "1EJG", "name": "crambin"},
+        ),
+    },
+}
+
+# Protein family/category mappings with verified AlphaFold availability
+_PROTEIN_FAMILY_SUGGESTIONS = {
+    # Hormones & signaling
+    "P01308": {  # Insulin
+        "alphafold": (
+            {"id": "P01308", "name": "insulin (human)", "category": "hormone"},
+            {
+                "id": "P69905",
+                "name": "hemoglobin subunit alpha",
+                "category": "transport",
+            },
+            {"id": "P02768", "name": "serum albumin", "category": "transport"},
+        ),
+        "pdb": (
+            {"id": "1ZNI", "name": "insulin hexamer"},
+            {"id": "4INS", "name": "insulin"},
+            {"id": "1MSO", "name": "insulin analog"},
+        ),
+    },
+}
+
+# Commonly studied proteins and their suggested comparisons
+_WELL_KNOWN_PROTEIN_SUGGESTIONS = {
+    "P69905": {  # Hemoglobin alpha
+        "alphafold": (
+            {
+                "id": "P69905",
+                "name": "hemoglobin alpha",
+                "category": "same protein",
+            },
+            {
+                "id": "P68871",
+                "name": "hemoglobin beta",
+                "category": "related subunit",
+            },
+            {"id": "P02185", "name": "myoglobin", "category": "similar function"},
+        ),
+        "pdb": (
+            {"id": "1HHO", "name": "hemoglobin"},
+            {"id": "2HHB", "name": "deoxyhemoglobin"},
+            {"id": "1MBO", "name": "myoglobin"},
+        ),
+    },
+    "P02768": {  # Albumin
+        "alphafold": (
+            {"id": "P02768", "name": "serum albumin", "category": "same protein"},
+            {"id": "P01308", "name": "insulin", "category": "binding partner"},
+            {"id": "P69905", "name": "hemoglobin", "category": "blood protein"},
+        ),
+        "pdb": (
+            {"id": "1AO6", "name": "albumin"},
+            {"id": "1BM0", "name": "albumin complex"},
+            {"id": "1UOR", "name": "albumin"},
+        ),
+    },
+    "P04637": {  # p53
+        "alphafold": (
+            {
+                "id": "P04637",
+                "name": "p53 tumor suppressor",
+                "category": "same protein",
+            },
+            {"id": "Q00987", "name": "MDM2", "category": "regulatory partner"},
+            {"id": "P01308", "name": "insulin", "category": "comparison"},
+        ),
+        "pdb": (
+            {"id": "1TUP", "name": "p53 DNA binding domain"},
+            {"id": "1YCR", "name": "p53-MDM2 complex"},
+            {"id": "3KMD", "name": "p53 tetramer"},
+        ),
+    },
+}
+
+# Default suggestions for unknown proteins
+_DEFAULT_SUGGESTIONS = {
+    "alphafold": (
+        {"id": "P01308", "name": "insulin", "category": "hormone"},
+        {"id": "P69905", "name": "hemoglobin alpha", "category": "transport"},
+        {"id": "P02768", "name": "albumin", "category": "transport"},
+        {
+            "id": "P04637",
+            "name": "p53 tumor suppressor",
+            "category": "regulatory",
+        },
+    ),
+    "pdb": (
+        {"id": "1UBQ", "name": "ubiquitin"},
+        {"id": "1EJG", "name": "crambin"},
+        {"id": "1INS", "name": "insulin"},
+        {"id": "1MBO", "name": "myoglobin"},
+    ),
+}
+
+# Exact UniProt ID lookup (well-known proteins take precedence over families)
+_PROTEIN_SUGGESTIONS = {
+    **_PROTEIN_FAMILY_SUGGESTIONS,
+    **_WELL_KNOWN_PROTEIN_SUGGESTIONS,
+}
+
+
 def _get_protein_suggestions(uniprot_id):
     """Get contextual protein suggestions based on the current protein"""
-
-    # Handle special cases for designed proteins or common test cases
-    special_cases = {
-        "trp-cage": {
-            "alphafold": [
-                {"id": "P01308", "name": "insulin", "category": "small protein"},
-                {"id": "P02768", "name": "albumin", "category": "comparison"},
-                {"id": "P69905", "name": "hemoglobin", "category": "comparison"},
-                {"id": "P04637", "name": "p53", "category": "comparison"},
-            ],
-            "pdb": [
-                {"id": "1L2Y", "name": "Trp-cage miniprotein"},
-                {"id": "2JOF", "name": "Trp-cage variant"},
-                {"id": "1UBQ", "name": "ubiquitin (small protein)"},
-                {"id": "1EJG", "name": "crambin (small protein)"},
-            ],
-        },
-        "ubiquitin": {
-            "alphafold": [
-                {"id": "P0CG48", "name": "ubiquitin", "category": "same protein"},
-                {"id": "P01308", "name": "insulin", "category": "small protein"},
-                {"id": "P69905", "name": "hemoglobin", "category": "comparison"},
-            ],
-            "pdb": [
-                {"id": "1UBQ", "name": "ubiquitin"},
-                {"id": "1F9J", "name": "ubiquitin variant"},
-                {"id": "1EJG", "name": "crambin"},
-            ],
-        },
-    }
+    suggestions = _PROTEIN_SUGGESTIONS.get(uniprot_id)
+    if suggestions is not None:
+        return suggestions
 
     # Check if this might be a special case (check protein name patterns)
     uniprot_lower = uniprot_id.lower() if uniprot_id else ""
-    for special_name, suggestions in special_cases.items():
+    for special_name, suggestions in _SPECIAL_CASE_SUGGESTIONS.items():
         if special_name in uniprot_lower:
             return suggestions
 
-    # Protein family/category mappings with verified AlphaFold availability
-    protein_families = {
-        # Hormones & signaling
-        "P01308": {  # Insulin
-            "alphafold": [
-                {"id": "P01308", "name": "insulin (human)", "category": "hormone"},
-                {
-                    "id": "P69905",
-                    "name": "hemoglobin subunit alpha",
-                    "category": "transport",
-                },
-                {"id": "P02768", "name": "serum albumin", "category": "transport"},
-            ],
-            "pdb": [
-                {"id": "1ZNI", "name": "insulin hexamer"},
-                {"id": "4INS", "name": "insulin"},
-                {"id": "1MSO", "name": "insulin analog"},
-            ],
-        },
-        # Default suggestions for unknown proteins
-        "default": {
-            "alphafold": [
-                {"id": "P01308", "name": "insulin", "category": "hormone"},
-                {"id": "P69905", "name": "hemoglobin alpha", "category": "transport"},
-                {"id": "P02768", "name": "albumin", "category": "transport"},
-                {
-                    "id": "P04637",
-                    "name": "p53 tumor suppressor",
-                    "category": "regulatory",
-                },
-            ],
-            "pdb": [
-                {"id": "1UBQ", "name": "ubiquitin"},
-                {"id": "1EJG", "name": "crambin"},
-                {"id": "1INS", "name": "insulin"},
-                {"id": "1MBO", "name": "myoglobin"},
-            ],
-        },
-    }
-
-    # Commonly studied proteins and their suggested comparisons
-    well_known_proteins = {
-        "P69905": {  # Hemoglobin alpha
-            "alphafold": [
-                {
-                    "id": "P69905",
-                    "name": "hemoglobin alpha",
-                    "category": "same protein",
-                },
-                {
-                    "id": "P68871",
-                    "name": "hemoglobin beta",
-                    "category": "related subunit",
-                },
-                {"id": "P02185", "name": "myoglobin", "category": "similar function"},
-            ],
-            "pdb": [
-                {"id": "1HHO", "name": "hemoglobin"},
-                {"id": "2HHB", "name": "deoxyhemoglobin"},
-                {"id": "1MBO", "name": "myoglobin"},
-            ],
-        },
-        "P02768": {  # Albumin
-            "alphafold": [
-                {"id": "P02768", "name": "serum albumin", "category": "same protein"},
-                {"id": "P01308", "name": "insulin", "category": "binding partner"},
-                {"id": "P69905", "name": "hemoglobin", "category": "blood protein"},
-            ],
-            "pdb": [
-                {"id": "1AO6", "name": "albumin"},
-                {"id": "1BM0", "name": "albumin complex"},
-                {"id": "1UOR", "name": "albumin"},
-            ],
-        },
-        "P04637": {  # p53
-            "alphafold": [
-                {
-                    "id": "P04637",
-                    "name": "p53 tumor suppressor",
-                    "category": "same protein",
-                },
-                {"id": "Q00987", "name": "MDM2", "category": "regulatory partner"},
-                {"id": "P01308", "name": "insulin", "category": "comparison"},
-            ],
-            "pdb": [
-                {"id": "1TUP", "name": "p53 DNA binding domain"},
-                {"id": "1YCR", "name": "p53-MDM2 complex"},
-                {"id": "3KMD", "name": "p53 tetramer"},
-            ],
-        },
-    }
-
-    # Try to find specific suggestions for this protein
-    if uniprot_id in well_known_proteins:
-        return well_known_proteins[uniprot_id]
-    elif uniprot_id in protein_families:
-        return protein_families[uniprot_id]
-    else:
-        # Return default suggestions
-        return protein_families["default"]
+    # Return default suggestions
+    return _DEFAULT_SUGGESTIONS
@@ -3,7 +3,7 @@ Structure comparison endpoints.
 
 Blueprint: comparison_bp
 Routes:
-    POST /api/analyze-reference-structure - Analyze reference structure (AlphaFold/PDB)
+    POST /api/analyze-reference-structure - Analyze reference structure(s) (AlphaFold/PDB)
     POST /api/compare-md-reference - Compare MD ensemble with reference structure
 """
 
@@ -18,15 +18,23 @@ from logging_utils import (
     log_bioemu_timing,
     print_separator,
 )
+from async_utils import gather_async
+from config import PDB_BATCH_MAX_IDS
+from pdb_service import validate_pdb_id
 from reference_structure_analysis import (
     fetch_pdb_structure,
+    fetch_pdb_structure_async,
     analyze_reference_structure,
+    analyze_reference_structures_batch,
     compare_md_with_reference,
 )
 
 
 comparison_bp = Blueprint("comparison", __name__)
 
+# Record names a raw (not base64-encoded) PDB upload starts with
+_PDB_RECORD_PREFIXES = ("HEADER", "TITLE", "REMARK", "CRYST1", "MODEL", "ATOM", "HETATM")
+
 
 @comparison_bp.route("/api/analyze-reference-structure", methods=["POST"])
 def analyze_reference_structure_endpoint():
@@ -73,12 +81,28 @@ def analyze_reference_structure_endpoint():
                 ), 400
 
         elif structure_source == "pdb":
+            pdb_ids = data.get("pdb_ids")
+            if pdb_ids is not None:
+                error = _pdb_ids_error(pdb_ids)
+                if error:
+                    return jsonify({"status": "failed", "message": error}), 400
+
+            # Several PDB IDs: fetch concurrently and analyze as one batch
+            if pdb_ids and len(pdb_ids) > 1:
+                return _analyze_pdb_batch(
+                    pdb_ids, data.get("target_sequence"), start_time
+                )
+
             # Fetch from PDB database
-            pdb_id = data.get("pdb_id")
+            pdb_id = data.get("pdb_id") or (pdb_ids[0] if pdb_ids else None)
             if not pdb_id:
                 return jsonify(
                     {"status": "failed", "message": "PDB ID not provided"}
                 ), 400
+            if not isinstance(pdb_id, str) or not validate_pdb_id(pdb_id):
+                return jsonify(
+                    {"status": "failed", "message": f"Invalid PDB ID: {pdb_id}"}
+                ), 400
 
             log_bioemu_info(f"Fetching PDB structure: {pdb_id}")
             pdb_content = fetch_pdb_structure(pdb_id)
@@ -104,14 +128,20 @@ def analyze_reference_structure_endpoint():
                 # Handle both raw text and base64 encoded
                 if uploaded_pdb.startswith("data:"):
                     # Extract base64 part if data URL
-                    pdb_content = base64.b64decode(uploaded_pdb.split(",")[1]).decode(
-                        "utf-8"
-                    )
+                    pdb_content = base64.b64decode(
+                        uploaded_pdb.partition(",")[2]
+                    ).decode("utf-8")
+                elif uploaded_pdb[:100].lstrip().startswith(_PDB_RECORD_PREFIXES):
+                    # Raw PDB text - skip the base64 attempt entirely
+                    pdb_content = uploaded_pdb
                 elif len(uploaded_pdb) % 4 == 0:
-                    # Try to decode as base64
+                    # Try to decode as base64 (validate=True rejects non-base64
+                    # input up front instead of decoding garbage)
                     try:
-                        pdb_content = base64.b64decode(uploaded_pdb).decode("utf-8")
-                    except:
+                        pdb_content = base64.b64decode(
+                            uploaded_pdb, validate=True
+                        ).decode("utf-8")
+                    except ValueError:
                         pdb_content = uploaded_pdb
                 else:
                     pdb_content = uploaded_pdb
@@ -219,3 +249,50 @@ def compare_md_reference_endpoint():
     finally:
         print_separator()
         log_bioemu_info("=== MD vs REFERENCE COMPARISON END ===")
+
+
+def _pdb_ids_error(pdb_ids):
+    """Return why a client-supplied pdb_ids value is unusable, or None if it is valid"""
+    if not isinstance(pdb_ids, list):
+        return "pdb_ids must be a list of PDB IDs"
+    if len(pdb_ids) > PDB_BATCH_MAX_IDS:
+        return f"Too many PDB IDs: {len(pdb_ids)} (maximum {PDB_BATCH_MAX_IDS})"
+    for pdb_id in pdb_ids:
+        if not isinstance(pdb_id, str) or not validate_pdb_id(pdb_id):
+            return f"Invalid PDB ID: {pdb_id}"
+    return None
+
+
+def _analyze_pdb_batch(pdb_ids, target_sequence, start_time):
+    """Fetch several PDB structures concurrently and analyze them in one DSSP pass"""
+    log_bioemu_info(f"Fetching {len(pdb_ids)} PDB structures: {', '.join(pdb_ids)}")
+    contents = gather_async(*(fetch_pdb_structure_async(pdb_id) for pdb_id in pdb_ids))
+
+    fetched = [i for i, content in enumerate(contents) if content]
+    log_bioemu_info(f"Analyzing {len(fetched)} pdb reference structures...")
+    analyses = analyze_reference_structures_batch(
+        [contents[i] for i in fetched], [target_sequence] * len(fetched)
+    )
+    analysis_by_index = dict(zip(fetched, analyses))
+
+    results = []
+    for i, pdb_id in enumerate(pdb_ids):
+        analysis = analysis_by_index.get(i)
+        if analysis is None:
+            message = (
+                "Reference structure analysis failed"
+                if i in analysis_by_index
+                else f"Could not fetch PDB structure: {pdb_id}"
+            )
+            results.append({"status": "failed", "pdb_id": pdb_id.upper(), "message": message})
+            continue
+        analysis["source_info"] = {"type": "pdb", "pdb_id": pdb_id.upper()}
+        results.append({"status": "success", "pdb_id": pdb_id.upper(), "analysis": analysis})
+
+    end_time = time.time()
+    log_bioemu_timing("Reference Structure Analysis", start_time, end_time)
+    log_bioemu_success(
+        f"Analyzed {sum(r['status'] == 'success' for r in results)}/{len(pdb_ids)} reference structures"
+    )
+
+    return jsonify({"status": "success", "analyses": results})
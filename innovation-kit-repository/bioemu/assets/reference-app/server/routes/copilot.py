@@ -43,7 +43,10 @@ def copilot_ask():
 
         # Get response from Azure OpenAI copilot service
         start_time = time.time()
-        copilot_result = get_copilot_response(user_message, context)
+        # ?no_cache=1 forces a fresh answer (e.g. for deterministic replays)
+        copilot_result = get_copilot_response(
+            user_message, context, use_cache=request.args.get("no_cache") != "1"
+        )
         end_time = time.time()
 
         # Extract the response text from the result
@@ -8,13 +8,28 @@ Routes:
     GET /<path> - React SPA catch-all for all non-API routes
 """
 
+import hashlib
+import logging
 import os
-from flask import Blueprint, jsonify, request, send_from_directory, send_file
+from flask import Blueprint, Response, jsonify, request, send_from_directory
+from werkzeug.exceptions import NotFound
 
 from config import BUILD_DIR
 
 
 frontend_bp = Blueprint("frontend", __name__)
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = os.path.join(BUILD_DIR, "index.html")
+
+# Browser cache lifetimes (seconds); responses carry ETag/Last-Modified, so
+# stale copies revalidate with a cheap 304
+INDEX_MAX_AGE = 60
+ROOT_ASSET_MAX_AGE = 3600
+
+# index.html is fixed for the process lifetime (restart after rebuilding the
+# frontend); it is read once and served from memory with a content ETag
+_index_page = {"body": None, "etag": None}
 
 
 @frontend_bp.route("/favicon.ico")
@@ -26,17 +41,15 @@ def serve_root_assets():
     """Serve specific root assets from build directory"""
     # Get the filename from the request path
     filename = request.path[1:]  # Remove leading slash
+    logger.debug(f"Root asset request: {filename}")
 
-    file_path = os.path.join(BUILD_DIR, filename)
-    print(f"Root asset request: {filename}")
-    print(f"Asset path: {file_path}")
-    print(f"Asset exists: {os.path.exists(file_path)}")
-
-    if os.path.exists(file_path):
-        print(f"Serving root asset: {filename}")
-        return send_from_directory(BUILD_DIR, filename)
-    else:
-        print(f"Root asset not found: {filename}")
+    # send_from_directory checks existence itself
+    try:
+        return send_from_directory(
+            BUILD_DIR, filename, max_age=ROOT_ASSET_MAX_AGE, conditional=True
+        )
+    except NotFound:
+        logger.debug(f"Root asset not found: {filename}")
         return "Asset not found", 404
 
 
@@ -44,7 +57,7 @@ def serve_root_assets():
 @frontend_bp.route("/<path:path>")
 def serve_react_app(path=""):
     """Serve React app for all non-API routes"""
-    print(f"React app request: path='{path}'")
+    logger.debug(f"React app request: path='{path}'")
 
     # If it's an API route, don't handle it here (let Flask return 404)
     if path.startswith("api/"):
@@ -55,8 +68,20 @@ def serve_react_app(path=""):
         return jsonify({"error": "Static file not found"}), 404
 
     # Serve the React index.html for all other routes
-    index_file = os.path.join(BUILD_DIR, "index.html")
-    print(f"Serving index.html from: {os.path.abspath(index_file)}")
-    print(f"File exists: {os.path.exists(index_file)}")
+    if _index_page["body"] is None:
+        _load_index_page()
+
+    response = Response(_index_page["body"], mimetype="text/html")
+    response.set_etag(_index_page["etag"])
+    response.cache_control.public = True
+    response.cache_control.max_age = INDEX_MAX_AGE
+    return response.make_conditional(request)
+
 
-    return send_file(index_file)
+def _load_index_page():
+    """Read index.html into memory and hash it for the ETag"""
+    with open(INDEX_FILE, "rb") as f:
+        body = f.read()
+    _index_page["etag"] = hashlib.blake2b(body, digest_size=16).hexdigest()
+    _index_page["body"] = body
+    logger.debug(f"Loaded {INDEX_FILE} ({len(body)} bytes)")
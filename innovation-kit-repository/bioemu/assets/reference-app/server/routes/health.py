@@ -8,36 +8,76 @@ Routes:
     GET /api/config - Frontend runtime configuration
 """
 
+import json
 import os
-from flask import Blueprint, jsonify
+import threading
+import time
+from flask import Blueprint, Response, jsonify
 
 from config import (
     API_ENDPOINT,
     API_KEY,
     BIOEMU_MODE,
+    LOCAL_STATUS_CACHE_SECONDS,
 )
 from logging_utils import log_bioemu_info
 
 
+# local_bioemu.get_local_status, resolved on first use, plus a short-lived
+# copy of its result so probe storms trigger one GPU/package check per window
+_local_status_fn = None
+_local_status_cache = {"status": None, "last_checked": 0.0}
+_local_status_lock = threading.Lock()
+
+
 # Lazy import to avoid circular dependency
 def get_local_status():
     """Get local BioEmu status - imports dynamically to avoid circular deps"""
-    try:
-        from local_bioemu import get_local_status as _get_local_status
-
-        return _get_local_status()
-    except ImportError:
-        return {"available": False, "errors": ["local_bioemu module not available"]}
+    global _local_status_fn
+    with _local_status_lock:
+        now = time.monotonic()
+        if (
+            _local_status_cache["status"] is not None
+            and now - _local_status_cache["last_checked"] < LOCAL_STATUS_CACHE_SECONDS
+        ):
+            return _local_status_cache["status"]
+
+        if _local_status_fn is None:
+            try:
+                from local_bioemu import get_local_status as _local_status_fn
+            except ImportError:
+                return {
+                    "available": False,
+                    "errors": ["local_bioemu module not available"],
+                }
+
+        _local_status_cache["status"] = _local_status_fn()
+        _local_status_cache["last_checked"] = now
+        return _local_status_cache["status"]
 
 
 health_bp = Blueprint("health", __name__)
 
+# Constant response bodies, serialized once at import (probe fast path)
+_HEALTH_BODY = json.dumps(
+    {"status": "healthy", "message": "BioEmu API proxy is running"}
+).encode()
+_FRONTEND_CONFIG_BODY = json.dumps(
+    {
+        "backendUrl": "",  # Empty string means use relative URLs (same origin)
+        "apiEndpoint": API_ENDPOINT or "not_configured",
+        "apiKeyConfigured": bool(API_KEY),
+        "environment": os.getenv("FLASK_ENV", "development"),
+        "version": "1.0.0",
+    }
+).encode()
+
 
 @health_bp.route("/health", methods=["GET"])
 def health_check():
     """Simple health check endpoint"""
     log_bioemu_info("Health check requested")
-    return jsonify({"status": "healthy", "message": "BioEmu API proxy is running"}), 200
+    return Response(_HEALTH_BODY, status=200, mimetype="application/json")
 
 
 @health_bp.route("/api/status", methods=["GET"])
@@ -69,12 +109,4 @@ def check_api_status():
 @health_bp.route("/api/config")
 def get_frontend_config():
     """Provide runtime configuration for the frontend"""
-    return jsonify(
-        {
-            "backendUrl": "",  # Empty string means use relative URLs (same origin)
-            "apiEndpoint": API_ENDPOINT or "not_configured",
-            "apiKeyConfigured": bool(API_KEY),
-            "environment": os.getenv("FLASK_ENV", "development"),
-            "version": "1.0.0",
-        }
-    )
+    return Response(_FRONTEND_CONFIG_BODY, mimetype="application/json")
@@ -6,6 +6,10 @@ Routes:
     GET /api/pdb-sequence/<pdb_id> - Get protein sequence from PDB ID
     GET /api/pdb-info/<pdb_id> - Get comprehensive PDB entry information
     GET /api/pdb-chains/<pdb_id> - Get available chains in a PDB structure
+    GET /api/pdb-cache-info - PDB lookup cache statistics
+
+Malformed PDB IDs never reach these handlers: the pdb_id URL converter
+(url_converters.py) only matches valid IDs and upper-cases them.
 """
 
 from flask import Blueprint, jsonify, request
@@ -17,32 +21,22 @@ from logging_utils import (
     log_bioemu_data,
 )
 from pdb_service import (
-    validate_pdb_id,
     sequence_from_pdb_id,
     get_pdb_info,
     get_available_chains,
+    lookup_cache_info,
 )
 
 
 pdb_bp = Blueprint("pdb", __name__)
 
 
-@pdb_bp.route("/api/pdb-sequence/<pdb_id>", methods=["GET"])
+@pdb_bp.route("/api/pdb-sequence/<pdb_id:pdb_id>", methods=["GET"])
 def get_pdb_sequence_endpoint(pdb_id):
     """Get protein sequence from PDB ID"""
     log_bioemu_info(f"=== PDB SEQUENCE REQUEST: {pdb_id} ===")
 
     try:
-        # Validate PDB ID format
-        if not validate_pdb_id(pdb_id):
-            log_bioemu_error(f"Invalid PDB ID format: {pdb_id}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid PDB ID format: {pdb_id}. Expected format: 4 characters (e.g., 1UBQ)",
-                }
-            ), 400
-
         # Get optional chain parameter
         chain_id = request.args.get("chain", None)
 
@@ -65,7 +59,7 @@ def get_pdb_sequence_endpoint(pdb_id):
 
         response_data = {
             "status": "success",
-            "pdb_id": pdb_id.upper(),
+            "pdb_id": pdb_id,
             "chain_id": chain_id,
             "sequence": sequence,
             "sequence_length": len(sequence),
@@ -85,22 +79,12 @@ def get_pdb_sequence_endpoint(pdb_id):
         ), 500
 
 
-@pdb_bp.route("/api/pdb-info/<pdb_id>", methods=["GET"])
+@pdb_bp.route("/api/pdb-info/<pdb_id:pdb_id>", methods=["GET"])
 def get_pdb_info_endpoint(pdb_id):
     """Get comprehensive information about a PDB entry"""
     log_bioemu_info(f"=== PDB INFO REQUEST: {pdb_id} ===")
 
     try:
-        # Validate PDB ID format
-        if not validate_pdb_id(pdb_id):
-            log_bioemu_error(f"Invalid PDB ID format: {pdb_id}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid PDB ID format: {pdb_id}. Expected format: 4 characters (e.g., 1UBQ)",
-                }
-            ), 400
-
         # Get PDB information
         pdb_info = get_pdb_info(pdb_id)
         if not pdb_info:
@@ -129,28 +113,18 @@ def get_pdb_info_endpoint(pdb_id):
         ), 500
 
 
-@pdb_bp.route("/api/pdb-chains/<pdb_id>", methods=["GET"])
+@pdb_bp.route("/api/pdb-chains/<pdb_id:pdb_id>", methods=["GET"])
 def get_pdb_chains_endpoint(pdb_id):
     """Get available chains in a PDB structure"""
     log_bioemu_info(f"=== PDB CHAINS REQUEST: {pdb_id} ===")
 
     try:
-        # Validate PDB ID format
-        if not validate_pdb_id(pdb_id):
-            log_bioemu_error(f"Invalid PDB ID format: {pdb_id}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid PDB ID format: {pdb_id}. Expected format: 4 characters (e.g., 1UBQ)",
-                }
-            ), 400
-
         # Get available chains
         chains = get_available_chains(pdb_id)
 
         response_data = {
             "status": "success",
-            "pdb_id": pdb_id.upper(),
+            "pdb_id": pdb_id,
             "chains": chains,
             "chain_count": len(chains),
         }
@@ -164,3 +138,9 @@ def get_pdb_chains_endpoint(pdb_id):
         return jsonify(
             {"status": "failed", "message": f"Error fetching PDB chains: {str(e)}"}
         ), 500
+
+
+@pdb_bp.route("/api/pdb-cache-info", methods=["GET"])
+def get_pdb_cache_info_endpoint():
+    """Report size and hit/miss counts of the PDB lookup cache"""
+    return jsonify({"status": "success", "cache": lookup_cache_info()})
@@ -4,14 +4,33 @@ BioEmu prediction endpoints.
 Blueprint: prediction_bp
 Routes:
     POST /api/predict - Protein structure prediction
+        (Azure mode streams results as NDJSON for Accept: application/x-ndjson;
+        Accept: application/msgpack returns pdb_data/xtc_data as raw binary)
     POST /api/predict-uniprot - Enhanced prediction with UniProt ID or sequence
+
+Azure predictions are cached by sequence and sample count; pass ?no_cache=1
+to force a fresh run.
 """
 
+import asyncio
+import binascii
+import hashlib
+import mmap
+import threading
 import time
-import requests
-from flask import Blueprint, jsonify, request
-
-from config import API_ENDPOINT, API_KEY, BIOEMU_MODE
+import uuid
+import httpx
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+from config import (
+    API_ENDPOINT,
+    API_KEY,
+    AZURE_MAX_CONCURRENCY,
+    AZURE_PREDICT_RETRIES,
+    AZURE_PREDICT_TIMEOUT,
+    BIOEMU_MODE,
+    LOG_DATA,
+)
 from logging_utils import (
     log_bioemu_info,
     log_bioemu_error,
@@ -20,13 +39,28 @@ from logging_utils import (
     log_bioemu_timing,
     print_separator,
 )
+from async_utils import http_client, run_async, spawn_async
+from cache_utils import cache_prediction, prediction_cache
+from json_utils import request_payload
 from uniprot_service import (
     validate_uniprot_id,
-    get_protein_sequence_from_uniprot,
-    get_protein_info_from_uniprot,
-    download_afdb_structure,
+    get_protein_sequence_from_uniprot_async,
+    get_protein_info_from_uniprot_async,
+    download_afdb_structure_async,
 )
 
+# Optional: incremental JSON decoding for NDJSON streaming of Azure results
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: MessagePack responses with raw binary structure/trajectory data
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Import local BioEmu inference (optional - only used when BIOEMU_MODE=local)
 try:
     from local_bioemu import (
@@ -44,6 +78,27 @@ except ImportError:
 
 prediction_bp = Blueprint("prediction", __name__)
 
+# Chunk size for streaming binary prediction outputs
+STREAM_CHUNK_BYTES = 1 << 20
+
+# Azure request headers; the key is fixed for the process lifetime
+_AZURE_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Authorization": f"Bearer {API_KEY}",
+}
+# Bounds in-flight Azure prediction calls on the shared event loop
+_azure_slots = asyncio.Semaphore(AZURE_MAX_CONCURRENCY)
+# Azure calls in flight by cache key, so identical concurrent predictions
+# share one upstream call
+_azure_pending = {}
+_azure_pending_lock = threading.Lock()
+# Fail fast when the endpoint is unreachable; inference itself may be slow
+_AZURE_TIMEOUT = httpx.Timeout(AZURE_PREDICT_TIMEOUT, connect=5)
+# Transient gateway errors are retried with exponential backoff
+_AZURE_RETRY_STATUSES = frozenset({502, 503, 504})
+_AZURE_BACKOFF_SECONDS = 0.2
+
 
 @prediction_bp.route("/api/predict", methods=["POST"])
 def predict_protein():
@@ -53,7 +108,7 @@ def predict_protein():
     start_time = time.time()
 
     try:
-        data = request.json
+        data = request_payload()
         sequence = data.get("sequence")
         num_samples = data.get("numSamples", 10)
 
@@ -63,11 +118,37 @@ def predict_protein():
                 {"status": "failed", "message": "Missing protein sequence"}
             ), 400
 
+        # Clients that prefer MessagePack get pdb_data/xtc_data as raw bytes
+        use_msgpack = (
+            msgpack is not None
+            and request.accept_mimetypes.best == "application/msgpack"
+        )
+
         # Route based on BIOEMU_MODE
         if BIOEMU_MODE == "local":
-            return _predict_protein_local(sequence, num_samples, start_time)
+            # Clients that prefer multipart/mixed get raw PDB/XTC bytes
+            raw_bytes = request.accept_mimetypes.best == "multipart/mixed"
+            return _predict_protein_local(
+                sequence,
+                num_samples,
+                start_time,
+                raw_bytes=raw_bytes,
+                use_msgpack=use_msgpack,
+            )
         else:
-            return _predict_protein_azure(sequence, num_samples, start_time)
+            # Clients that prefer NDJSON get one result per line as it is decoded
+            stream = (
+                ijson is not None
+                and request.accept_mimetypes.best == "application/x-ndjson"
+            )
+            return _predict_protein_azure(
+                sequence,
+                num_samples,
+                start_time,
+                stream=stream,
+                use_msgpack=use_msgpack,
+                use_cache=request.args.get("no_cache") != "1",
+            )
 
     except Exception as e:
         log_bioemu_error(f"Prediction request failed: {str(e)}")
@@ -79,10 +160,96 @@ def predict_protein():
         log_bioemu_info("=== BIOEMU PREDICTION REQUEST END ===")
 
 
-def _predict_protein_local(sequence: str, num_samples: int, start_time: float):
-    """Run prediction using local BioEmu model"""
-    import requests  # noqa: F401
+def _multipart_response(parts):
+    """
+    Stream (name, filename, mimetype, data) parts as a multipart/mixed response.
+
+    Sends binary payloads as-is instead of base64 inside JSON.
+    """
+    boundary = uuid.uuid4().hex
+
+    def generate():
+        for name, filename, mimetype, data in parts:
+            yield (
+                f"--{boundary}\r\n"
+                f"Content-Type: {mimetype}\r\n"
+                f'Content-Disposition: attachment; name="{name}"; filename="{filename}"\r\n'
+                f"Content-Length: {len(data)}\r\n\r\n"
+            ).encode("ascii")
+            # Slicing bytes/mmap payloads yields bytes chunks (WSGI servers
+            # only accept bytes) without copying the whole payload at once
+            for offset in range(0, len(data), STREAM_CHUNK_BYTES):
+                yield data[offset : offset + STREAM_CHUNK_BYTES]
+            yield b"\r\n"
+        yield f"--{boundary}--\r\n".encode("ascii")
+
+    return Response(generate(), mimetype=f"multipart/mixed; boundary={boundary}")
 
+
+def _log_first_result(results_data):
+    """Print the size and molecular data lengths of the first Azure result"""
+    # Azure always returns a non-empty list of dicts; anything else is skipped
+    try:
+        first = results_data[0]
+        first_keys = list(first.keys())
+        pdb_length = len(first.get("pdb_data", ""))
+        xtc_length = len(first.get("xtc_data", ""))
+    except (KeyError, TypeError, IndexError, AttributeError):
+        return
+
+    print(f"Results array contains {len(results_data)} items")
+    print(f"First result keys: {first_keys}")
+    if pdb_length:
+        print(f"PDB data found: {pdb_length} characters")
+    if xtc_length:
+        print(f"XTC data found: {xtc_length} characters")
+
+
+def _msgpack_response(payload):
+    """
+    Pack a prediction payload as MessagePack.
+
+    Base64 pdb_data/xtc_data strings (Azure, legacy local output) are decoded
+    and sent as binary, like the raw mmap buffers from local inference.
+    """
+    results = payload.get("results")
+    if isinstance(results, list):
+        payload = {**payload, "results": [_raw_binary_fields(r) for r in results]}
+
+    body = msgpack.packb(payload, use_bin_type=True, default=_msgpack_default)
+    return Response(body, mimetype="application/msgpack")
+
+
+def _raw_binary_fields(result):
+    """Copy of a result with base64 pdb_data/xtc_data decoded to bytes"""
+    if not isinstance(result, dict):
+        return result
+    result = dict(result)
+    for key in ("pdb_data", "xtc_data"):
+        if isinstance(result.get(key), str):
+            try:
+                # Strict: the lenient decoder skips non-base64 characters
+                result[key] = binascii.a2b_base64(result[key], strict_mode=True)
+            except (binascii.Error, ValueError):
+                pass  # Not base64 - send the string unchanged
+    return result
+
+
+def _msgpack_default(obj):
+    # Local output files are mmap'ed; msgpack packs their buffer directly
+    if isinstance(obj, mmap.mmap):
+        return memoryview(obj)
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to MessagePack")
+
+
+def _predict_protein_local(
+    sequence: str,
+    num_samples: int,
+    start_time: float,
+    raw_bytes: bool = False,
+    use_msgpack: bool = False,
+):
+    """Run prediction using local BioEmu model"""
     log_bioemu_info("Using LOCAL BioEmu inference")
 
     # Check if local BioEmu is available
@@ -110,13 +277,27 @@ def _predict_protein_local(sequence: str, num_samples: int, start_time: float):
     print(f"Sequence length: {len(sequence)}")
 
     try:
-        result = run_local_prediction(sequence, num_samples)
+        result = run_local_prediction(
+            sequence, num_samples, legacy_base64=not (raw_bytes or use_msgpack)
+        )
 
         end_time = time.time()
         log_bioemu_timing("Local BioEmu Prediction", start_time, end_time)
         log_bioemu_success("Local prediction completed successfully!")
 
-        return jsonify({"status": "success", "results": [result], "source": "local"})
+        if raw_bytes:
+            return _multipart_response(
+                [
+                    ("pdb_data", "topology.pdb", "chemical/x-pdb", result["pdb_data"]),
+                    ("xtc_data", "samples.xtc", "application/octet-stream", result["xtc_data"]),
+                    ("fasta_data", "sequence.fasta", "text/plain", sequence.encode("utf-8")),
+                ]
+            )
+
+        payload = {"status": "success", "results": [result], "source": "local"}
+        if use_msgpack:
+            return _msgpack_response(payload)
+        return jsonify(payload)
 
     except Exception as e:
         log_bioemu_error(f"Local prediction failed: {str(e)}")
@@ -125,10 +306,15 @@ def _predict_protein_local(sequence: str, num_samples: int, start_time: float):
         ), 500
 
 
-def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
+def _predict_protein_azure(
+    sequence: str,
+    num_samples: int,
+    start_time: float,
+    stream: bool = False,
+    use_msgpack: bool = False,
+    use_cache: bool = True,
+):
     """Run prediction using Azure BioEmu endpoint"""
-    import requests
-
     log_bioemu_info("Using AZURE BioEmu endpoint")
 
     if not API_ENDPOINT or not API_KEY:
@@ -145,11 +331,7 @@ def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
     print(f"Sequence length: {len(sequence)}")
     log_bioemu_info(f"Processing prediction for sequence of length {len(sequence)}")
 
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-        "Authorization": f"Bearer {API_KEY}",
-    }
+    headers = _AZURE_HEADERS
 
     payload = {"input_data": {"sequence": sequence, "num_samples": num_samples}}
 
@@ -158,14 +340,17 @@ def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
     log_bioemu_data("Request payload structure", payload)
     log_bioemu_info("Sending request to Azure BioEmu API...")
 
+    if stream:
+        return _ndjson_azure_response(headers, payload, start_time)
+
     api_start_time = time.time()
-    response = requests.post(API_ENDPOINT, headers=headers, json=payload)
+    response = _post_to_azure(headers, payload, use_cache=use_cache)
     api_end_time = time.time()
 
     print(f"Response status: {response.status_code}")
     log_bioemu_timing("API Response Time", api_start_time, api_end_time)
 
-    if not response.ok:
+    if not response.is_success:
         log_bioemu_error(f"API request failed with status {response.status_code}")
         log_bioemu_data("Error response", response.text, max_length=200)
         return jsonify(
@@ -182,12 +367,12 @@ def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
         print("Response received and parsed successfully")
 
         # Enhanced result logging
-        if isinstance(result, dict):
-            keys = list(result.keys())
-            print(f"Response keys: {keys}")
-            log_bioemu_data("Response structure", result, max_length=300)
-        else:
+        try:
+            print(f"Response keys: {list(result.keys())}")
+        except AttributeError:
             print(f"Response type: {type(result)}")
+        else:
+            log_bioemu_data("Response structure", result, max_length=300)
 
         log_bioemu_success("API request completed successfully!")
 
@@ -205,33 +390,27 @@ def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
         # Enhanced data flow tracking
         if "results" in result:
             print("Results structure found in response")
-            results_data = result["results"]
-            if isinstance(results_data, list) and len(results_data) > 0:
-                print(f"Results array contains {len(results_data)} items")
-                if isinstance(results_data[0], dict):
-                    first_keys = list(results_data[0].keys())
-                    print(f"First result keys: {first_keys}")
-
-                    # Check for specific molecular data
-                    if "pdb_data" in results_data[0]:
-                        pdb_length = len(results_data[0]["pdb_data"])
-                        print(f"PDB data found: {pdb_length} characters")
-                    if "xtc_data" in results_data[0]:
-                        xtc_length = len(results_data[0]["xtc_data"])
-                        print(f"XTC data found: {xtc_length} characters")
+            if LOG_DATA:
+                _log_first_result(result["results"])
 
             log_bioemu_success("Returning structured results to frontend")
             end_time = time.time()
             log_bioemu_timing("Total Prediction Request", start_time, end_time)
-            return jsonify(
-                {"status": "success", "results": result["results"], "source": "azure"}
-            )
+            payload = {
+                "status": "success",
+                "results": result["results"],
+                "source": "azure",
+            }
         else:
             print("Raw response being returned")
             log_bioemu_success("Returning raw response to frontend")
             end_time = time.time()
             log_bioemu_timing("Total Prediction Request", start_time, end_time)
-            return jsonify({"status": "success", "results": result, "source": "azure"})
+            payload = {"status": "success", "results": result, "source": "azure"}
+
+        if use_msgpack:
+            return _msgpack_response(payload)
+        return jsonify(payload)
 
     except Exception as e:
         log_bioemu_error(f"Error parsing API response: {str(e)}")
@@ -244,8 +423,6 @@ def _predict_protein_azure(sequence: str, num_samples: int, start_time: float):
 @prediction_bp.route("/api/predict-uniprot", methods=["POST"])
 def predict_protein_from_uniprot():
     """Enhanced endpoint that accepts either UniProt ID or sequence for prediction"""
-    import requests
-
     print_separator()
     log_bioemu_info("=== BIOEMU UNIPROT PREDICTION REQUEST START ===")
     start_time = time.time()
@@ -255,7 +432,7 @@ def predict_protein_from_uniprot():
         return jsonify({"status": "failed", "message": "Missing API credentials"}), 500
 
     try:
-        data = request.json
+        data = request_payload()
         uniprot_id = data.get("uniprot_id")
         sequence = data.get("sequence")
         num_samples = data.get("numSamples", 10)
@@ -274,6 +451,8 @@ def predict_protein_from_uniprot():
         # If UniProt ID is provided, fetch the sequence and info
         protein_info = None
         alphafold_structure = None
+        info_future = None
+        afdb_future = None
 
         if uniprot_id:
             log_bioemu_info(f"Processing UniProt ID: {uniprot_id}")
@@ -288,8 +467,18 @@ def predict_protein_from_uniprot():
                     }
                 ), 400
 
-            # Get protein sequence from UniProt
-            uniprot_sequence = get_protein_sequence_from_uniprot(uniprot_id)
+            # Protein info and the AlphaFold structure only go into the
+            # response, so they download on the shared loop while the
+            # sequence lookup and the Azure prediction run
+            info_future = spawn_async(get_protein_info_from_uniprot_async(uniprot_id))
+            if include_alphafold:
+                log_bioemu_info("Fetching AlphaFold structure...")
+                afdb_future = spawn_async(download_afdb_structure_async(uniprot_id))
+
+            uniprot_sequence = run_async(
+                get_protein_sequence_from_uniprot_async(uniprot_id)
+            )
+
             if not uniprot_sequence:
                 error_msg = f"Could not retrieve sequence for UniProt ID: {uniprot_id}"
                 log_bioemu_error(error_msg)
@@ -304,22 +493,6 @@ def predict_protein_from_uniprot():
             sequence = uniprot_sequence
             log_bioemu_success(f"Retrieved sequence from UniProt ID {uniprot_id}")
 
-            # Get additional protein information
-            protein_info = get_protein_info_from_uniprot(uniprot_id)
-            log_bioemu_data("Protein info", protein_info)
-
-            # Optionally fetch AlphaFold structure
-            if include_alphafold:
-                log_bioemu_info("Fetching AlphaFold structure...")
-                alphafold_structure = download_afdb_structure(uniprot_id)
-                if alphafold_structure:
-                    log_bioemu_success("AlphaFold structure retrieved")
-                    log_bioemu_data(
-                        "AlphaFold PDB", alphafold_structure, max_length=100
-                    )
-                else:
-                    log_bioemu_info("No AlphaFold structure available")
-
         # Validate sequence
         if not sequence:
             log_bioemu_error("No valid protein sequence available!")
@@ -337,11 +510,7 @@ def predict_protein_from_uniprot():
         log_bioemu_info(f"Processing prediction for sequence of length {len(sequence)}")
 
         # Prepare API request
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": f"Bearer {API_KEY}",
-        }
+        headers = _AZURE_HEADERS
 
         payload = {"input_data": {"sequence": sequence, "num_samples": num_samples}}
 
@@ -352,13 +521,15 @@ def predict_protein_from_uniprot():
 
         # Make API request
         api_start_time = time.time()
-        response = requests.post(API_ENDPOINT, headers=headers, json=payload)
+        response = _post_to_azure(
+            headers, payload, use_cache=request.args.get("no_cache") != "1"
+        )
         api_end_time = time.time()
 
         print(f"Response status: {response.status_code}")
         log_bioemu_timing("API Response Time", api_start_time, api_end_time)
 
-        if not response.ok:
+        if not response.is_success:
             error_msg = f"API request failed with status {response.status_code}"
             log_bioemu_error(error_msg)
             log_bioemu_data("Error response", response.text, max_length=200)
@@ -369,17 +540,29 @@ def predict_protein_from_uniprot():
                 }
             ), response.status_code
 
+        # Collect the UniProt lookups started alongside the prediction
+        if info_future is not None:
+            protein_info = info_future.result()
+            log_bioemu_data("Protein info", protein_info)
+        if afdb_future is not None:
+            alphafold_structure = afdb_future.result()
+            if alphafold_structure:
+                log_bioemu_success("AlphaFold structure retrieved")
+                log_bioemu_data("AlphaFold PDB", alphafold_structure, max_length=100)
+            else:
+                log_bioemu_info("No AlphaFold structure available")
+
         try:
             result = response.json()
             print("Response received and parsed successfully")
 
             # Enhanced result logging
-            if isinstance(result, dict):
-                keys = list(result.keys())
-                print(f"Response keys: {keys}")
-                log_bioemu_data("Response structure", result, max_length=300)
-            else:
+            try:
+                print(f"Response keys: {list(result.keys())}")
+            except AttributeError:
                 print(f"Response type: {type(result)}")
+            else:
+                log_bioemu_data("Response structure", result, max_length=300)
 
             log_bioemu_success("API request completed successfully!")
 
@@ -440,3 +623,234 @@ def predict_protein_from_uniprot():
     finally:
         print_separator()
         log_bioemu_info("=== BIOEMU UNIPROT PREDICTION REQUEST END ===")
+
+
+def _post_to_azure(headers, payload, use_cache: bool = True):
+    """POST a prediction request to the Azure BioEmu endpoint
+
+    Sent through the shared async client, so calls reuse pooled keep-alive
+    connections instead of a fresh TLS handshake per prediction. Successful
+    response bodies are cached on disk by endpoint, sequence and sample
+    count; a hit is returned as an equivalent httpx.Response. Concurrent
+    requests for the same prediction wait on a single Azure call.
+    """
+    input_data = payload["input_data"]
+    cache_key = hashlib.sha256(
+        f"{API_ENDPOINT}|{input_data['sequence'].upper()}|{input_data['num_samples']}".encode()
+    ).hexdigest()
+
+    if use_cache:
+        body = prediction_cache.get(cache_key)
+        if body is not None:
+            log_bioemu_info("Using cached Azure BioEmu prediction")
+            return httpx.Response(
+                200,
+                content=body,
+                headers={"Content-Type": "application/json"},
+                request=httpx.Request("POST", API_ENDPOINT),
+            )
+
+    with _azure_pending_lock:
+        future = _azure_pending.get(cache_key)
+        is_owner = future is None
+        if is_owner:
+            future = spawn_async(_post_to_azure_async(headers, payload))
+            _azure_pending[cache_key] = future
+    if not is_owner:
+        log_bioemu_info("Joining identical in-flight Azure BioEmu prediction")
+
+    try:
+        response = future.result()
+        # Only cache bodies the handlers will treat as a successful prediction
+        if is_owner and response.is_success:
+            try:
+                result = response.json()
+            except ValueError:
+                result = None
+            if isinstance(result, dict) and result.get("status", "success") == "success":
+                cache_prediction(cache_key, response.content)
+    finally:
+        if is_owner:
+            with _azure_pending_lock:
+                del _azure_pending[cache_key]
+    return response
+
+
+async def _post_to_azure_async(headers, payload):
+    """POST to Azure once one of the AZURE_MAX_CONCURRENCY slots is free"""
+    async with _azure_slots:
+        for attempt in range(AZURE_PREDICT_RETRIES + 1):
+            response = await http_client.post(
+                API_ENDPOINT, headers=headers, json=payload, timeout=_AZURE_TIMEOUT
+            )
+            if (
+                response.status_code not in _AZURE_RETRY_STATUSES
+                or attempt == AZURE_PREDICT_RETRIES
+            ):
+                return response
+            log_bioemu_info(
+                f"Azure returned {response.status_code}, retrying ({attempt + 1}/{AZURE_PREDICT_RETRIES})"
+            )
+            await asyncio.sleep(_AZURE_BACKOFF_SECONDS * 2**attempt)
+
+
+def _ndjson_azure_response(headers, payload, start_time: float):
+    """
+    Stream Azure prediction results to the client as NDJSON (one per line).
+
+    Results are decoded one at a time from the response body as it arrives,
+    so the parsed response is never held in memory as a whole and the first
+    result is sent before the last one has been received. The last line is a
+    {"status": ...} envelope (see _azure_stream_lines), so a client can tell
+    an empty prediction from a failed or truncated one.
+    """
+    api_request = http_client.build_request(
+        "POST", API_ENDPOINT, headers=headers, json=payload, timeout=_AZURE_TIMEOUT
+    )
+    # Holds one of the AZURE_MAX_CONCURRENCY slots until the body is closed
+    response = run_async(_send_streamed_async(api_request))
+    print(f"Response status: {response.status_code}")
+
+    closed = False
+
+    def close_upstream():
+        # Idempotent: called when the stream ends and again when the response
+        # is closed, which also covers a client that disconnects before the
+        # generator starts
+        nonlocal closed
+        if not closed:
+            closed = True
+            run_async(_close_streamed_async(response))
+
+    if not response.is_success:
+        try:
+            run_async(response.aread())
+        finally:
+            close_upstream()
+        log_bioemu_error(f"API request failed with status {response.status_code}")
+        log_bioemu_data("Error response", response.text, max_length=200)
+        return jsonify(
+            {
+                "status": "failed",
+                "message": (
+                    f"API request failed with status code {response.status_code}"
+                ),
+            }
+        ), response.status_code
+
+    def generate():
+        try:
+            for line in _azure_stream_lines(_StreamedBody(response)):
+                yield current_app.json.dumps(line).encode() + b"\n"
+        except (ijson.JSONError, httpx.HTTPError) as e:
+            log_bioemu_error(f"Error streaming API response: {str(e)}")
+            yield current_app.json.dumps(
+                {"status": "failed", "message": f"Error parsing API response: {str(e)}"}
+            ).encode() + b"\n"
+        finally:
+            close_upstream()
+            log_bioemu_timing("Total Prediction Request", start_time, time.time())
+
+    streamed = Response(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
+    streamed.call_on_close(close_upstream)
+    return streamed
+
+
+async def _send_streamed_async(api_request):
+    """Send a streamed Azure request once an AZURE_MAX_CONCURRENCY slot is free
+
+    The slot stays taken after this returns; _close_streamed_async frees it.
+    """
+    await _azure_slots.acquire()
+    try:
+        return await http_client.send(api_request, stream=True)
+    except BaseException:
+        _azure_slots.release()
+        raise
+
+
+async def _close_streamed_async(response):
+    """Close a response from _send_streamed_async and free its slot"""
+    try:
+        await response.aclose()
+    finally:
+        _azure_slots.release()
+
+
+def _azure_stream_lines(body):
+    """
+    Decode an Azure prediction body incrementally into NDJSON line objects.
+
+    Yields each item of the top-level "results" array as soon as it is
+    complete, then one closing line: {"status": "failed", "message": ...} if
+    the body's status is not success, else {"status": "success", "count": N,
+    "source": "azure"}. A body without a "results" array is sent as a single
+    result, as the JSON response does with a raw response.
+    """
+    # Everything outside the results array; that array is left in it empty
+    envelope = ijson.ObjectBuilder()
+    item = None
+    in_results = has_results = False
+    count = 0
+
+    for prefix, event, value in ijson.parse(body, use_float=True):
+        if in_results:
+            if prefix == "results":  # end of the results array
+                in_results = False
+                envelope.event(event, value)
+                continue
+            if item is None:
+                item = ijson.ObjectBuilder()
+            item.event(event, value)
+            if prefix == "results.item" and event not in (
+                "start_map",
+                "start_array",
+                "map_key",
+            ):
+                count += 1
+                yield item.value
+                item = None
+            continue
+
+        envelope.event(event, value)
+        if prefix == "results" and event == "start_array":
+            in_results = has_results = True
+
+    result = getattr(envelope, "value", None)
+    if isinstance(result, dict) and result.get("status", "success") != "success":
+        message = result.get("message", "Unknown API error")
+        log_bioemu_error(f"API returned error: {message}")
+        yield {"status": "failed", "message": message}
+        return
+
+    if not has_results:
+        # Non-array "results" are sent as-is, like the JSON response does
+        if isinstance(result, dict) and "results" in result:
+            result = result["results"]
+        log_bioemu_success("Returning raw response to frontend")
+        count += 1
+        yield result
+    else:
+        log_bioemu_success(f"Streamed {count} result(s) to frontend")
+    yield {"status": "success", "count": count, "source": "azure"}
+
+
+class _StreamedBody:
+    """Blocking file-like reader over a streamed httpx response (for ijson)"""
+
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+
+    async def _next_chunk(self):
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+    def read(self, size=-1):
+        # ijson probes with read(0) to tell bytes from text streams
+        if size == 0:
+            return b""
+        return run_async(self._next_chunk())
@@ -5,29 +5,102 @@ Blueprint: superposition_bp
 Routes:
     POST /api/superpose-structures - Superpose BioEmu trajectory onto AlphaFold
     POST /api/enhanced-superpose-structures - Enhanced superposition with custom PDB
+
+Both routes return the superposed XTC base64-encoded in the JSON body. Clients
+that send Accept: application/x-ndjson instead get the result object on the
+first line followed by {"chunk": <base64>} lines of the XTC.
 """
 
-import base64
+import os
+import tempfile
 import time
-from flask import Blueprint, jsonify, request
+from concurrent.futures import ThreadPoolExecutor, wait
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 
+from base64_utils import b64decode_to_file, b64encode
+from config import SCRATCH_DIR
+from json_utils import request_payload
 from logging_utils import (
     log_bioemu_info,
     log_bioemu_error,
     log_bioemu_success,
     log_bioemu_data,
 )
-from superposition_utils import perform_sequence_alignment_superposition
+from superposition_utils import (
+    backbone_cb_indices,
+    encode_xtc_base64,
+    load_backbone_reference,
+    map_xtc,
+    parallel_superpose,
+    perform_sequence_alignment_superposition,
+    rmsd_summary,
+)
+
+# Optional: MDTraj powers all superposition math; imported once at startup
+# rather than on the first request each worker serves
+try:
+    import mdtraj as md
+except ImportError:
+    md = None
 
 
 superposition_bp = Blueprint("superposition", __name__)
 
+# Raw XTC bytes per NDJSON chunk; a multiple of 3 so the base64 chunks
+# concatenate into the base64 of the whole file
+XTC_STREAM_CHUNK = 3 << 16
+
+# Shared by all requests for decoding uploaded files; base64 decoding and
+# the scratch writes of separate inputs overlap instead of running in turn
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vkit-io")
+
+
+def _decode_inputs(data, paths):
+    """
+    Decode the base64 fields of data named in paths ({key: path}) concurrently.
+
+    Returns {key: bytes written}. Every decode finishes before this returns,
+    so a failure never leaves a write running into the scratch directory;
+    the first error is then re-raised.
+    """
+    futures = {
+        key: _IO_POOL.submit(b64decode_to_file, data[key], path)
+        for key, path in paths.items()
+    }
+    wait(futures.values())
+    return {key: future.result() for key, future in futures.items()}
+
+
+def _superposition_response(result, traj, xtc_path, stream=False):
+    """
+    Save the superposed trajectory at xtc_path and respond with it and result.
+
+    By default the XTC is embedded base64-encoded as "superposed_trajectory".
+    With stream=True it is sent as NDJSON straight from a mapping of the file,
+    so the whole encoded trajectory is never built as one string.
+    """
+    if not stream:
+        return jsonify(
+            {**result, "superposed_trajectory": encode_xtc_base64(traj, xtc_path)}
+        )
+
+    mapped = map_xtc(traj, xtc_path)
+
+    def generate():
+        with mapped:
+            yield current_app.json.dumps(result).encode() + b"\n"
+            for start in range(0, len(mapped), XTC_STREAM_CHUNK):
+                chunk = b64encode(mapped[start : start + XTC_STREAM_CHUNK])
+                yield b'{"chunk":"' + chunk.encode("ascii") + b'"}\n'
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 
 @superposition_bp.route("/api/superpose-structures", methods=["POST"])
 def superpose_structures():
     """Superpose BioEmu trajectory onto AlphaFold reference structure"""
     try:
-        data = request.json
+        data = request_payload()
         if (
             not data
             or "bioemu_pdb" not in data
@@ -44,180 +117,162 @@ def superpose_structures():
         log_bioemu_info("=== STRUCTURAL SUPERPOSITION START ===")
         start_time = time.time()
 
-        # Decode input data
-        bioemu_pdb_data = base64.b64decode(data["bioemu_pdb"])
-        bioemu_xtc_data = base64.b64decode(data["bioemu_xtc"])
-        alphafold_pdb_data = base64.b64decode(data["alphafold_pdb"])
-
         # Check if sequence alignment is requested
         use_sequence_alignment = data.get("use_sequence_alignment", False)
+        # Clients that prefer NDJSON get the superposed XTC streamed in chunks
+        stream = request.accept_mimetypes.best == "application/x-ndjson"
 
-        log_bioemu_data(
-            "Superposition input",
-            {
-                "bioemu_pdb_size": len(bioemu_pdb_data),
-                "bioemu_xtc_size": len(bioemu_xtc_data),
-                "alphafold_pdb_size": len(alphafold_pdb_data),
-                "use_sequence_alignment": use_sequence_alignment,
-            },
-        )
+        if md is None:
+            log_bioemu_error("MDTraj not available for structural superposition")
+            return jsonify(
+                {
+                    "status": "failed",
+                    "message": "MDTraj library not available. Please install mdtraj for structural superposition.",
+                }
+            ), 500
 
-        # Import MDTraj for superposition
-        try:
-            import mdtraj as md
-            import tempfile
-            import os
-
-            # Create temporary files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Try sequence alignment first if requested
-                if use_sequence_alignment:
-                    log_bioemu_info("Attempting sequence-aligned superposition...")
-                    success, result_data, error_msg = (
-                        perform_sequence_alignment_superposition(
-                            bioemu_pdb_data,
-                            bioemu_xtc_data,
-                            alphafold_pdb_data,
-                            temp_dir,
-                        )
+        # Create temporary files
+        with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as temp_dir:
+            # Decode input data straight into the scratch directory
+            alphafold_path = os.path.join(temp_dir, "alphafold_ref.pdb")
+            bioemu_pdb_path = os.path.join(temp_dir, "bioemu.pdb")
+            bioemu_xtc_path = os.path.join(temp_dir, "bioemu.xtc")
+
+            inputs = {"bioemu_pdb": bioemu_pdb_path, "bioemu_xtc": bioemu_xtc_path}
+            if use_sequence_alignment:
+                # The aligned path parses the full AlphaFold model itself
+                inputs["alphafold_pdb"] = alphafold_path
+            sizes = _decode_inputs(data, inputs)
+
+            log_bioemu_data(
+                "Superposition input",
+                {
+                    "bioemu_pdb_size": sizes["bioemu_pdb"],
+                    "bioemu_xtc_size": sizes["bioemu_xtc"],
+                    "use_sequence_alignment": use_sequence_alignment,
+                },
+            )
+
+            # Try sequence alignment first if requested
+            if use_sequence_alignment:
+                log_bioemu_info("Attempting sequence-aligned superposition...")
+                success, result_data, error_msg = (
+                    perform_sequence_alignment_superposition(
+                        bioemu_pdb_path,
+                        bioemu_xtc_path,
+                        alphafold_path,
                     )
+                )
 
-                    if success:
-                        elapsed = time.time() - start_time
-                        result_data["processing_time"] = round(elapsed, 2)
-                        return jsonify({"status": "success", **result_data})
-                    else:
-                        log_bioemu_error(f"Sequence alignment failed: {error_msg}")
-                        log_bioemu_info("Falling back to simple superposition...")
+                if success:
+                    elapsed = time.time() - start_time
+                    result_data["processing_time"] = round(elapsed, 2)
+                    superposed_traj = result_data.pop("superposed_trajectory")
+                    return _superposition_response(
+                        {"status": "success", **result_data},
+                        superposed_traj,
+                        os.path.join(temp_dir, "superposed_trajectory_aligned.xtc"),
+                        stream,
+                    )
+                else:
+                    log_bioemu_error(f"Sequence alignment failed: {error_msg}")
+                    log_bioemu_info("Falling back to simple superposition...")
 
-                # Fallback to simple superposition (original working method)
-                log_bioemu_info("Performing simple backbone+CB superposition...")
+            # Fallback to simple superposition (original working method)
+            log_bioemu_info("Performing simple backbone+CB superposition...")
 
-                # Write AlphaFold reference structure
-                alphafold_path = os.path.join(temp_dir, "alphafold_ref.pdb")
-                with open(alphafold_path, "wb") as f:
-                    f.write(alphafold_pdb_data)
+            log_bioemu_info("Loading reference structure (AlphaFold)...")
+            # Load AlphaFold reference structure (backbone + CB atoms)
+            ref_n_atoms, reference_traj = load_backbone_reference(
+                data["alphafold_pdb"], alphafold_path
+            )
 
-                # Write BioEmu trajectory files
-                bioemu_pdb_path = os.path.join(temp_dir, "bioemu.pdb")
-                bioemu_xtc_path = os.path.join(temp_dir, "bioemu.xtc")
+            log_bioemu_info(
+                f"Reference structure: {ref_n_atoms} atoms, {reference_traj.n_atoms} atoms for superposition"
+            )
 
-                with open(bioemu_pdb_path, "wb") as f:
-                    f.write(bioemu_pdb_data)
-                with open(bioemu_xtc_path, "wb") as f:
-                    f.write(bioemu_xtc_data)
+            log_bioemu_info("Loading BioEmu trajectory...")
+            # Load BioEmu trajectory
+            sample_traj = md.load(bioemu_xtc_path, top=bioemu_pdb_path)
 
-                log_bioemu_info("Loading reference structure (AlphaFold)...")
-                # Load AlphaFold reference structure
-                ref = md.load(alphafold_path)
+            log_bioemu_info(
+                f"BioEmu trajectory: {sample_traj.n_frames} frames, {sample_traj.n_atoms} atoms"
+            )
 
-                # Select backbone + CB atoms for superposition
-                backbone_ind = ref.topology.select("backbone or name CB")
-                reference_traj = ref.atom_slice(backbone_ind)
+            # Select corresponding atoms in BioEmu trajectory
+            try:
+                bioemu_ind = backbone_cb_indices(sample_traj.topology)
 
                 log_bioemu_info(
-                    f"Reference structure: {ref.n_atoms} atoms, {len(backbone_ind)} atoms for superposition"
+                    f"BioEmu atoms for superposition: {len(bioemu_ind)}"
                 )
 
-                log_bioemu_info("Loading BioEmu trajectory...")
-                # Load BioEmu trajectory
-                sample_traj = md.load(bioemu_xtc_path, top=bioemu_pdb_path)
+                # Check atom count compatibility
+                if reference_traj.n_atoms != len(bioemu_ind):
+                    return jsonify(
+                        {
+                            "status": "failed",
+                            "message": f"Cannot superpose: atom count mismatch (AlphaFold: {reference_traj.n_atoms}, BioEmu: {len(bioemu_ind)})",
+                        }
+                    ), 400
 
-                log_bioemu_info(
-                    f"BioEmu trajectory: {sample_traj.n_frames} frames, {sample_traj.n_atoms} atoms"
+                log_bioemu_info("Performing structural superposition...")
+                # Fit the full trajectory on its backbone+CB atoms (one QCP
+                # pass); reference_traj is already sliced, so all its atoms
+                # are the fit targets
+                parallel_superpose(sample_traj, reference_traj, bioemu_ind)
+
+                # Calculate quality metrics
+                log_bioemu_info("Calculating RMSD quality metrics...")
+                # Frames are already fitted onto the reference, so skip
+                # the second QCP alignment inside md.rmsd; indexing the
+                # selection avoids copying it out of every frame
+                rmsd_values = md.rmsd(
+                    sample_traj,
+                    reference_traj,
+                    0,
+                    atom_indices=bioemu_ind,
+                    ref_atom_indices=slice(None),
+                    superpose=False,
                 )
+                avg_rmsd, min_rmsd, max_rmsd = rmsd_summary(rmsd_values)
 
-                # Select corresponding atoms in BioEmu trajectory
-                try:
-                    bioemu_ind = sample_traj.topology.select("backbone or name CB")
-                    sample_traj_selected = sample_traj.atom_slice(bioemu_ind)
-
-                    log_bioemu_info(
-                        f"BioEmu atoms for superposition: {len(bioemu_ind)}"
-                    )
-
-                    # Check atom count compatibility
-                    if reference_traj.n_atoms != sample_traj_selected.n_atoms:
-                        return jsonify(
-                            {
-                                "status": "failed",
-                                "message": f"Cannot superpose: atom count mismatch (AlphaFold: {reference_traj.n_atoms}, BioEmu: {sample_traj_selected.n_atoms})",
-                            }
-                        ), 400
-
-                    log_bioemu_info("Performing structural superposition...")
-                    # Perform superposition
-                    sample_traj_selected.superpose(reference_traj)
-
-                    # Create superposed full trajectory by applying same transformation
-                    log_bioemu_info("Applying transformation to full trajectory...")
-                    sample_traj.superpose(reference_traj, atom_indices=bioemu_ind)
-
-                    log_bioemu_info("Saving superposed trajectory...")
-                    # Save superposed trajectory
-                    superposed_xtc_path = os.path.join(
-                        temp_dir, "superposed_trajectory.xtc"
-                    )
-                    sample_traj.save(superposed_xtc_path)
+                quality_metrics = {
+                    "avg_rmsd_to_alphafold": avg_rmsd,
+                    "max_rmsd_to_alphafold": max_rmsd,
+                    "min_rmsd_to_alphafold": min_rmsd,
+                    "rmsd_time_series": rmsd_values,  # Frame-by-frame RMSD values for plotting
+                    "n_frames_superposed": int(sample_traj.n_frames),
+                    "n_atoms_superposed": int(reference_traj.n_atoms),
+                    "superposition_atoms": "backbone + CB",
+                }
 
-                    # Read superposed trajectory back as binary data
-                    with open(superposed_xtc_path, "rb") as f:
-                        superposed_xtc_data = f.read()
+                elapsed = time.time() - start_time
+                log_bioemu_success(
+                    f"Superposition completed in {elapsed:.2f}s - RMSD: {avg_rmsd:.3f}Å"
+                )
 
-                    # Encode as base64
-                    superposed_xtc_b64 = base64.b64encode(superposed_xtc_data).decode(
-                        "utf-8"
-                    )
+                log_bioemu_info("Saving superposed trajectory...")
+                return _superposition_response(
+                    {
+                        "status": "success",
+                        "quality_metrics": quality_metrics,
+                        "method": "MDTraj backbone+CB superposition",
+                        "processing_time": round(elapsed, 2),
+                    },
+                    sample_traj,
+                    os.path.join(temp_dir, "superposed_trajectory.xtc"),
+                    stream,
+                )
 
-                    # Calculate quality metrics
-                    log_bioemu_info("Calculating RMSD quality metrics...")
-                    rmsd_values = md.rmsd(sample_traj_selected, reference_traj)
-                    avg_rmsd = float(rmsd_values.mean())
-                    max_rmsd = float(rmsd_values.max())
-                    min_rmsd = float(rmsd_values.min())
-
-                    quality_metrics = {
-                        "avg_rmsd_to_alphafold": avg_rmsd,
-                        "max_rmsd_to_alphafold": max_rmsd,
-                        "min_rmsd_to_alphafold": min_rmsd,
-                        "rmsd_time_series": rmsd_values.tolist(),  # Frame-by-frame RMSD values for plotting
-                        "n_frames_superposed": int(sample_traj.n_frames),
-                        "n_atoms_superposed": int(reference_traj.n_atoms),
-                        "superposition_atoms": "backbone + CB",
+            except Exception as e:
+                log_bioemu_error(f"Superposition error: {str(e)}")
+                return jsonify(
+                    {
+                        "status": "failed",
+                        "message": f"Superposition failed: {str(e)}",
                     }
-
-                    elapsed = time.time() - start_time
-                    log_bioemu_success(
-                        f"Superposition completed in {elapsed:.2f}s - RMSD: {avg_rmsd:.3f}Å"
-                    )
-
-                    return jsonify(
-                        {
-                            "status": "success",
-                            "superposed_trajectory": superposed_xtc_b64,
-                            "quality_metrics": quality_metrics,
-                            "method": "MDTraj backbone+CB superposition",
-                            "processing_time": round(elapsed, 2),
-                        }
-                    )
-
-                except Exception as e:
-                    log_bioemu_error(f"Superposition error: {str(e)}")
-                    return jsonify(
-                        {
-                            "status": "failed",
-                            "message": f"Superposition failed: {str(e)}",
-                        }
-                    ), 500
-
-        except ImportError:
-            log_bioemu_error("MDTraj not available for structural superposition")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": "MDTraj library not available. Please install mdtraj for structural superposition.",
-                }
-            ), 500
+                ), 500
 
     except Exception as e:
         log_bioemu_error(f"Superposition endpoint error: {str(e)}")
@@ -233,7 +288,7 @@ def superpose_structures():
 def enhanced_superpose_structures():
     """Enhanced superposition with custom PDB support for comprehensive RMSD analysis"""
     try:
-        data = request.json
+        data = request_payload()
         if (
             not data
             or "bioemu_pdb" not in data
@@ -250,218 +305,190 @@ def enhanced_superpose_structures():
         log_bioemu_info("=== ENHANCED STRUCTURAL SUPERPOSITION START ===")
         start_time = time.time()
 
-        # Decode input data
-        bioemu_pdb_data = base64.b64decode(data["bioemu_pdb"])
-        bioemu_xtc_data = base64.b64decode(data["bioemu_xtc"])
-        alphafold_pdb_data = base64.b64decode(data["alphafold_pdb"])
-
         # Check for custom PDB data
-        custom_pdb_data = None
-        if "custom_pdb" in data and data["custom_pdb"]:
-            custom_pdb_data = base64.b64decode(data["custom_pdb"])
+        has_custom_pdb = bool(data.get("custom_pdb"))
+        if has_custom_pdb:
             log_bioemu_info(
                 "Custom PDB structure detected - enabling multi-structure analysis"
             )
 
         # Check if sequence alignment is requested
         use_sequence_alignment = data.get("use_sequence_alignment", False)
+        # Clients that prefer NDJSON get the superposed XTC streamed in chunks
+        stream = request.accept_mimetypes.best == "application/x-ndjson"
 
-        log_bioemu_data(
-            "Enhanced superposition input",
-            {
-                "bioemu_pdb_size": len(bioemu_pdb_data),
-                "bioemu_xtc_size": len(bioemu_xtc_data),
-                "alphafold_pdb_size": len(alphafold_pdb_data),
-                "custom_pdb_size": len(custom_pdb_data) if custom_pdb_data else 0,
-                "use_sequence_alignment": use_sequence_alignment,
-            },
-        )
+        if md is None:
+            log_bioemu_error(
+                "MDTraj not available for enhanced structural superposition"
+            )
+            return jsonify(
+                {
+                    "status": "failed",
+                    "message": "MDTraj library not available. Please install mdtraj for structural superposition.",
+                }
+            ), 500
 
-        # Import MDTraj for superposition
-        try:
-            import mdtraj as md
-            import tempfile
-            import os
-            import numpy as np
-
-            # Create temporary files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Write all structures
-                alphafold_path = os.path.join(temp_dir, "alphafold_ref.pdb")
-                bioemu_pdb_path = os.path.join(temp_dir, "bioemu.pdb")
-                bioemu_xtc_path = os.path.join(temp_dir, "bioemu.xtc")
-
-                with open(alphafold_path, "wb") as f:
-                    f.write(alphafold_pdb_data)
-                with open(bioemu_pdb_path, "wb") as f:
-                    f.write(bioemu_pdb_data)
-                with open(bioemu_xtc_path, "wb") as f:
-                    f.write(bioemu_xtc_data)
-
-                custom_path = None
-                if custom_pdb_data:
-                    custom_path = os.path.join(temp_dir, "custom.pdb")
-                    with open(custom_path, "wb") as f:
-                        f.write(custom_pdb_data)
-
-                log_bioemu_info("Loading reference structures...")
-                # Load all structures
-                alphafold_ref = md.load(alphafold_path)
-                bioemu_traj = md.load(bioemu_xtc_path, top=bioemu_pdb_path)
-                custom_ref = None
-                if custom_path:
-                    custom_ref = md.load(custom_path)
-
-                # Select backbone + CB atoms for superposition
-                alphafold_backbone = alphafold_ref.topology.select(
-                    "backbone or name CB"
+        # Create temporary files
+        with tempfile.TemporaryDirectory(dir=SCRATCH_DIR) as temp_dir:
+            # Decode all structures straight into the scratch directory
+            alphafold_path = os.path.join(temp_dir, "alphafold_ref.pdb")
+            bioemu_pdb_path = os.path.join(temp_dir, "bioemu.pdb")
+            bioemu_xtc_path = os.path.join(temp_dir, "bioemu.xtc")
+
+            inputs = {"bioemu_pdb": bioemu_pdb_path, "bioemu_xtc": bioemu_xtc_path}
+            custom_path = None
+            if has_custom_pdb:
+                custom_path = inputs["custom_pdb"] = os.path.join(
+                    temp_dir, "custom.pdb"
                 )
-                bioemu_backbone = bioemu_traj.topology.select("backbone or name CB")
+            sizes = _decode_inputs(data, inputs)
 
-                # Perform main superposition (BioEmu to AlphaFold)
-                alphafold_ref_selected = alphafold_ref.atom_slice(alphafold_backbone)
-                bioemu_traj_selected = bioemu_traj.atom_slice(bioemu_backbone)
+            log_bioemu_data(
+                "Enhanced superposition input",
+                {
+                    "bioemu_pdb_size": sizes["bioemu_pdb"],
+                    "bioemu_xtc_size": sizes["bioemu_xtc"],
+                    "custom_pdb_size": sizes.get("custom_pdb", 0),
+                    "use_sequence_alignment": use_sequence_alignment,
+                },
+            )
 
-                # Check atom count compatibility for main superposition
-                if alphafold_ref_selected.n_atoms != bioemu_traj_selected.n_atoms:
-                    return jsonify(
-                        {
-                            "status": "failed",
-                            "message": f"Cannot superpose: atom count mismatch (AlphaFold: {alphafold_ref_selected.n_atoms}, BioEmu: {bioemu_traj_selected.n_atoms})",
-                        }
-                    ), 400
+            log_bioemu_info("Loading reference structures...")
+            # Load all structures (AlphaFold as its backbone + CB slice)
+            _, alphafold_ref_selected = load_backbone_reference(
+                data["alphafold_pdb"], alphafold_path
+            )
+            bioemu_traj = md.load(bioemu_xtc_path, top=bioemu_pdb_path)
+            custom_ref = None
+            if custom_path:
+                custom_ref = md.load(custom_path)
 
-                log_bioemu_info(
-                    "Performing main structural superposition (BioEmu to AlphaFold)..."
-                )
-                # Perform superposition
-                bioemu_traj_selected.superpose(alphafold_ref_selected)
-                bioemu_traj.superpose(
-                    alphafold_ref_selected, atom_indices=bioemu_backbone
-                )
+            # Select backbone + CB atoms for superposition
+            bioemu_backbone = backbone_cb_indices(bioemu_traj.topology)
 
-                # Calculate BioEmu vs AlphaFold RMSD
-                bioemu_alphafold_rmsd = md.rmsd(
-                    bioemu_traj_selected, alphafold_ref_selected
-                )
+            # Perform main superposition (BioEmu to AlphaFold)
 
-                # Prepare results object
-                quality_metrics = {
-                    "avg_rmsd_to_alphafold": float(bioemu_alphafold_rmsd.mean()),
-                    "max_rmsd_to_alphafold": float(bioemu_alphafold_rmsd.max()),
-                    "min_rmsd_to_alphafold": float(bioemu_alphafold_rmsd.min()),
-                    "rmsd_time_series": bioemu_alphafold_rmsd.tolist(),
-                    "n_frames_superposed": int(bioemu_traj.n_frames),
-                    "n_atoms_superposed": int(alphafold_ref_selected.n_atoms),
-                    "superposition_atoms": "backbone + CB",
-                }
+            # Check atom count compatibility for main superposition
+            if alphafold_ref_selected.n_atoms != len(bioemu_backbone):
+                return jsonify(
+                    {
+                        "status": "failed",
+                        "message": f"Cannot superpose: atom count mismatch (AlphaFold: {alphafold_ref_selected.n_atoms}, BioEmu: {len(bioemu_backbone)})",
+                    }
+                ), 400
 
-                custom_pdb_metrics = None
-                if custom_ref:
-                    log_bioemu_info("Calculating custom PDB comparisons...")
+            log_bioemu_info(
+                "Performing main structural superposition (BioEmu to AlphaFold)..."
+            )
+            # Fit the full trajectory once on its backbone+CB atoms; the
+            # RMSDs below index that selection instead of slicing it out
+            parallel_superpose(bioemu_traj, alphafold_ref_selected, bioemu_backbone)
+
+            # Calculate BioEmu vs AlphaFold RMSD (already aligned above)
+            bioemu_alphafold_rmsd = md.rmsd(
+                bioemu_traj,
+                alphafold_ref_selected,
+                0,
+                atom_indices=bioemu_backbone,
+                ref_atom_indices=slice(None),
+                superpose=False,
+            )
 
-                    try:
-                        # Custom PDB superposition and comparisons
-                        custom_backbone = custom_ref.topology.select(
-                            "backbone or name CB"
-                        )
-                        custom_ref_selected = custom_ref.atom_slice(custom_backbone)
-
-                        # BioEmu vs Custom PDB RMSD calculation
-                        # Need to align structures first for meaningful comparison
-                        if bioemu_traj_selected.n_atoms == custom_ref_selected.n_atoms:
-                            # Calculate RMSD between BioEmu trajectory and custom PDB
-                            bioemu_custom_rmsd = []
-                            for frame_idx in range(bioemu_traj_selected.n_frames):
-                                frame = bioemu_traj_selected[frame_idx]
-                                rmsd_val = md.rmsd(frame, custom_ref_selected)[0]
-                                bioemu_custom_rmsd.append(float(rmsd_val))
-
-                            # AlphaFold vs Custom PDB RMSD (static comparison)
-                            alphafold_custom_rmsd = md.rmsd(
-                                alphafold_ref_selected, custom_ref_selected
-                            )[0]
-
-                            custom_pdb_metrics = {
-                                "rmsd_time_series": bioemu_custom_rmsd,
-                                "avg_rmsd_bioemu_custom": float(
-                                    np.mean(bioemu_custom_rmsd)
-                                ),
-                                "min_rmsd_bioemu_custom": float(
-                                    np.min(bioemu_custom_rmsd)
-                                ),
-                                "max_rmsd_bioemu_custom": float(
-                                    np.max(bioemu_custom_rmsd)
-                                ),
-                                "alphafold_custom_rmsd": [float(alphafold_custom_rmsd)]
-                                * len(bioemu_custom_rmsd),  # Repeat for consistency
-                                "alphafold_custom_static_rmsd": float(
-                                    alphafold_custom_rmsd
-                                ),
-                                "custom_pdb_atoms": int(custom_ref_selected.n_atoms),
-                            }
-
-                            log_bioemu_success(
-                                f"Custom PDB analysis complete - BioEmu↔Custom avg: {np.mean(bioemu_custom_rmsd):.3f}Å, AlphaFold↔Custom: {alphafold_custom_rmsd:.3f}Å"
-                            )
-                        else:
-                            log_bioemu_error(
-                                f"Custom PDB atom count mismatch: {custom_ref_selected.n_atoms} vs {bioemu_traj_selected.n_atoms}"
-                            )
-                            custom_pdb_metrics = {
-                                "error": "Atom count mismatch with custom PDB",
-                                "custom_pdb_atoms": int(custom_ref_selected.n_atoms),
-                                "bioemu_atoms": int(bioemu_traj_selected.n_atoms),
-                            }
-
-                    except Exception as e:
-                        log_bioemu_error(f"Custom PDB analysis error: {str(e)}")
-                        custom_pdb_metrics = {
-                            "error": f"Custom PDB analysis failed: {str(e)}"
-                        }
+            # Prepare results object
+            avg_rmsd, min_rmsd, max_rmsd = rmsd_summary(bioemu_alphafold_rmsd)
+            quality_metrics = {
+                "avg_rmsd_to_alphafold": avg_rmsd,
+                "max_rmsd_to_alphafold": max_rmsd,
+                "min_rmsd_to_alphafold": min_rmsd,
+                "rmsd_time_series": bioemu_alphafold_rmsd,
+                "n_frames_superposed": int(bioemu_traj.n_frames),
+                "n_atoms_superposed": int(alphafold_ref_selected.n_atoms),
+                "superposition_atoms": "backbone + CB",
+            }
 
-                # Save superposed trajectory
-                log_bioemu_info("Saving enhanced superposed trajectory...")
-                superposed_xtc_path = os.path.join(
-                    temp_dir, "enhanced_superposed_trajectory.xtc"
-                )
-                bioemu_traj.save(superposed_xtc_path)
+            custom_pdb_metrics = None
+            if custom_ref:
+                log_bioemu_info("Calculating custom PDB comparisons...")
 
-                # Read superposed trajectory back as binary data
-                with open(superposed_xtc_path, "rb") as f:
-                    superposed_xtc_data = f.read()
+                try:
+                    # Custom PDB superposition and comparisons
+                    custom_backbone = backbone_cb_indices(custom_ref.topology)
+                    custom_ref_selected = custom_ref.atom_slice(custom_backbone)
+
+                    # BioEmu vs Custom PDB RMSD calculation
+                    # Need to align structures first for meaningful comparison
+                    if len(bioemu_backbone) == custom_ref_selected.n_atoms:
+                        # Calculate RMSD between BioEmu trajectory and custom PDB.
+                        # One call centers the reference once for all frames;
+                        # precentered=True would need bioemu_traj centered in
+                        # place, moving the returned trajectory off AlphaFold
+                        bioemu_custom_rmsd = md.rmsd(
+                            bioemu_traj,
+                            custom_ref_selected,
+                            0,
+                            atom_indices=bioemu_backbone,
+                            ref_atom_indices=slice(None),
+                        )
+                        avg_bioemu_custom, min_bioemu_custom, max_bioemu_custom = (
+                            rmsd_summary(bioemu_custom_rmsd)
+                        )
 
-                # Encode as base64
-                superposed_xtc_b64 = base64.b64encode(superposed_xtc_data).decode(
-                    "utf-8"
-                )
+                        # AlphaFold vs Custom PDB RMSD (static comparison)
+                        alphafold_custom_rmsd = md.rmsd(
+                            alphafold_ref_selected, custom_ref_selected
+                        )[0]
 
-                elapsed = time.time() - start_time
-                log_bioemu_success(
-                    f"Enhanced superposition completed in {elapsed:.2f}s"
-                )
+                        custom_pdb_metrics = {
+                            "rmsd_time_series": bioemu_custom_rmsd,
+                            "avg_rmsd_bioemu_custom": avg_bioemu_custom,
+                            "min_rmsd_bioemu_custom": min_bioemu_custom,
+                            "max_rmsd_bioemu_custom": max_bioemu_custom,
+                            # A single value; plot it as a constant line
+                            # against rmsd_time_series
+                            "alphafold_custom_static_rmsd": float(
+                                alphafold_custom_rmsd
+                            ),
+                            "custom_pdb_atoms": int(custom_ref_selected.n_atoms),
+                        }
 
-                return jsonify(
-                    {
-                        "status": "success",
-                        "superposed_trajectory": superposed_xtc_b64,
-                        "quality_metrics": quality_metrics,
-                        "custom_pdb_metrics": custom_pdb_metrics,
-                        "method": "Enhanced MDTraj multi-structure superposition",
-                        "processing_time": round(elapsed, 2),
+                        log_bioemu_success(
+                            f"Custom PDB analysis complete - BioEmu↔Custom avg: {avg_bioemu_custom:.3f}Å, AlphaFold↔Custom: {alphafold_custom_rmsd:.3f}Å"
+                        )
+                    else:
+                        log_bioemu_error(
+                            f"Custom PDB atom count mismatch: {custom_ref_selected.n_atoms} vs {len(bioemu_backbone)}"
+                        )
+                        custom_pdb_metrics = {
+                            "error": "Atom count mismatch with custom PDB",
+                            "custom_pdb_atoms": int(custom_ref_selected.n_atoms),
+                            "bioemu_atoms": len(bioemu_backbone),
+                        }
+
+                except Exception as e:
+                    log_bioemu_error(f"Custom PDB analysis error: {str(e)}")
+                    custom_pdb_metrics = {
+                        "error": f"Custom PDB analysis failed: {str(e)}"
                     }
-                )
 
-        except ImportError:
-            log_bioemu_error(
-                "MDTraj not available for enhanced structural superposition"
+            elapsed = time.time() - start_time
+            log_bioemu_success(
+                f"Enhanced superposition completed in {elapsed:.2f}s"
             )
-            return jsonify(
+
+            # Save superposed trajectory and send it with the metrics
+            log_bioemu_info("Saving enhanced superposed trajectory...")
+            return _superposition_response(
                 {
-                    "status": "failed",
-                    "message": "MDTraj library not available. Please install mdtraj for structural superposition.",
-                }
-            ), 500
+                    "status": "success",
+                    "quality_metrics": quality_metrics,
+                    "custom_pdb_metrics": custom_pdb_metrics,
+                    "method": "Enhanced MDTraj multi-structure superposition",
+                    "processing_time": round(elapsed, 2),
+                },
+                bioemu_traj,
+                os.path.join(temp_dir, "enhanced_superposed_trajectory.xtc"),
+                stream,
+            )
 
     except Exception as e:
         log_bioemu_error(f"Enhanced superposition endpoint error: {str(e)}")
@@ -7,11 +7,12 @@ Routes:
     POST /api/energy-landscape - Energy landscape analysis using PCA
 """
 
-import base64
 import logging
 import time
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify
 
+from base64_utils import b64decode
+from json_utils import request_payload
 from logging_utils import (
     log_bioemu_info,
     log_bioemu_error,
@@ -21,6 +22,23 @@ from logging_utils import (
     print_separator,
 )
 
+# Optional: the MDTraj analysis modules are imported once at startup rather
+# than on the first request each worker serves
+try:
+    from trajectory_analysis import analyze_trajectory
+except ImportError as e:
+    analyze_trajectory = None
+    _trajectory_import_error = str(e)
+
+try:
+    from energy_landscape_analysis import (
+        compute_energy_landscape,
+        compute_free_energy_surface,
+    )
+except ImportError as e:
+    compute_energy_landscape = compute_free_energy_surface = None
+    _landscape_import_error = str(e)
+
 logger = logging.getLogger(__name__)
 
 trajectory_bp = Blueprint("trajectory", __name__)
@@ -30,7 +48,7 @@ trajectory_bp = Blueprint("trajectory", __name__)
 def analyze_trajectory_endpoint():
     """Trajectory analysis using MDTraj - NO FALLBACKS"""
     try:
-        data = request.json
+        data = request_payload()
         if not data or "pdb" not in data or "xtc" not in data:
             return jsonify(
                 {"status": "failed", "message": "Missing PDB or XTC data"}
@@ -39,18 +57,25 @@ def analyze_trajectory_endpoint():
         logger.info("Starting trajectory analysis...")
 
         try:
-            pdb_data = base64.b64decode(data["pdb"])
-            xtc_data = base64.b64decode(data["xtc"])
+            pdb_data = b64decode(data["pdb"])
+            xtc_data = b64decode(data["xtc"])
         except Exception as e:
             logger.error(f"Failed to decode trajectory data: {str(e)}")
             return jsonify(
                 {"status": "failed", "message": f"Invalid base64 data: {str(e)}"}
             ), 400
 
+        if analyze_trajectory is None:
+            logger.error(f"MDTraj dependencies not available: {_trajectory_import_error}")
+            return jsonify(
+                {
+                    "status": "failed",
+                    "message": f"MDTraj not properly installed: {_trajectory_import_error}. Please install the required dependencies.",
+                }
+            ), 500
+
         # Trajectory analysis ONLY - NO FALLBACKS
         try:
-            from trajectory_analysis import analyze_trajectory
-
             analysis_result = analyze_trajectory(pdb_data, xtc_data)
 
             logger.info("Trajectory analysis completed successfully")
@@ -62,14 +87,6 @@ def analyze_trajectory_endpoint():
                 }
             )
 
-        except ImportError as e:
-            logger.error(f"MDTraj dependencies not available: {str(e)}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"MDTraj not properly installed: {str(e)}. Please install the required dependencies.",
-                }
-            ), 500
         except Exception as e:
             logger.error(f"Trajectory analysis failed: {str(e)}")
             return jsonify(
@@ -87,7 +104,7 @@ def analyze_trajectory_endpoint():
 def energy_landscape_endpoint():
     """Energy landscape analysis using PCA on CA-CA contacts"""
     try:
-        data = request.json
+        data = request_payload()
         if not data or "pdb" not in data or "xtc" not in data:
             return jsonify(
                 {"status": "failed", "message": "Missing PDB or XTC data"}
@@ -97,44 +114,41 @@ def energy_landscape_endpoint():
         start_time = time.time()
 
         # Decode the same BioEmu data used for visualization
-        pdb_data = base64.b64decode(data["pdb"])
-        xtc_data = base64.b64decode(data["xtc"])
+        pdb_data = b64decode(data["pdb"])
+        xtc_data = b64decode(data["xtc"])
 
         log_bioemu_data(
             "Energy landscape input",
             {"pdb_size": len(pdb_data), "xtc_size": len(xtc_data)},
         )
 
-        # Import and compute energy landscape using MDTraj
-        try:
-            from energy_landscape_analysis import (
-                compute_energy_landscape,
-                compute_free_energy_surface,
+        if compute_energy_landscape is None:
+            log_bioemu_error(
+                f"Failed to import energy landscape module: {_landscape_import_error}"
             )
-
-            landscape_results = compute_energy_landscape(pdb_data, xtc_data)
-
-            # Optionally compute free energy surface
-            include_surface = data.get("include_surface", True)
-            if (
-                include_surface
-                and "pc1_coords" in landscape_results
-                and "pc2_coords" in landscape_results
-            ):
-                surface_data = compute_free_energy_surface(
-                    landscape_results["pc1_coords"], landscape_results["pc2_coords"]
-                )
-                if surface_data:
-                    landscape_results["free_energy_surface"] = surface_data
-        except ImportError as e:
-            log_bioemu_error(f"Failed to import energy landscape module: {str(e)}")
             return jsonify(
                 {
                     "status": "failed",
-                    "message": f"Energy landscape module not available: {str(e)}",
+                    "message": f"Energy landscape module not available: {_landscape_import_error}",
                 }
             ), 500
 
+        # Compute energy landscape using MDTraj
+        landscape_results = compute_energy_landscape(pdb_data, xtc_data)
+
+        # Optionally compute free energy surface
+        include_surface = data.get("include_surface", True)
+        if (
+            include_surface
+            and "pc1_coords" in landscape_results
+            and "pc2_coords" in landscape_results
+        ):
+            surface_data = compute_free_energy_surface(
+                landscape_results["pc1_coords"], landscape_results["pc2_coords"]
+            )
+            if surface_data:
+                landscape_results["free_energy_surface"] = surface_data
+
         end_time = time.time()
         log_bioemu_timing("Energy Landscape Analysis", start_time, end_time)
         log_bioemu_success("Energy landscape analysis completed successfully")
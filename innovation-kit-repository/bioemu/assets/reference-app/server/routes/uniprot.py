@@ -13,44 +13,29 @@ from logging_utils import (
     log_bioemu_error,
     log_bioemu_success,
 )
-from uniprot_service import (
-    validate_uniprot_id,
-    get_protein_info_from_uniprot,
-    download_afdb_structure,
-)
+from uniprot_service import get_uniprot_summary
 
 
 uniprot_bp = Blueprint("uniprot", __name__)
 
 
-@uniprot_bp.route("/api/uniprot-info/<uniprot_id>", methods=["GET"])
+@uniprot_bp.route("/api/uniprot-info/<uniprot_id:uniprot_id>", methods=["GET"])
 def get_uniprot_info_endpoint(uniprot_id):
     """Get protein information from UniProt without running prediction"""
     log_bioemu_info(f"=== UNIPROT INFO REQUEST: {uniprot_id} ===")
 
     try:
-        # Validate UniProt ID
-        if not validate_uniprot_id(uniprot_id):
-            log_bioemu_error(f"Invalid UniProt ID format: {uniprot_id}")
-            return jsonify(
-                {
-                    "status": "failed",
-                    "message": f"Invalid UniProt ID format: {uniprot_id}",
-                }
-            ), 400
-
-        # Get protein information
-        protein_info = get_protein_info_from_uniprot(uniprot_id)
-        if not protein_info:
+        # Get protein information and check whether an AlphaFold structure
+        # is available (memoized; both upstream calls in flight on a miss)
+        log_bioemu_info("Fetching UniProt info and checking AlphaFold availability...")
+        summary = get_uniprot_summary(uniprot_id)
+        if summary is None:
             log_bioemu_error(f"UniProt ID not found: {uniprot_id}")
             return jsonify(
                 {"status": "failed", "message": f"UniProt ID not found: {uniprot_id}"}
             ), 404
 
-        # Check if AlphaFold structure is available (quick check)
-        log_bioemu_info("Checking AlphaFold availability...")
-        alphafold_structure = download_afdb_structure(uniprot_id)
-        alphafold_available = alphafold_structure is not None
+        protein_info, alphafold_available = summary
 
         response_data = {
             "status": "success",
@@ -2,87 +2,253 @@
 Superposition utilities for aligning BioEmu trajectories with reference structures.
 """
 
-import base64
+import hashlib
+import mmap
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
+from base64_utils import b64decode_to_file, b64encode
 from logging_utils import log_bioemu_info, log_bioemu_success
 
+# Optional: imported once at startup; the superposition routes refuse
+# requests when MDTraj is missing
+try:
+    import mdtraj as md
+    from mdtraj.formats import XTCTrajectoryFile
+except ImportError:
+    md = XTCTrajectoryFile = None
+
+# Optional: parasail's SIMD Needleman-Wunsch replaces Biopython's pure-Python
+# pairwise2 for the sequence alignment when it is installed
+try:
+    import parasail
+except ImportError:
+    parasail = None
+
+# Identity scoring (match 1, mismatch 0) over one-letter residue codes;
+# residues without a one-letter code are aligned as X
+_IDENTITY_MATRIX = (
+    parasail.matrix_create("ACDEFGHIKLMNPQRSTVWYX", 1, 0) if parasail else None
+)
+
+# Fewest frames per parallel superpose chunk; below this a single
+# superpose call beats the thread overhead
+PARALLEL_SUPERPOSE_MIN_FRAMES = 200
+
+# Shared by all requests, so concurrent superpositions together never run
+# more fitting threads than there are CPUs
+_SUPERPOSE_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="vkit-superpose"
+)
+
+# LRU cache of parsed reference structures (backbone+CB slice) keyed by a
+# hash of the base64 payload; the same AlphaFold model is resubmitted often
+REFERENCE_CACHE_SIZE = 32
+_reference_cache = OrderedDict()
+_reference_cache_lock = threading.Lock()
+
+
+def map_xtc(traj, path):
+    """
+    Save a trajectory as XTC at path and return a read-only mapping of the file.
+
+    The frames go to XTCTrajectoryFile in a single bulk write. The mapping
+    stays valid after the file (or its temp directory) is deleted, so it can
+    outlive the request's scratch directory while a response streams it.
+    """
+    with XTCTrajectoryFile(path, "w", force_overwrite=True) as f:
+        f.write(traj.xyz, time=traj.time, box=traj.unitcell_vectors)
+
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def encode_xtc_base64(traj, path):
+    """
+    Save a trajectory as XTC at path and return the file base64-encoded.
+
+    The result is encoded straight from a read-only mapping of the file
+    rather than from a bytes copy read back into memory.
+    """
+    with map_xtc(traj, path) as mapped:
+        return b64encode(mapped)
+
+
+def backbone_cb_indices(topology):
+    """
+    Indices of backbone + CB atoms in a topology.
+
+    Matches topology.select("backbone or name CB") with one pass over the
+    atoms instead of parsing and evaluating the selection DSL.
+    """
+    return np.fromiter(
+        (
+            atom.index
+            for atom in topology.atoms
+            if atom.name == "CB" or atom.is_backbone
+        ),
+        dtype=np.int64,
+    )
+
+
+def load_backbone_reference(pdb_b64, path):
+    """
+    Return (n_atoms, backbone_slice) for a base64-encoded reference PDB.
+
+    backbone_slice holds the reference's backbone + CB atoms. On a cache miss
+    the PDB is decoded to path and parsed with MDTraj; on a hit nothing is
+    written or parsed. The cached slice is shared, so treat it as read-only.
+    """
+    key = hashlib.blake2b(pdb_b64.encode(), digest_size=16).digest()
+    with _reference_cache_lock:
+        if key in _reference_cache:
+            _reference_cache.move_to_end(key)
+            log_bioemu_info("Using cached reference structure")
+            return _reference_cache[key]
+
+    # MDTraj's PDB reader opens paths, not file objects; callers pass a path
+    # under the RAM-backed SCRATCH_DIR, so this round-trip never hits disk
+    b64decode_to_file(pdb_b64, path)
+    ref = md.load(path)
+    entry = (ref.n_atoms, ref.atom_slice(backbone_cb_indices(ref.topology)))
+    with _reference_cache_lock:
+        _reference_cache[key] = entry
+        if len(_reference_cache) > REFERENCE_CACHE_SIZE:
+            _reference_cache.popitem(last=False)
+    return entry
+
+
+def rmsd_summary(rmsd_values):
+    """
+    Return (avg, min, max) of a per-frame RMSD array as Python floats.
+
+    Callers put the array itself in the response as the time series; the
+    JSON provider serializes it natively instead of via a .tolist() copy.
+    """
+    return (
+        float(rmsd_values.mean()),
+        float(rmsd_values.min()),
+        float(rmsd_values.max()),
+    )
+
+
+def parallel_superpose(traj, reference, atom_indices, n_workers=None):
+    """
+    Superpose traj onto all atoms of reference in place, fitting on atom_indices.
+
+    Long trajectories are split into contiguous chunks of at least
+    PARALLEL_SUPERPOSE_MIN_FRAMES frames that are fitted on the shared pool
+    (MDTraj's QCP kernel releases the GIL) and written back into traj.xyz;
+    short ones take the plain single-call path.
+    """
+    n_workers = min(
+        n_workers or os.cpu_count() or 1,
+        traj.n_frames // PARALLEL_SUPERPOSE_MIN_FRAMES,
+    )
+    if n_workers <= 1:
+        return traj.superpose(
+            reference, atom_indices=atom_indices, ref_atom_indices=slice(None)
+        )
+
+    bounds = [
+        (traj.n_frames * i // n_workers, traj.n_frames * (i + 1) // n_workers)
+        for i in range(n_workers)
+    ]
+
+    def _fit(start, stop):
+        chunk = traj[start:stop]
+        chunk.superpose(
+            reference, atom_indices=atom_indices, ref_atom_indices=slice(None)
+        )
+        traj.xyz[start:stop] = chunk.xyz
+
+    for future in [_SUPERPOSE_POOL.submit(_fit, *b) for b in bounds]:
+        future.result()
+    return traj
+
+
+def residue_sequence(topology):
+    """One-letter sequence of a topology, one character per residue (X if unknown)"""
+    return "".join(res.code or "X" for res in topology.residues)
+
+
+def align_sequences(seq_a, seq_b):
+    """
+    Globally align two one-letter sequences by residue identity.
+
+    Returns (aligned_a, aligned_b, score) with "-" marking gaps, or None when
+    no alignment is found. Uses parasail's striped SIMD aligner (gap open and
+    extend cost 1) when available, else Biopython's globalxx.
+    """
+    if parasail is not None:
+        result = parasail.nw_trace_striped_16(seq_a, seq_b, 1, 1, _IDENTITY_MATRIX)
+        return result.traceback.query, result.traceback.ref, result.score
+
+    from Bio import pairwise2
+
+    alignments = pairwise2.align.globalxx(seq_a, seq_b, one_alignment_only=True)
+    if not alignments:
+        return None
+    return tuple(alignments[0][:3])
+
+
+def aligned_residue_indices(aligned_a, aligned_b):
+    """
+    Residue indices of the columns where neither aligned sequence has a gap.
+
+    Returns two equal-length int arrays indexing residues of the ungapped
+    sequences. Computed with NumPy masks and running counts of non-gap
+    characters instead of a per-character loop.
+    """
+    gap = ord("-")
+    a_res = np.frombuffer(aligned_a.encode("ascii"), dtype=np.uint8) != gap
+    b_res = np.frombuffer(aligned_b.encode("ascii"), dtype=np.uint8) != gap
+    both = a_res & b_res
+    return (np.cumsum(a_res) - 1)[both], (np.cumsum(b_res) - 1)[both]
+
 
 def perform_sequence_alignment_superposition(
-    bioemu_pdb_data, bioemu_xtc_data, alphafold_pdb_data, temp_dir
+    bioemu_pdb_path, bioemu_xtc_path, alphafold_path
 ):
     """
-    Perform sequence-aligned superposition using BioPython for sequence alignment and MDTraj for superposition.
+    Perform sequence-aligned superposition using parasail (or BioPython) for sequence alignment and MDTraj for superposition.
     Falls back to simple superposition if sequence alignment fails.
+    Inputs are read from the given PDB/XTC paths; the superposed trajectory is returned unsaved.
 
     Returns: (success, result_data, error_message)
     """
     try:
-        # Import BioPython for sequence alignment
-        from Bio import pairwise2
-        import mdtraj as md
-
         log_bioemu_info("Starting sequence-aligned superposition...")
 
-        # Write files to temp directory
-        alphafold_path = os.path.join(temp_dir, "alphafold_ref.pdb")
-        bioemu_pdb_path = os.path.join(temp_dir, "bioemu.pdb")
-        bioemu_xtc_path = os.path.join(temp_dir, "bioemu.xtc")
-
-        with open(alphafold_path, "wb") as f:
-            f.write(alphafold_pdb_data)
-        with open(bioemu_pdb_path, "wb") as f:
-            f.write(bioemu_pdb_data)
-        with open(bioemu_xtc_path, "wb") as f:
-            f.write(bioemu_xtc_data)
-
         # Load structures
         alphafold_traj = md.load(alphafold_path)
         bioemu_traj = md.load(bioemu_xtc_path, top=bioemu_pdb_path)
 
-        # Extract sequences from both structures
-        alphafold_sequence = "".join(
-            [res.name for res in alphafold_traj.topology.residues]
-        )
-        bioemu_sequence = "".join([res.name for res in bioemu_traj.topology.residues])
+        # Extract one-letter sequences so each character is one residue
+        alphafold_sequence = residue_sequence(alphafold_traj.topology)
+        bioemu_sequence = residue_sequence(bioemu_traj.topology)
 
         log_bioemu_info(f"AlphaFold sequence length: {len(alphafold_sequence)}")
         log_bioemu_info(f"BioEmu sequence length: {len(bioemu_sequence)}")
 
         # Perform sequence alignment
-        alignments = pairwise2.align.globalxx(alphafold_sequence, bioemu_sequence)
-        if not alignments:
+        alignment = align_sequences(alphafold_sequence, bioemu_sequence)
+        if not alignment:
             return False, None, "No sequence alignment found"
 
-        best_alignment = alignments[0]
-        alignment_score = best_alignment[2]
-        aligned_af_seq = best_alignment[0]
-        aligned_bioemu_seq = best_alignment[1]
+        aligned_af_seq, aligned_bioemu_seq, alignment_score = alignment
 
         log_bioemu_info(f"Sequence alignment score: {alignment_score}")
         log_bioemu_info(f"Alignment length: {len(aligned_af_seq)}")
 
         # Build mapping of aligned residues (skip gaps)
-        af_residue_indices = []
-        bioemu_residue_indices = []
-
-        af_res_idx = 0
-        bioemu_res_idx = 0
-
-        for i in range(len(aligned_af_seq)):
-            af_char = aligned_af_seq[i]
-            bioemu_char = aligned_bioemu_seq[i]
-
-            # If both positions have residues (not gaps), include in alignment
-            if af_char != "-" and bioemu_char != "-":
-                af_residue_indices.append(af_res_idx)
-                bioemu_residue_indices.append(bioemu_res_idx)
-
-            # Advance position counters if not gap
-            if af_char != "-":
-                af_res_idx += 1
-            if bioemu_char != "-":
-                bioemu_res_idx += 1
+        af_residue_indices, bioemu_residue_indices = aligned_residue_indices(
+            aligned_af_seq, aligned_bioemu_seq
+        )
 
         log_bioemu_info(f"Aligned residues: {len(af_residue_indices)} pairs")
 
@@ -120,38 +286,30 @@ def perform_sequence_alignment_superposition(
         if len(af_aligned_atoms) == 0:
             return False, None, "No aligned atoms found for superposition"
 
-        # Perform superposition using aligned atoms
+        # Perform superposition using aligned atoms: one QCP pass on the
+        # full trajectory (chunked across threads when long)
         reference_traj = alphafold_traj.atom_slice(af_aligned_atoms)
-        sample_traj_selected = bioemu_traj.atom_slice(bioemu_aligned_atoms)
-
-        sample_traj_selected.superpose(reference_traj)
-        bioemu_traj.superpose(reference_traj, atom_indices=bioemu_aligned_atoms)
-
-        # Save superposed trajectory
-        superposed_xtc_path = os.path.join(
-            temp_dir, "superposed_trajectory_aligned.xtc"
+        parallel_superpose(bioemu_traj, reference_traj, bioemu_aligned_atoms)
+
+        # Calculate RMSD of the aligned atoms without re-fitting or slicing them
+        rmsd_values = md.rmsd(
+            bioemu_traj,
+            reference_traj,
+            0,
+            atom_indices=bioemu_aligned_atoms,
+            ref_atom_indices=slice(None),
+            superpose=False,
         )
-        bioemu_traj.save(superposed_xtc_path)
-
-        # Read back and encode
-        with open(superposed_xtc_path, "rb") as f:
-            superposed_xtc_data = f.read()
-
-        superposed_xtc_b64 = base64.b64encode(superposed_xtc_data).decode("utf-8")
-
-        # Calculate RMSD
-        rmsd_values = md.rmsd(sample_traj_selected, reference_traj)
-        avg_rmsd = float(rmsd_values.mean())
-        max_rmsd = float(rmsd_values.max())
-        min_rmsd = float(rmsd_values.min())
+        avg_rmsd, min_rmsd, max_rmsd = rmsd_summary(rmsd_values)
 
         result_data = {
-            "superposed_trajectory": superposed_xtc_b64,
+            # Superposed md.Trajectory; the caller saves and encodes it
+            "superposed_trajectory": bioemu_traj,
             "quality_metrics": {
                 "avg_rmsd_to_alphafold": avg_rmsd,
                 "max_rmsd_to_alphafold": max_rmsd,
                 "min_rmsd_to_alphafold": min_rmsd,
-                "rmsd_time_series": rmsd_values.tolist(),
+                "rmsd_time_series": rmsd_values,
                 "n_frames_superposed": int(bioemu_traj.n_frames),
                 "n_atoms_superposed": len(af_aligned_atoms),
                 "superposition_atoms": f"sequence-aligned backbone ({len(af_residue_indices)} residue pairs)",
@@ -160,7 +318,11 @@ def perform_sequence_alignment_superposition(
                 "sequence_identity": len(af_residue_indices)
                 / max(len(alphafold_sequence), len(bioemu_sequence)),
             },
-            "method": "Sequence-aligned superposition (BioPython + MDTraj)",
+            "method": (
+                "Sequence-aligned superposition (parasail + MDTraj)"
+                if parasail
+                else "Sequence-aligned superposition (BioPython + MDTraj)"
+            ),
         }
 
         log_bioemu_success(
@@ -0,0 +1,38 @@
+import base64
+import binascii
+import os
+
+import pytest
+
+from base64_utils import b64decode_to_file
+
+
+def test_decode_to_file_unwrapped(tmp_path):
+    raw = os.urandom(10_000)
+    path = tmp_path / "out.bin"
+
+    written = b64decode_to_file(base64.b64encode(raw).decode(), path, chunk_size=300)
+
+    assert written == len(raw)
+    assert path.read_bytes() == raw
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_decode_to_file_wrapped_across_windows(tmp_path, as_bytes):
+    raw = os.urandom(10_000)
+    wrapped = base64.encodebytes(raw)  # 76-column lines
+    data = wrapped if as_bytes else wrapped.decode()
+    path = tmp_path / "out.bin"
+
+    # Many windows, none of them aligned with the line breaks
+    written = b64decode_to_file(data, path, chunk_size=301)
+
+    assert written == len(raw)
+    assert path.read_bytes() == raw
+
+
+def test_decode_to_file_rejects_truncated_input(tmp_path):
+    data = base64.b64encode(os.urandom(1000)).decode()[:-1]
+
+    with pytest.raises(binascii.Error):
+        b64decode_to_file(data, tmp_path / "out.bin", chunk_size=300)
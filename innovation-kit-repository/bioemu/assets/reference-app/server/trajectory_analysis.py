@@ -19,8 +19,14 @@ import tempfile
 import os
 import logging
 
+from config import SCRATCH_DIR
+
 logger = logging.getLogger(__name__)
 
+# Residue pairs per block of the Cα distance computation; bounds the
+# (frames, residues, residues, 3) difference array to ~48 MB of float32
+DISTANCE_BLOCK_PAIRS = 1 << 22
+
 
 def analyze_trajectory(pdb_data, xtc_data):
     """
@@ -45,12 +51,12 @@ def analyze_trajectory(pdb_data, xtc_data):
         logger.info(f"PDB data size: {len(pdb_data)} bytes")
         logger.info(f"XTC data size: {len(xtc_data)} bytes")
         
-        with tempfile.NamedTemporaryFile(suffix='.pdb',
+        with tempfile.NamedTemporaryFile(suffix='.pdb', dir=SCRATCH_DIR,
                                          delete=False) as pdb_file:
             pdb_file.write(pdb_data)
             pdb_path = pdb_file.name
         
-        with tempfile.NamedTemporaryFile(suffix='.xtc',
+        with tempfile.NamedTemporaryFile(suffix='.xtc', dir=SCRATCH_DIR,
                                          delete=False) as xtc_file:
             xtc_file.write(xtc_data)
             xtc_path = xtc_file.name
@@ -100,19 +106,21 @@ def analyze_trajectory(pdb_data, xtc_data):
             raise ValueError("No Cα atoms found for contact map calculation.")
         
         # Calculate pairwise distances between all Cα atoms for each frame
-        ca_coords = traj.xyz[:, ca_indices, :]  # Shape: (n_frames, n_residues, 3)
+        # MDTraj coordinates are float32; keep the whole chain in float32
+        ca_coords = np.ascontiguousarray(traj.xyz[:, ca_indices, :], dtype=np.float32)  # Shape: (n_frames, n_residues, 3)
         n_frames, n_residues, _ = ca_coords.shape
         
         # Initialize distance matrix array
-        distance_matrices = np.zeros((n_frames, n_residues, n_residues))
+        distance_matrices = np.empty((n_frames, n_residues, n_residues), dtype=np.float32)
         
-        # Compute pairwise distances for each frame
-        for frame_idx in range(n_frames):
-            coords = ca_coords[frame_idx]  # Shape: (n_residues, 3)
-            # Calculate all pairwise distances using broadcasting
-            diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]  # Shape: (n_residues, n_residues, 3)
-            distances = np.sqrt(np.sum(diff**2, axis=2))  # Shape: (n_residues, n_residues)
-            distance_matrices[frame_idx] = distances
+        # Compute pairwise distances for whole blocks of frames at once;
+        # einsum fuses the square and sum over xyz into a single pass
+        block = max(1, DISTANCE_BLOCK_PAIRS // (n_residues * n_residues))
+        for start in range(0, n_frames, block):
+            coords = ca_coords[start:start + block]  # Shape: (block, n_residues, 3)
+            diff = coords[:, :, np.newaxis, :] - coords[:, np.newaxis, :, :]  # Shape: (block, n_residues, n_residues, 3)
+            np.sqrt(np.einsum('frsd,frsd->frs', diff, diff),
+                    out=distance_matrices[start:start + block])
         
         # Calculate ensemble-averaged distance matrix
         mean_distance_matrix = np.mean(distance_matrices, axis=0)
@@ -371,9 +379,9 @@ def analyze_trajectory(pdb_data, xtc_data):
                                   else contacts[:1000].tolist()),
             'contact_pairs': (pairs.tolist() if len(pairs) < 1000
                               else pairs[:1000].tolist()),
-            'ca_distance_matrix': mean_distance_matrix.tolist(),  # Ensemble-averaged Cα-Cα distances
-            'ca_distance_matrices_per_frame': (distance_matrices.tolist() if distance_matrices.shape[0] < 200
-                                              else distance_matrices[:200].tolist()),  # Per-frame distance matrices for dynamic contact maps
+            # float32 arrays, serialized natively by the JSON provider
+            'ca_distance_matrix': mean_distance_matrix,  # Ensemble-averaged Cα-Cα distances
+            'ca_distance_matrices_per_frame': distance_matrices[:200],  # Per-frame distance matrices (first 200) for dynamic contact maps
             'ensemble_stats': ensemble_stats,
             'flexibility_stats': flexibility_stats,
             'contact_stats': contact_stats,
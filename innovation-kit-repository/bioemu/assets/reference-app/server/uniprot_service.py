@@ -6,14 +6,35 @@ Provides functionality to:
 3. Validate UniProt IDs
 """
 
-import requests
 import logging
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 import re
+import threading
 import time
 
+import httpx
+
+from async_utils import gather_async, http_client, run_async
+from cache_utils import cache_uniprot, uniprot_cache
+from config import (
+    AFDB_MISS_CACHE_SECONDS,
+    UNIPROT_CACHE_SECONDS,
+    UNIPROT_SUMMARY_CACHE_SECONDS,
+    UNIPROT_SUMMARY_CACHE_SIZE,
+)
+
 logger = logging.getLogger(__name__)
 
+# UniProt accession format (see validate_uniprot_id); surrounding whitespace
+# and lower case are accepted by the pattern instead of stripping/upper-casing
+_UNIPROT_ID_RE = re.compile(r'\s*[A-Za-z0-9]{4,10}\s*')
+
+# UniProt ID -> (expires_at, (protein_info, alphafold_available)), least
+# recently used first (see get_uniprot_summary)
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
 
 def validate_uniprot_id(uniprot_id: str) -> bool:
     """
@@ -24,12 +45,8 @@ def validate_uniprot_id(uniprot_id: str) -> bool:
     if not uniprot_id:
         return False
     
-    # Remove any whitespace
-    uniprot_id = uniprot_id.strip().upper()
-    
     # Basic format validation - updated to allow 4+ characters
-    pattern = r'^[A-Z0-9]{4,10}$'
-    return bool(re.match(pattern, uniprot_id))
+    return _UNIPROT_ID_RE.fullmatch(uniprot_id) is not None
 
 
 def get_protein_sequence_from_uniprot(uniprot_id: str) -> Optional[str]:
@@ -42,10 +59,21 @@ def get_protein_sequence_from_uniprot(uniprot_id: str) -> Optional[str]:
     Returns:
         Protein sequence as string, or None if not found/error
     """
+    return run_async(get_protein_sequence_from_uniprot_async(uniprot_id))
+
+
+async def get_protein_sequence_from_uniprot_async(uniprot_id: str) -> Optional[str]:
+    """Coroutine version of get_protein_sequence_from_uniprot (runs on the shared event loop)"""
     if not validate_uniprot_id(uniprot_id):
         logger.error(f"Invalid UniProt ID format: {uniprot_id}")
         return None
     
+    cache_key = f"sequence:{uniprot_id.strip().upper()}"
+    cached = uniprot_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached UniProt sequence for {uniprot_id}")
+        return cached
+    
     try:
         url = f"https://rest.uniprot.org/uniprotkb/{uniprot_id}?fields=sequence"
         
@@ -55,13 +83,13 @@ def get_protein_sequence_from_uniprot(uniprot_id: str) -> Optional[str]:
         }
         
         logger.info(f"Fetching sequence for UniProt ID: {uniprot_id}")
-        response = requests.get(url, headers=headers, timeout=30)
+        response = await http_client.get(url, headers=headers, timeout=30, follow_redirects=True)
         
         if response.status_code == 404:
             logger.warning(f"UniProt ID not found: {uniprot_id}")
             return None
         
-        if not response.ok:
+        if not response.is_success:
             logger.error(f"UniProt API error {response.status_code}: {response.text}")
             return None
         
@@ -70,12 +98,13 @@ def get_protein_sequence_from_uniprot(uniprot_id: str) -> Optional[str]:
         
         if sequence:
             logger.info(f"Successfully retrieved sequence of length {len(sequence)} for {uniprot_id}")
+            cache_uniprot(cache_key, sequence)
             return sequence
         else:
             logger.warning(f"No sequence found in UniProt response for {uniprot_id}")
             return None
             
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Network error fetching UniProt sequence: {str(e)}")
         return None
     except Exception as e:
@@ -92,10 +121,21 @@ def get_protein_info_from_uniprot(uniprot_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with protein info including name, organism, sequence, etc.
     """
+    return run_async(get_protein_info_from_uniprot_async(uniprot_id))
+
+
+async def get_protein_info_from_uniprot_async(uniprot_id: str) -> Optional[Dict[str, Any]]:
+    """Coroutine version of get_protein_info_from_uniprot (runs on the shared event loop)"""
     if not validate_uniprot_id(uniprot_id):
         logger.error(f"Invalid UniProt ID format: {uniprot_id}")
         return None
     
+    cache_key = f"info:{uniprot_id.strip().upper()}"
+    cached = uniprot_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached UniProt info for {uniprot_id}")
+        return cached
+    
     try:
         # Request multiple fields for comprehensive info
         fields = [
@@ -113,13 +153,13 @@ def get_protein_info_from_uniprot(uniprot_id: str) -> Optional[Dict[str, Any]]:
         }
         
         logger.info(f"Fetching protein info for UniProt ID: {uniprot_id}")
-        response = requests.get(url, headers=headers, timeout=30)
+        response = await http_client.get(url, headers=headers, timeout=30, follow_redirects=True)
         
         if response.status_code == 404:
             logger.warning(f"UniProt ID not found: {uniprot_id}")
             return None
         
-        if not response.ok:
+        if not response.is_success:
             logger.error(f"UniProt API error {response.status_code}: {response.text}")
             return None
         
@@ -173,9 +213,10 @@ def get_protein_info_from_uniprot(uniprot_id: str) -> Optional[Dict[str, Any]]:
                     protein_info['pdb_structures'].append(xref.get('id', ''))
         
         logger.info(f"Successfully retrieved protein info for {uniprot_id}")
+        cache_uniprot(cache_key, protein_info)
         return protein_info
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Network error fetching UniProt info: {str(e)}")
         return None
     except Exception as e:
@@ -192,10 +233,25 @@ def download_afdb_structure(uniprot_id: str) -> Optional[str]:
     Returns:
         PDB structure data as string, or None if not available
     """
+    return run_async(download_afdb_structure_async(uniprot_id))
+
+
+async def download_afdb_structure_async(uniprot_id: str) -> Optional[str]:
+    """Coroutine version of download_afdb_structure (runs on the shared event loop)"""
     if not validate_uniprot_id(uniprot_id):
         logger.error(f"Invalid UniProt ID format: {uniprot_id}")
         return None
     
+    # Entries outlive their freshness window: once stale, the structure is
+    # revalidated with a conditional GET instead of downloaded again
+    cache_key = f"afdb:{uniprot_id.strip().upper()}"
+    cached = uniprot_cache.get(cache_key)
+    if not isinstance(cached, dict):
+        cached = None  # Missing, or a bare structure string from older versions
+    if cached is not None and time.time() - cached['checked_at'] < UNIPROT_CACHE_SECONDS:
+        logger.info(f"Using cached AlphaFold structure for {uniprot_id}")
+        return cached['pdb_data']
+    
     try:
         # Get the prediction metadata
         logger.info(f"Checking AlphaFold availability for UniProt ID: {uniprot_id}")
@@ -206,13 +262,13 @@ def download_afdb_structure(uniprot_id: str) -> Optional[str]:
             'User-Agent': 'BioEmu-Research-Platform/1.0'
         }
         
-        response = requests.get(api_url, headers=headers, timeout=120)
+        response = await http_client.get(api_url, headers=headers, timeout=120, follow_redirects=True)
         
         if response.status_code == 404:
             logger.warning(f"No AlphaFold prediction available for {uniprot_id}")
             return None
         
-        if not response.ok:
+        if not response.is_success:
             logger.error(f"AlphaFold API error {response.status_code}: {response.text}")
             return None
         
@@ -229,26 +285,60 @@ def download_afdb_structure(uniprot_id: str) -> Optional[str]:
             logger.warning(f"No PDB URL available for {uniprot_id}")
             return None
         
-        # Download the PDB structure
+        # Download the PDB structure, or confirm the cached copy is current
+        pdb_headers = {}
+        if cached is not None and cached['pdb_url'] == pdb_url:
+            if cached['etag']:
+                pdb_headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                pdb_headers['If-Modified-Since'] = cached['last_modified']
+        
         logger.info(f"Downloading AlphaFold structure from: {pdb_url}")
-        pdb_response = requests.get(pdb_url, timeout=180)
+        pdb_response = await http_client.get(
+            pdb_url, headers=pdb_headers, timeout=180, follow_redirects=True
+        )
         
-        if not pdb_response.ok:
+        if pdb_response.status_code == 304 and pdb_headers:
+            logger.info(f"Cached AlphaFold structure for {uniprot_id} is still current")
+            _cache_afdb_structure(cache_key, pdb_url, cached['pdb_data'], cached['etag'], cached['last_modified'])
+            return cached['pdb_data']
+        
+        if not pdb_response.is_success:
             logger.error(f"Failed to download PDB structure: {pdb_response.status_code}")
             return None
         
         pdb_data = pdb_response.text
         logger.info(f"Successfully downloaded AlphaFold structure for {uniprot_id} ({len(pdb_data)} characters)")
-        
+        _cache_afdb_structure(
+            cache_key,
+            pdb_url,
+            pdb_data,
+            pdb_response.headers.get('ETag'),
+            pdb_response.headers.get('Last-Modified'),
+        )
         return pdb_data
         
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Network error downloading AlphaFold structure: {str(e)}")
         return None
     except Exception as e:
         logger.error(f"Error processing AlphaFold structure: {str(e)}")
         return None
 
+def _cache_afdb_structure(cache_key: str, pdb_url: str, pdb_data: str,
+                          etag: Optional[str], last_modified: Optional[str]) -> None:
+    """Store an AlphaFold structure with the validators needed to revalidate it"""
+    # No expiry: freshness is judged from checked_at, and the size-bounded
+    # cache evicts unused entries
+    uniprot_cache.set(cache_key, {
+        'pdb_url': pdb_url,
+        'pdb_data': pdb_data,
+        'etag': etag,
+        'last_modified': last_modified,
+        'checked_at': time.time(),
+    })
+
+
 def get_uniprot_and_structure_data(uniprot_id: str) -> Optional[Dict[str, Any]]:
     """
     Fetch both UniProt protein information and AlphaFold structure
@@ -262,14 +352,15 @@ def get_uniprot_and_structure_data(uniprot_id: str) -> Optional[Dict[str, Any]]:
     if not validate_uniprot_id(uniprot_id):
         return None
     
-    # Get protein information
-    protein_info = get_protein_info_from_uniprot(uniprot_id)
+    # Fetch protein information and AlphaFold structure (optional - may not
+    # be available) concurrently
+    protein_info, structure_data = gather_async(
+        get_protein_info_from_uniprot_async(uniprot_id),
+        download_afdb_structure_async(uniprot_id),
+    )
     if not protein_info:
         return None
     
-    # Get AlphaFold structure (optional - may not be available)
-    structure_data = download_afdb_structure(uniprot_id)
-    
     result = {
         'protein_info': protein_info,
         'alphafold_structure': structure_data,
@@ -277,3 +368,40 @@ def get_uniprot_and_structure_data(uniprot_id: str) -> Optional[Dict[str, Any]]:
     }
     
     return result
+
+
+def get_uniprot_summary(uniprot_id: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """
+    Fetch UniProt protein info and whether an AlphaFold model exists
+
+    Summaries are kept in memory, so a repeat lookup skips the disk cache too
+    (including loading the whole AlphaFold model just to see that it exists).
+    
+    Args:
+        uniprot_id: UniProt accession ID
+    
+    Returns:
+        (protein_info, alphafold_available), or None if the ID was not found
+    """
+    key = uniprot_id.strip().upper()
+    with _summary_cache_lock:
+        entry = _summary_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            _summary_cache.move_to_end(key)
+            return entry[1]
+    
+    protein_info, structure_data = gather_async(
+        get_protein_info_from_uniprot_async(uniprot_id),
+        download_afdb_structure_async(uniprot_id),
+    )
+    if not protein_info:
+        return None  # Not cached; retried on the next request
+    
+    summary = (protein_info, structure_data is not None)
+    ttl = UNIPROT_SUMMARY_CACHE_SECONDS if summary[1] else AFDB_MISS_CACHE_SECONDS
+    with _summary_cache_lock:
+        _summary_cache[key] = (time.monotonic() + ttl, summary)
+        _summary_cache.move_to_end(key)
+        while len(_summary_cache) > UNIPROT_SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return summary
@@ -0,0 +1,35 @@
+"""
+URL converters for database identifiers in API routes.
+
+Routes declared as /api/pdb-info/<pdb_id:pdb_id> only match well-formed IDs,
+so malformed ones are rejected by Werkzeug's compiled routing regex before
+any handler runs (they fall through to the catch-all's JSON 404). Matched
+IDs reach the handler upper-cased, the canonical form used for lookups,
+cache keys and responses.
+"""
+
+from werkzeug.routing import BaseConverter
+
+
+class PdbIdConverter(BaseConverter):
+    """4-character PDB ID: 1 digit + 3 alphanumeric (see validate_pdb_id)"""
+
+    regex = r"[0-9][A-Za-z0-9]{3}"
+
+    def to_python(self, value):
+        return value.upper()
+
+
+class UniProtIdConverter(BaseConverter):
+    """4-10 character UniProt accession (see validate_uniprot_id)"""
+
+    regex = r"[A-Za-z0-9]{4,10}"
+
+    def to_python(self, value):
+        return value.upper()
+
+
+URL_CONVERTERS = {
+    "pdb_id": PdbIdConverter,
+    "uniprot_id": UniProtIdConverter,
+}
@@ -3,6 +3,49 @@ import MolstarViewerDualStructure from './MolstarViewerDualStructure';
 import RMSDVisualization from './RMSDVisualization';
 import { getBackendUrl } from '../utils/apiConfig';
 
+// Read a superposition response. NDJSON responses carry the result object on
+// the first line followed by {"chunk": <base64>} lines of the superposed XTC;
+// plain JSON (errors, older servers) embeds it as superposed_trajectory.
+const readSuperpositionResponse = async (response) => {
+  const base64ToBytes = (b64) => Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+
+  if (!(response.headers.get('Content-Type') || '').includes('application/x-ndjson')) {
+    const result = await response.json();
+    const xtcParts = result.superposed_trajectory
+      ? [base64ToBytes(result.superposed_trajectory)]
+      : [];
+    return { result, xtcParts };
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  const xtcParts = [];
+  let result = null;
+  let buffered = '';
+
+  const handleLine = (line) => {
+    if (!line) return;
+    const message = JSON.parse(line);
+    if (result === null) {
+      result = message;
+    } else {
+      xtcParts.push(base64ToBytes(message.chunk));
+    }
+  };
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    lines.forEach(handleLine);
+  }
+  handleLine(buffered);
+
+  return { result, xtcParts };
+};
+
 const ProteinAnalysisPage = ({
   isDarkMode,
   bioEmuFiles,
@@ -99,17 +142,16 @@ const ProteinAnalysisPage = ({
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          Accept: 'application/x-ndjson',
         },
         body: JSON.stringify(requestBody)
       });
 
-      const result = await response.json();
+      const { result, xtcParts } = await readSuperpositionResponse(response);
 
-      if (result.status === 'success') {
+      if (result?.status === 'success') {
         // Create blob URLs for superposed data
-        const superposedXtcBlob = new Blob([
-          Uint8Array.from(atob(result.superposed_trajectory), c => c.charCodeAt(0))
-        ]);
+        const superposedXtcBlob = new Blob(xtcParts);
         const superposedXtcUrl = URL.createObjectURL(superposedXtcBlob);
 
         setSuperposedFiles({